@@ -19,7 +19,7 @@ from abc import ABC, abstractmethod
 from collections.abc import Coroutine
 from typing import Any
 
-from graphiti_core.helpers import DEFAULT_DATABASE
+from graphiti_core.helpers import DEFAULT_DATABASE, semaphore_gather
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +53,59 @@ class GraphDriver(ABC):
     def execute_query(self, cypher_query_: str, **kwargs: Any) -> Coroutine:
         raise NotImplementedError()
 
+    async def execute_query_columns(
+        self, cypher_query_: str, **kwargs: Any
+    ) -> tuple[dict[str, list[Any]], list[str]]:
+        """
+        Run a query and return its result column-oriented, as (columns, header).
+
+        columns maps each returned column name to the list of its values in row order, which
+        avoids building a record per row for large reads. Drivers override this to build the
+        columns straight from the rows; the default pivots the records of execute_query.
+        """
+        records, _, _ = await self.execute_query(cypher_query_, **kwargs)
+        header = list(records[0].keys()) if records else []
+        return {key: [record[key] for record in records] for key in header}, header
+
+    async def execute_many(
+        self,
+        statements: list[tuple[str, dict[str, Any]]],
+        database_: str = DEFAULT_DATABASE,
+        transactional: bool = False,
+    ) -> list[Any]:
+        """
+        Run independent statements in as few round trips as the driver allows.
+
+        Statements are (query, params) pairs and the results, in the format of execute_query,
+        come back in statement order. Without transactional the statements must be reads. With
+        transactional they run as one write transaction.
+
+        Drivers override this to pipeline the statements. The default runs reads concurrently
+        through execute_query, and writes one after another in a single write transaction. Write
+        results are read inside the transaction with to_eager_result; for sessions whose run
+        results have no such method, each statement gives None.
+        """
+        if transactional:
+
+            async def run_statements(tx) -> list[Any]:
+                results = []
+                for query, params in statements:
+                    result = await tx.run(query, **params)
+                    # Results can no longer be consumed once the transaction is closed
+                    to_eager_result = getattr(result, 'to_eager_result', None)
+                    results.append(await to_eager_result() if to_eager_result is not None else None)
+                return results
+
+            async with self.session(database=database_) as session:
+                return await session.execute_write(run_statements)
+
+        return await semaphore_gather(
+            *[
+                self.execute_query(query, database_=database_, routing_='r', **params)
+                for query, params in statements
+            ]
+        )
+
     @abstractmethod
     def session(self, database: str) -> GraphDriverSession:
         raise NotImplementedError()
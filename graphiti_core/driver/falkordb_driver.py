@@ -18,11 +18,14 @@ import logging
 from datetime import datetime
 from typing import Any
 
+import numpy as np
 from falkordb import Graph as FalkorGraph  # type: ignore
 from falkordb.asyncio import FalkorDB  # type: ignore
+from falkordb.asyncio.query_result import QueryResult  # type: ignore
 
 from graphiti_core.driver.driver import GraphDriver, GraphDriverSession
 from graphiti_core.helpers import DEFAULT_DATABASE
+from graphiti_core.utils.concurrency import ProviderKind, get_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -92,6 +95,20 @@ class FalkorDriver(GraphDriver):
         return self.client.select_graph(graph_name)
 
     async def execute_query(self, cypher_query_, **kwargs: Any):
+        result = await self._query(cypher_query_, **kwargs)
+        if result is None:
+            return None
+        return self._to_records(result)
+
+    async def execute_query_columns(
+        self, cypher_query_: str, **kwargs: Any
+    ) -> tuple[dict[str, list[Any]], list[str]]:
+        result = await self._query(cypher_query_, **kwargs)
+        if result is None:
+            return {}, []
+        return self._to_columns(result)
+
+    async def _query(self, cypher_query_: str, **kwargs: Any) -> Any:
         graph_name = kwargs.pop('database_', DEFAULT_DATABASE)
         graph = self._get_graph(graph_name)
 
@@ -99,7 +116,8 @@ class FalkorDriver(GraphDriver):
         params = convert_datetimes_to_strings(dict(kwargs))
 
         try:
-            result = await graph.query(cypher_query_, params)  # type: ignore[reportUnknownArgumentType]
+            async with get_limiter(ProviderKind.graph_db).slot():
+                result = await graph.query(cypher_query_, params)  # type: ignore[reportUnknownArgumentType]
         except Exception as e:
             if 'already indexed' in str(e):
                 # check if index already exists
@@ -108,23 +126,71 @@ class FalkorDriver(GraphDriver):
             logger.error(f'Error executing FalkorDB query: {e}')
             raise
 
+        return result
+
+    async def execute_many(
+        self,
+        statements: list[tuple[str, dict[str, Any]]],
+        database_: str = DEFAULT_DATABASE,
+        transactional: bool = False,
+    ) -> list[Any]:
+        """
+        Send all statements to FalkorDB in one Redis pipeline.
+
+        Reads are sent as GRAPH.RO_QUERY. With transactional the pipeline is wrapped in
+        MULTI/EXEC, so no other command runs between the statements. Redis does not roll back
+        a transaction, so statements before a failing one stay applied.
+        """
+        if not statements:
+            return []
+
+        graph = self._get_graph(database_)
+        command = 'GRAPH.QUERY' if transactional else 'GRAPH.RO_QUERY'
+        pipeline = graph.client.pipeline(transaction=transactional)
+        for query, params in statements:
+            params = convert_datetimes_to_strings(dict(params))
+            cypher = graph._build_params_header(params) + query  # type: ignore[reportPrivateUsage]
+            pipeline.execute_command(command, graph.name, cypher, '--compact')
+
+        try:
+            async with get_limiter(ProviderKind.graph_db).slot():
+                responses = await pipeline.execute()
+        except Exception as e:
+            logger.error(f'Error executing FalkorDB pipeline: {e}')
+            raise
+
+        results = []
+        for response in responses:
+            result = QueryResult(graph)
+            await result.parse(response)
+            results.append(self._to_records(result))
+        return results
+
+    @staticmethod
+    def _to_records(result: Any) -> tuple[list[dict[str, Any]], list[str], None]:
         # Convert the result header to a list of strings
         header = [h[1] for h in result.header]
 
         # Convert FalkorDB's result format (list of lists) to the format expected by Graphiti (list of dicts)
-        records = []
-        for row in result.result_set:
-            record = {}
-            for i, field_name in enumerate(header):
-                if i < len(row):
-                    record[field_name] = row[i]
-                else:
-                    # If there are more fields in header than values in row, set to None
-                    record[field_name] = None
-            records.append(record)
+        width = len(header)
+        records = [
+            # If there are more fields in header than values in row, set them to None
+            dict(zip(header, row if len(row) == width else _pad(row, width), strict=True))
+            for row in result.result_set
+        ]
 
         return records, header, None
 
+    @staticmethod
+    def _to_columns(result: Any) -> tuple[dict[str, list[Any]], list[str]]:
+        header = [h[1] for h in result.header]
+        width = len(header)
+        rows = [row if len(row) == width else _pad(row, width) for row in result.result_set]
+        if not rows:
+            return {key: [] for key in header}, header
+        columns = [list(column) for column in zip(*rows, strict=True)]
+        return dict(zip(header, columns, strict=True)), header
+
     def session(self, database: str | None) -> GraphDriverSession:
         return FalkorDriverSession(self._get_graph(database))
 
@@ -144,14 +210,72 @@ class FalkorDriver(GraphDriver):
         )
 
 
+def _pad(row: list[Any], width: int) -> list[Any]:
+    return list(row[:width]) + [None] * (width - len(row))
+
+
 def convert_datetimes_to_strings(obj):
+    """
+    Encode query parameters for FalkorDB, which does not accept datetime objects.
+
+    Values are dispatched on their exact type. Lists that start with a number are taken to be
+    embeddings and passed through without visiting their items, and NumPy arrays are converted
+    to lists.
+    """
+    encode = _PARAM_ENCODERS.get(type(obj))
+    if encode is not None:
+        return encode(obj)
+    # Subclasses of the encoded types take the slow path
     if isinstance(obj, dict):
-        return {k: convert_datetimes_to_strings(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_datetimes_to_strings(item) for item in obj]
-    elif isinstance(obj, tuple):
-        return tuple(convert_datetimes_to_strings(item) for item in obj)
-    elif isinstance(obj, datetime):
+        return _encode_dict(obj)
+    if isinstance(obj, list):
+        return _encode_list(obj)
+    if isinstance(obj, tuple):
+        return _encode_tuple(obj)
+    if isinstance(obj, datetime):
         return obj.isoformat()
-    else:
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    return obj
+
+
+def _identity(obj):
+    return obj
+
+
+def _encode_dict(obj: dict) -> dict:
+    return {k: convert_datetimes_to_strings(v) for k, v in obj.items()}
+
+
+def _is_numeric(obj: list | tuple) -> bool:
+    # Embeddings are passed through as they are; a type check per item is much cheaper than
+    # encoding every item
+    return bool(obj) and all(type(item) in _NUMBER_TYPES for item in obj)
+
+
+def _encode_list(obj: list) -> list:
+    if _is_numeric(obj):
+        return obj
+    return [convert_datetimes_to_strings(item) for item in obj]
+
+
+def _encode_tuple(obj: tuple) -> tuple:
+    if _is_numeric(obj):
         return obj
+    return tuple(convert_datetimes_to_strings(item) for item in obj)
+
+
+_NUMBER_TYPES = frozenset({float, int, np.float32, np.float64})
+
+_PARAM_ENCODERS = {
+    str: _identity,
+    int: _identity,
+    float: _identity,
+    bool: _identity,
+    type(None): _identity,
+    dict: _encode_dict,
+    list: _encode_list,
+    tuple: _encode_tuple,
+    datetime: datetime.isoformat,
+    np.ndarray: np.ndarray.tolist,
+}
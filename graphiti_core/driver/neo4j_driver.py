@@ -15,17 +15,95 @@ limitations under the License.
 """
 
 import logging
-from collections.abc import Coroutine
+from collections.abc import AsyncIterator, Callable, Coroutine
+from contextlib import asynccontextmanager
+from time import monotonic
 from typing import Any
 
 from neo4j import AsyncGraphDatabase, EagerResult
+from pydantic import BaseModel, Field
 from typing_extensions import LiteralString
 
 from graphiti_core.driver.driver import GraphDriver, GraphDriverSession
 from graphiti_core.helpers import DEFAULT_DATABASE
+from graphiti_core.utils.concurrency import ProviderKind, get_limiter
 
 logger = logging.getLogger(__name__)
 
+# Called after each query with the pool name and a snapshot of the pool statistics
+Neo4jMetricsHook = Callable[[str, dict[str, Any]], None]
+
+
+class Neo4jDriverConfig(BaseModel):
+    max_connection_pool_size: int = Field(
+        default=100, description='Connections per pool, per server of the cluster'
+    )
+    connection_acquisition_timeout: float = Field(
+        default=60.0, description='Seconds a query waits for a free connection before failing'
+    )
+    max_connection_lifetime: float = Field(
+        default=3600.0, description='Seconds after which a pooled connection is closed'
+    )
+    fetch_size: int = Field(default=1000, description='Records fetched per batch from the server')
+    read_uri: str | None = Field(
+        default=None,
+        description='URI that reads are sent to, e.g. a read replica, with a pool of its own. '
+        'Defaults to the main URI',
+    )
+    separate_read_pool: bool = Field(
+        default=False,
+        description='Give reads a pool of their own even when read_uri is not set, so reads and '
+        'writes never wait for each other',
+    )
+    read_max_connection_pool_size: int | None = Field(
+        default=None, description='Size of the read pool. Defaults to max_connection_pool_size'
+    )
+    route_reads_to_readers: bool = Field(
+        default=True,
+        description='Route reads to the readers of a cluster. When False reads go to the leader, '
+        'so they always see the latest writes',
+    )
+
+
+class Neo4jPoolStats:
+    """Utilisation of one connection pool, as seen by the queries sent through it."""
+
+    def __init__(self, name: str, max_size: int):
+        self.name = name
+        self.max_size = max_size
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.queries = 0
+        self.failures = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.query_time = 0.0
+
+    def begin(self, waited: float):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        self.wait_time += waited
+        self.max_wait_time = max(self.max_wait_time, waited)
+
+    def end(self, duration: float, failed: bool):
+        self.in_flight -= 1
+        self.queries += 1
+        self.failures += failed
+        self.query_time += duration
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            'max_size': self.max_size,
+            'in_flight': self.in_flight,
+            'peak_in_flight': self.peak_in_flight,
+            'utilisation': self.in_flight / self.max_size,
+            'queries': self.queries,
+            'failures': self.failures,
+            'avg_wait_ms': self.wait_time / self.queries * 1000 if self.queries else 0.0,
+            'max_wait_ms': self.max_wait_time * 1000,
+            'avg_query_ms': self.query_time / self.queries * 1000 if self.queries else 0.0,
+        }
+
 
 class Neo4jDriver(GraphDriver):
     provider: str = 'neo4j'
@@ -35,23 +113,128 @@ class Neo4jDriver(GraphDriver):
         uri: str,
         user: str | None,
         password: str | None,
+        config: Neo4jDriverConfig | None = None,
+        metrics_hook: Neo4jMetricsHook | None = None,
     ):
+        """
+        Initialize the Neo4j driver.
+
+        Reads, i.e. queries run with routing_='r', go to a separate read pool when config sets
+        read_uri or separate_read_pool. After each query metrics_hook, if set, is called with the
+        pool name ('read' or 'write') and a snapshot of that pool's statistics, including how
+        long the query waited for a slot. Errors raised by the hook are logged and never affect
+        the query.
+        """
         super().__init__()
+        self.config = config if config is not None else Neo4jDriverConfig()
+        self.metrics_hook = metrics_hook
+        auth = (user or '', password or '')
+
         self.client = AsyncGraphDatabase.driver(
-            uri=uri,
-            auth=(user or '', password or ''),
+            uri=uri, auth=auth, **self._pool_options(self.config.max_connection_pool_size)
         )
+        self.pool_stats = {'write': Neo4jPoolStats('write', self.config.max_connection_pool_size)}
+        self.read_client = self.client
+        if self.config.read_uri is not None or self.config.separate_read_pool:
+            read_pool_size = (
+                self.config.read_max_connection_pool_size or self.config.max_connection_pool_size
+            )
+            self.read_client = AsyncGraphDatabase.driver(
+                uri=self.config.read_uri or uri, auth=auth, **self._pool_options(read_pool_size)
+            )
+            self.pool_stats['read'] = Neo4jPoolStats('read', read_pool_size)
+
+    def _pool_options(self, pool_size: int) -> dict[str, Any]:
+        return {
+            'max_connection_pool_size': pool_size,
+            'connection_acquisition_timeout': self.config.connection_acquisition_timeout,
+            'max_connection_lifetime': self.config.max_connection_lifetime,
+            'fetch_size': self.config.fetch_size,
+        }
 
     async def execute_query(self, cypher_query_: LiteralString, **kwargs: Any) -> EagerResult:
         params = kwargs.pop('params', None)
-        result = await self.client.execute_query(cypher_query_, parameters_=params, **kwargs)
+        is_read = kwargs.get('routing_') == 'r'
+        if is_read and not self.config.route_reads_to_readers:
+            kwargs['routing_'] = 'w'
+
+        async with self._pool(is_read) as client:
+            result = await client.execute_query(cypher_query_, parameters_=params, **kwargs)
 
         return result
 
+    async def execute_query_columns(
+        self, cypher_query_: LiteralString, **kwargs: Any
+    ) -> tuple[dict[str, list[Any]], list[str]]:
+        result = await self.execute_query(cypher_query_, **kwargs)
+        header = list(result.keys)
+        rows = [record.values() for record in result.records]
+        if not rows:
+            return {key: [] for key in header}, header
+        columns = [list(column) for column in zip(*rows, strict=True)]
+        return dict(zip(header, columns, strict=True)), header
+
+    @asynccontextmanager
+    async def _pool(self, is_read: bool) -> AsyncIterator[Any]:
+        """Yield the client for a read or a write, recording the pool statistics of the call."""
+        client = self.read_client if is_read else self.client
+        stats = self.pool_stats['read' if is_read and 'read' in self.pool_stats else 'write']
+
+        start = monotonic()
+        async with get_limiter(ProviderKind.graph_db).slot():
+            started = monotonic()
+            stats.begin(started - start)
+            failed = True
+            try:
+                yield client
+                failed = False
+            finally:
+                stats.end(monotonic() - started, failed)
+                if self.metrics_hook is not None:
+                    try:
+                        self.metrics_hook(stats.name, stats.snapshot())
+                    except Exception as e:
+                        logger.warning(f'Neo4j pool metrics hook failed: {e}')
+
+    def pool_snapshot(self) -> dict[str, dict[str, Any]]:
+        return {name: stats.snapshot() for name, stats in self.pool_stats.items()}
+
+    async def execute_many(
+        self,
+        statements: list[tuple[str, dict[str, Any]]],
+        database_: str = DEFAULT_DATABASE,
+        transactional: bool = False,
+    ) -> list[EagerResult]:
+        """
+        Run all statements in one transaction on a single session and connection.
+
+        Without transactional the statements run in a read transaction on the read pool, routed
+        to a reader, instead of one auto-commit transaction and connection checkout each.
+        """
+        if not statements:
+            return []
+
+        async def run_statements(tx) -> list[EagerResult]:
+            results = []
+            for query, params in statements:
+                result = await tx.run(query, params)
+                results.append(await result.to_eager_result())
+            return results
+
+        async with (
+            self._pool(not transactional) as client,
+            client.session(database=database_) as session,
+        ):
+            if transactional or not self.config.route_reads_to_readers:
+                return await session.execute_write(run_statements)
+            return await session.execute_read(run_statements)
+
     def session(self, database: str) -> GraphDriverSession:
         return self.client.session(database=database)  # type: ignore
 
     async def close(self) -> None:
+        if self.read_client is not self.client:
+            await self.read_client.close()
         return await self.client.close()
 
     def delete_all_indexes(
@@ -30,10 +30,12 @@ from graphiti_core.errors import EdgeNotFoundError, GroupsEdgesNotFoundError
 from graphiti_core.helpers import DEFAULT_DATABASE, parse_db_date
 from graphiti_core.models.edges.edge_db_queries import (
     COMMUNITY_EDGE_SAVE,
+    EDGE_DELETE,
     ENTITY_EDGE_SAVE,
     EPISODIC_EDGE_SAVE,
 )
 from graphiti_core.nodes import Node
+from graphiti_core.query_registry import registered_query
 
 logger = logging.getLogger(__name__)
 
@@ -66,10 +68,7 @@ class Edge(BaseModel, ABC):
 
     async def delete(self, driver: GraphDriver):
         result = await driver.execute_query(
-            """
-        MATCH (n)-[e:MENTIONS|RELATES_TO|HAS_MEMBER {uuid: $uuid}]->(m)
-        DELETE e
-        """,
+            EDGE_DELETE,
             uuid=self.uuid,
             database_=DEFAULT_DATABASE,
         )
@@ -161,25 +160,8 @@ class EpisodicEdge(Edge):
         limit: int | None = None,
         uuid_cursor: str | None = None,
     ):
-        cursor_query: LiteralString = 'AND e.uuid < $uuid' if uuid_cursor else ''
-        limit_query: LiteralString = 'LIMIT $limit' if limit is not None else ''
-
         records, _, _ = await driver.execute_query(
-            """
-        MATCH (n:Episodic)-[e:MENTIONS]->(m:Entity)
-        WHERE e.group_id IN $group_ids
-        """
-            + cursor_query
-            + """
-        RETURN
-            e.uuid As uuid,
-            e.group_id AS group_id,
-            n.uuid AS source_node_uuid, 
-            m.uuid AS target_node_uuid, 
-            e.created_at AS created_at
-        ORDER BY e.uuid DESC 
-        """
-            + limit_query,
+            episodic_edges_by_group_ids_query(bool(uuid_cursor), limit is not None),
             group_ids=group_ids,
             uuid=uuid_cursor,
             limit=limit,
@@ -314,20 +296,8 @@ class EntityEdge(Edge):
         limit: int | None = None,
         uuid_cursor: str | None = None,
     ):
-        cursor_query: LiteralString = 'AND e.uuid < $uuid' if uuid_cursor else ''
-        limit_query: LiteralString = 'LIMIT $limit' if limit is not None else ''
-
         records, _, _ = await driver.execute_query(
-            """
-        MATCH (n:Entity)-[e:RELATES_TO]->(m:Entity)
-        WHERE e.group_id IN $group_ids
-        """
-            + cursor_query
-            + ENTITY_EDGE_RETURN
-            + """
-        ORDER BY e.uuid DESC 
-        """
-            + limit_query,
+            entity_edges_by_group_ids_query(bool(uuid_cursor), limit is not None),
             group_ids=group_ids,
             uuid=uuid_cursor,
             limit=limit,
@@ -425,25 +395,8 @@ class CommunityEdge(Edge):
         limit: int | None = None,
         uuid_cursor: str | None = None,
     ):
-        cursor_query: LiteralString = 'AND e.uuid < $uuid' if uuid_cursor else ''
-        limit_query: LiteralString = 'LIMIT $limit' if limit is not None else ''
-
         records, _, _ = await driver.execute_query(
-            """
-        MATCH (n:Community)-[e:HAS_MEMBER]->(m:Entity | Community)
-        WHERE e.group_id IN $group_ids
-        """
-            + cursor_query
-            + """
-        RETURN
-            e.uuid As uuid,
-            e.group_id AS group_id,
-            n.uuid AS source_node_uuid, 
-            m.uuid AS target_node_uuid, 
-            e.created_at AS created_at
-        ORDER BY e.uuid DESC
-        """
-            + limit_query,
+            community_edges_by_group_ids_query(bool(uuid_cursor), limit is not None),
             group_ids=group_ids,
             uuid=uuid_cursor,
             limit=limit,
@@ -456,6 +409,73 @@ class CommunityEdge(Edge):
         return edges
 
 
+@registered_query
+def episodic_edges_by_group_ids_query(has_cursor: bool, has_limit: bool) -> str:
+    cursor_query: LiteralString = 'AND e.uuid < $uuid' if has_cursor else ''
+    limit_query: LiteralString = 'LIMIT $limit' if has_limit else ''
+
+    return (
+        """
+        MATCH (n:Episodic)-[e:MENTIONS]->(m:Entity)
+        WHERE e.group_id IN $group_ids
+        """
+        + cursor_query
+        + """
+        RETURN
+        e.uuid As uuid,
+        e.group_id AS group_id,
+        n.uuid AS source_node_uuid, 
+        m.uuid AS target_node_uuid, 
+        e.created_at AS created_at
+        ORDER BY e.uuid DESC 
+        """
+        + limit_query
+    )
+
+
+@registered_query
+def entity_edges_by_group_ids_query(has_cursor: bool, has_limit: bool) -> str:
+    cursor_query: LiteralString = 'AND e.uuid < $uuid' if has_cursor else ''
+    limit_query: LiteralString = 'LIMIT $limit' if has_limit else ''
+
+    return (
+        """
+        MATCH (n:Entity)-[e:RELATES_TO]->(m:Entity)
+        WHERE e.group_id IN $group_ids
+        """
+        + cursor_query
+        + ENTITY_EDGE_RETURN
+        + """
+        ORDER BY e.uuid DESC 
+        """
+        + limit_query
+    )
+
+
+@registered_query
+def community_edges_by_group_ids_query(has_cursor: bool, has_limit: bool) -> str:
+    cursor_query: LiteralString = 'AND e.uuid < $uuid' if has_cursor else ''
+    limit_query: LiteralString = 'LIMIT $limit' if has_limit else ''
+
+    return (
+        """
+        MATCH (n:Community)-[e:HAS_MEMBER]->(m:Entity | Community)
+        WHERE e.group_id IN $group_ids
+        """
+        + cursor_query
+        + """
+        RETURN
+        e.uuid As uuid,
+        e.group_id AS group_id,
+        n.uuid AS source_node_uuid, 
+        m.uuid AS target_node_uuid, 
+        e.created_at AS created_at
+        ORDER BY e.uuid DESC
+        """
+        + limit_query
+    )
+
+
 # Edge helpers
 def get_episodic_edge_from_record(record: Any) -> EpisodicEdge:
     return EpisodicEdge(
@@ -1,8 +1,13 @@
 from .client import EmbedderClient
+from .coalescing import CoalescingEmbedder
+from .embedding_store import CachedEmbedder, EmbeddingStore
 from .openai import OpenAIEmbedder, OpenAIEmbedderConfig
 
 __all__ = [
+    'CachedEmbedder',
+    'CoalescingEmbedder',
     'EmbedderClient',
+    'EmbeddingStore',
     'OpenAIEmbedder',
     'OpenAIEmbedderConfig',
 ]
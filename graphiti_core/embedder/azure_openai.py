@@ -19,6 +19,7 @@ from typing import Any
 
 from openai import AsyncAzureOpenAI
 
+from ..utils.concurrency import ProviderKind, get_limiter
 from .client import EmbedderClient
 
 logger = logging.getLogger(__name__)
@@ -43,7 +44,10 @@ class AzureOpenAIEmbedderClient(EmbedderClient):
                 # Convert to string list for other types
                 text_input = [str(input_data)]
 
-            response = await self.azure_client.embeddings.create(model=self.model, input=text_input)
+            async with get_limiter(ProviderKind.embedder).slot():
+                response = await self.azure_client.embeddings.create(
+                    model=self.model, input=text_input
+                )
 
             # Return the first embedding as a list of floats
             return response.data[0].embedding
@@ -54,9 +58,10 @@ class AzureOpenAIEmbedderClient(EmbedderClient):
     async def create_batch(self, input_data_list: list[str]) -> list[list[float]]:
         """Create batch embeddings using Azure OpenAI client."""
         try:
-            response = await self.azure_client.embeddings.create(
-                model=self.model, input=input_data_list
-            )
+            async with get_limiter(ProviderKind.embedder).slot():
+                response = await self.azure_client.embeddings.create(
+                    model=self.model, input=input_data_list
+                )
 
             return [embedding.embedding for embedding in response.data]
         except Exception as e:
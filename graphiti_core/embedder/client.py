@@ -14,19 +14,78 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import logging
 from abc import ABC, abstractmethod
-from collections.abc import Iterable
+from collections.abc import Awaitable, Callable, Iterable
+from typing import ClassVar
 
+import httpx
 from pydantic import BaseModel, Field
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+from graphiti_core.helpers import estimate_token_count, semaphore_gather
+from graphiti_core.utils.concurrency import is_server_or_retry_error
+from graphiti_core.utils.deadline import stop_before_deadline
+
+logger = logging.getLogger(__name__)
 
 EMBEDDING_DIM = 1024
+DEFAULT_BATCH_CONCURRENCY = 4
+DEFAULT_BATCH_RETRIES = 3
+# Timeout and connection errors of the openai, voyage and google SDKs, which don't subclass the
+# builtin or httpx ones
+TRANSIENT_ERROR_NAMES = frozenset(
+    {'APIConnectionError', 'APITimeoutError', 'ServiceUnavailableError', 'ServerError'}
+)
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Return True for errors that a repeated request may not hit: throttling, 5xx, timeouts."""
+    if is_server_or_retry_error(error):
+        return True
+    if isinstance(error, TimeoutError | ConnectionError | httpx.TransportError):
+        return True
+    if any(cls.__name__ in TRANSIENT_ERROR_NAMES for cls in type(error).__mro__):
+        return True
+
+    for source in (error, getattr(error, 'response', None)):
+        status = getattr(source, 'status_code', None)
+        if isinstance(status, int) and 500 <= status < 600:
+            return True
+
+    return False
 
 
 class EmbedderConfig(BaseModel):
     embedding_dim: int = Field(default=EMBEDDING_DIM, frozen=True)
+    batch_size: int | None = Field(
+        default=None,
+        description='Maximum inputs per embedding request. Defaults to the provider limit',
+    )
+    batch_max_tokens: int | None = Field(
+        default=None,
+        description='Maximum estimated tokens per request. Defaults to the provider limit',
+    )
+    batch_concurrency: int = Field(
+        default=DEFAULT_BATCH_CONCURRENCY,
+        description='Maximum number of embedding requests of one create_batch call in flight',
+    )
+    batch_retries: int = Field(
+        default=DEFAULT_BATCH_RETRIES,
+        description='Attempts per create_batch request that fails with a transient error',
+    )
 
 
 class EmbedderClient(ABC):
+    # Provider limits for a single embedding request
+    MAX_BATCH_SIZE: ClassVar[int] = 100
+    MAX_BATCH_TOKENS: ClassVar[int | None] = None
+
     @abstractmethod
     async def create(
         self, input_data: str | list[str] | Iterable[int] | Iterable[Iterable[int]]
@@ -35,3 +94,83 @@ class EmbedderClient(ABC):
 
     async def create_batch(self, input_data_list: list[str]) -> list[list[float]]:
         raise NotImplementedError()
+
+    def _split_batch(
+        self, input_data_list: list[str], config: EmbedderConfig | None = None
+    ) -> list[list[str]]:
+        """Split inputs into consecutive chunks that fit the per-request count and token limits."""
+        max_size = self.MAX_BATCH_SIZE
+        max_tokens = self.MAX_BATCH_TOKENS
+        if config is not None:
+            max_size = min(config.batch_size or max_size, max_size)
+            if config.batch_max_tokens is not None:
+                max_tokens = min(config.batch_max_tokens, max_tokens or config.batch_max_tokens)
+
+        chunks: list[list[str]] = []
+        chunk: list[str] = []
+        chunk_tokens = 0
+        for text in input_data_list:
+            tokens = estimate_token_count(text)
+            if chunk and (
+                len(chunk) >= max_size
+                or (max_tokens is not None and chunk_tokens + tokens > max_tokens)
+            ):
+                chunks.append(chunk)
+                chunk = []
+                chunk_tokens = 0
+            chunk.append(text)
+            chunk_tokens += tokens
+
+        if chunk or not chunks:
+            chunks.append(chunk)
+
+        return chunks
+
+    async def _create_batch_in_chunks(
+        self,
+        input_data_list: list[str],
+        embed_chunk: Callable[[list[str]], Awaitable[list[list[float]]]],
+        config: EmbedderConfig | None = None,
+    ) -> list[list[float]]:
+        """
+        Embed inputs with embed_chunk, splitting them into requests within the provider limits.
+
+        The requests run concurrently, up to config.batch_concurrency at a time, and the
+        embeddings are returned in input order. A request that fails with a transient error, such
+        as a rate limit, a server error or a timeout, is retried on its own while the current
+        deadline allows; other errors are raised at once.
+        """
+        chunks = self._split_batch(input_data_list, config)
+        concurrency = config.batch_concurrency if config is not None else DEFAULT_BATCH_CONCURRENCY
+        retries = config.batch_retries if config is not None else DEFAULT_BATCH_RETRIES
+
+        async def embed_and_check(chunk: list[str]) -> list[list[float]]:
+            embeddings = await embed_chunk(chunk)
+            if len(embeddings) != len(chunk):
+                raise ValueError(
+                    f'Embedder returned {len(embeddings)} embeddings for {len(chunk)} inputs'
+                )
+            return embeddings
+
+        async def embed_with_retry(chunk: list[str]) -> list[list[float]]:
+            # Retry state lives on the AsyncRetrying object, so each request gets its own
+            retrying = AsyncRetrying(
+                stop=stop_after_attempt(max(retries, 1)) | stop_before_deadline(),
+                wait=wait_random_exponential(multiplier=1, min=1, max=30),
+                retry=retry_if_exception(is_transient_error),
+                before_sleep=lambda retry_state: logger.warning(
+                    f'Retrying embedding request of {len(chunk)} inputs '
+                    f'(attempt {retry_state.attempt_number})'
+                ),
+                reraise=True,
+            )
+            return await retrying(embed_and_check, chunk)
+
+        if len(chunks) == 1:
+            return await embed_with_retry(chunks[0])
+
+        logger.debug(f'Embedding {len(input_data_list)} inputs in {len(chunks)} requests')
+        results: list[list[list[float]]] = await semaphore_gather(
+            *[embed_with_retry(chunk) for chunk in chunks], max_coroutines=concurrency
+        )
+        return [embedding for chunk_embeddings in results for embedding in chunk_embeddings]
@@ -0,0 +1,152 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import logging
+from collections.abc import Iterable
+
+from .client import EmbedderClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = 100
+DEFAULT_MAX_WAIT_MS = 5.0
+
+
+class CoalescingEmbedder(EmbedderClient):
+    """
+    Embedder wrapper that coalesces concurrent single-text create() calls into create_batch().
+
+    Texts are queued until max_batch_size texts (or max_batch_chars characters) are waiting, or
+    max_wait_ms has passed since the first one arrived, and are then embedded in one request.
+    Identical texts in the same batch are only sent once. Each caller receives its own embedding,
+    or the exception raised by the batch request.
+
+    The defaults stay within the per-request input limits of the bundled embedders; raise
+    max_batch_size for providers that accept larger batches (e.g. up to 2048 inputs for OpenAI).
+
+    Usage:
+        embedder = CoalescingEmbedder(OpenAIEmbedder())
+        graphiti = Graphiti(uri, user, password, embedder=embedder)
+    """
+
+    def __init__(
+        self,
+        embedder: EmbedderClient,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+        max_batch_chars: int | None = None,
+    ):
+        if max_batch_size < 1:
+            raise ValueError('max_batch_size must be at least 1')
+
+        self.embedder = embedder
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch_chars = max_batch_chars
+
+        self._pending: dict[str, list[asyncio.Future[list[float]]]] = {}
+        self._pending_chars = 0
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._batch_tasks: set[asyncio.Task] = set()
+
+    async def create(
+        self, input_data: str | list[str] | Iterable[int] | Iterable[Iterable[int]]
+    ) -> list[float]:
+        if isinstance(input_data, str):
+            text = input_data
+        elif (
+            isinstance(input_data, list) and len(input_data) == 1 and isinstance(input_data[0], str)
+        ):
+            text = input_data[0]
+        else:
+            # Token ids and multi-text inputs keep the wrapped embedder's semantics
+            return await self.embedder.create(input_data)
+
+        if not text:
+            # Providers reject empty inputs, don't let one fail a whole batch
+            return await self.embedder.create(input_data)
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[list[float]] = loop.create_future()
+
+        if (
+            self.max_batch_chars is not None
+            and self._pending
+            and text not in self._pending
+            and self._pending_chars + len(text) > self.max_batch_chars
+        ):
+            self._flush()
+
+        if text in self._pending:
+            self._pending[text].append(future)
+        else:
+            self._pending[text] = [future]
+            self._pending_chars += len(text)
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    async def create_batch(self, input_data_list: list[str]) -> list[list[float]]:
+        return await self.embedder.create_batch(input_data_list)
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        if not self._pending:
+            return
+
+        batch = self._pending
+        self._pending = {}
+        self._pending_chars = 0
+
+        task = asyncio.get_running_loop().create_task(self._embed_batch(batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _embed_batch(self, batch: dict[str, list[asyncio.Future[list[float]]]]):
+        texts = list(batch.keys())
+        try:
+            try:
+                embeddings = await self.embedder.create_batch(texts)
+            except NotImplementedError:
+                embeddings = list(
+                    await asyncio.gather(*[self.embedder.create([text]) for text in texts])
+                )
+
+            if len(embeddings) != len(texts):
+                raise ValueError(
+                    f'Embedder returned {len(embeddings)} embeddings for {len(texts)} inputs'
+                )
+        except Exception as e:
+            logger.error(f'Error embedding batch of {len(texts)} texts: {e}')
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        logger.debug(f'Embedded batch of {len(texts)} texts')
+        for text, embedding in zip(texts, embeddings, strict=True):
+            for future in batch[text]:
+                if not future.done():
+                    future.set_result(embedding)
@@ -0,0 +1,246 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .client import EmbedderClient
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+DIGEST_SIZE = hashlib.sha256().digest_size
+VECTOR_DTYPE = np.dtype('<f4')
+
+
+def content_digest(text: str) -> bytes:
+    return hashlib.sha256(text.encode('utf-8')).digest()
+
+
+class EmbeddingStore:
+    """
+    Persistent, content-addressed store of embedding vectors for one model and dimension.
+
+    Vectors are appended as float32 rows to a data file that is memory-mapped for reads, and the
+    sha256 digest of each text is appended to an index file in the same order. Lookups return
+    read-only NumPy views into the mapping, so cached vectors are never copied until a caller
+    needs them as Python lists. Entries are never updated or deleted; a different model or
+    dimension uses different files.
+
+    Several processes can share a directory: appends are serialized with a file lock where the
+    platform supports it, and entries written by other processes are picked up on a lookup miss.
+    """
+
+    def __init__(self, directory: str | os.PathLike, model: str, dim: int):
+        self.model = model
+        self.dim = dim
+        self._row_size = dim * VECTOR_DTYPE.itemsize
+
+        name = re.sub(r'[^A-Za-z0-9_.-]', '_', model)
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = directory / f'{name}-{dim}.f32'
+        self.index_path = directory / f'{name}-{dim}.idx'
+        self.vectors_path.touch(exist_ok=True)
+        self.index_path.touch(exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._rows: dict[bytes, int] = {}
+        self._row_count = 0
+        self._vectors: NDArray[np.float32] | None = None
+        self._mapped_rows = 0
+
+        self._load_index()
+
+    def __len__(self) -> int:
+        return self._row_count
+
+    def __contains__(self, text: str) -> bool:
+        return content_digest(text) in self._rows
+
+    def get(self, text: str) -> NDArray[np.float32] | None:
+        return self.get_many([text])[0]
+
+    def get_many(self, texts: list[str]) -> list[NDArray[np.float32] | None]:
+        """Return a read-only float32 view per text, or None for texts that are not stored."""
+        digests = [content_digest(text) for text in texts]
+        with self._lock:
+            if any(digest not in self._rows for digest in digests):
+                self._load_index()
+            rows = [self._rows.get(digest) for digest in digests]
+            if any(row is not None for row in rows):
+                self._map_vectors()
+            vectors = self._vectors
+
+        return [vectors[row] if row is not None and vectors is not None else None for row in rows]
+
+    def put_many(self, texts: list[str], vectors: Iterable[Iterable[float]]):
+        """Append vectors for texts that are not stored yet."""
+        new_digests: list[bytes] = []
+        new_vectors: list[NDArray[np.float32]] = []
+        seen: set[bytes] = set()
+        for text, vector in zip(texts, vectors, strict=True):
+            digest = content_digest(text)
+            if digest in self._rows or digest in seen:
+                continue
+            array = np.asarray(vector, dtype=VECTOR_DTYPE)
+            if array.shape != (self.dim,):
+                logger.warning(
+                    f'Not caching embedding of shape {array.shape} in store of dimension {self.dim}'
+                )
+                continue
+            seen.add(digest)
+            new_digests.append(digest)
+            new_vectors.append(array)
+
+        if not new_digests:
+            return
+
+        with self._lock, open(self.index_path, 'r+b') as index_file:
+            if fcntl is not None:
+                fcntl.flock(index_file, fcntl.LOCK_EX)
+            try:
+                # Pick up rows appended by other processes so row numbers stay aligned
+                self._load_index()
+                pending = [
+                    (digest, vector)
+                    for digest, vector in zip(new_digests, new_vectors, strict=True)
+                    if digest not in self._rows
+                ]
+                if not pending:
+                    return
+
+                # Vectors are written before their index entries, so a crash in between leaves
+                # unindexed rows that are truncated on the next load
+                with open(self.vectors_path, 'r+b') as vectors_file:
+                    vectors_file.seek(self._row_count * self._row_size)
+                    vectors_file.write(np.stack([vector for _, vector in pending]).tobytes())
+                    vectors_file.truncate()
+                    vectors_file.flush()
+                    os.fsync(vectors_file.fileno())
+
+                # Written over any partial digest left by a torn write, so digests stay aligned
+                index_file.seek(self._row_count * DIGEST_SIZE)
+                index_file.write(b''.join(digest for digest, _ in pending))
+                index_file.truncate()
+                index_file.flush()
+                os.fsync(index_file.fileno())
+
+                for digest, _ in pending:
+                    self._rows[digest] = self._row_count
+                    self._row_count += 1
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(index_file, fcntl.LOCK_UN)
+
+    def _load_index(self):
+        index_rows = self.index_path.stat().st_size // DIGEST_SIZE
+        vector_rows = self.vectors_path.stat().st_size // self._row_size
+        row_count = min(index_rows, vector_rows)
+        if row_count <= self._row_count:
+            return
+
+        with open(self.index_path, 'rb') as index_file:
+            index_file.seek(self._row_count * DIGEST_SIZE)
+            data = index_file.read((row_count - self._row_count) * DIGEST_SIZE)
+
+        for offset in range(0, len(data), DIGEST_SIZE):
+            self._rows.setdefault(data[offset : offset + DIGEST_SIZE], self._row_count)
+            self._row_count += 1
+
+    def _map_vectors(self):
+        if self._row_count == self._mapped_rows:
+            return
+        # Views handed out earlier keep a reference to the previous mapping
+        self._vectors = np.memmap(
+            self.vectors_path, dtype=VECTOR_DTYPE, mode='r', shape=(self._row_count, self.dim)
+        )
+        self._mapped_rows = self._row_count
+
+
+class CachedEmbedder(EmbedderClient):
+    """
+    Embedder wrapper that serves repeated texts from a persistent EmbeddingStore.
+
+    Only texts missing from the store are sent to the wrapped embedder, and their embeddings are
+    added to the store. The store must be created for the same model and dimension as the
+    wrapped embedder.
+
+    Usage:
+        embedder = OpenAIEmbedder()
+        store = EmbeddingStore('./embedding_cache', 'text-embedding-3-small', 1024)
+        graphiti = Graphiti(uri, user, password, embedder=CachedEmbedder(embedder, store))
+    """
+
+    def __init__(self, embedder: EmbedderClient, store: EmbeddingStore):
+        self.embedder = embedder
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+
+    async def create(
+        self, input_data: str | list[str] | Iterable[int] | Iterable[Iterable[int]]
+    ) -> list[float]:
+        if isinstance(input_data, str):
+            text = input_data
+        elif (
+            isinstance(input_data, list) and len(input_data) == 1 and isinstance(input_data[0], str)
+        ):
+            text = input_data[0]
+        else:
+            return await self.embedder.create(input_data)
+
+        # Store reads and writes lock and fsync files, so they run off the event loop
+        cached = await asyncio.to_thread(self.store.get, text)
+        if cached is not None:
+            self.hits += 1
+            return cached.tolist()
+
+        self.misses += 1
+        embedding = await self.embedder.create(input_data)
+        await asyncio.to_thread(self.store.put_many, [text], [embedding])
+        return embedding
+
+    async def create_batch(self, input_data_list: list[str]) -> list[list[float]]:
+        cached = await asyncio.to_thread(self.store.get_many, input_data_list)
+        missing = [i for i, vector in enumerate(cached) if vector is None]
+        self.hits += len(input_data_list) - len(missing)
+        self.misses += len(missing)
+
+        embeddings: list[list[float] | None] = [
+            vector.tolist() if vector is not None else None for vector in cached
+        ]
+        if missing:
+            missing_texts = [input_data_list[i] for i in missing]
+            new_embeddings = await self.embedder.create_batch(missing_texts)
+            await asyncio.to_thread(self.store.put_many, missing_texts, new_embeddings)
+            for i, embedding in zip(missing, new_embeddings, strict=True):
+                embeddings[i] = embedding
+
+        return [embedding for embedding in embeddings if embedding is not None]
@@ -15,11 +15,13 @@ limitations under the License.
 """
 
 from collections.abc import Iterable
+from typing import ClassVar
 
 from google import genai  # type: ignore
 from google.genai import types  # type: ignore
 from pydantic import Field
 
+from ..utils.concurrency import ProviderKind, get_limiter
 from .client import EmbedderClient, EmbedderConfig
 
 DEFAULT_EMBEDDING_MODEL = 'embedding-001'
@@ -35,6 +37,8 @@ class GeminiEmbedder(EmbedderClient):
     Google Gemini Embedder Client
     """
 
+    MAX_BATCH_SIZE: ClassVar[int] = 100
+
     def __init__(self, config: GeminiEmbedderConfig | None = None):
         if config is None:
             config = GeminiEmbedderConfig()
@@ -59,11 +63,12 @@ class GeminiEmbedder(EmbedderClient):
             A list of floats representing the embedding vector.
         """
         # Generate embeddings
-        result = await self.client.aio.models.embed_content(
-            model=self.config.embedding_model or DEFAULT_EMBEDDING_MODEL,
-            contents=[input_data],  # type: ignore[arg-type]  # mypy fails on broad union type
-            config=types.EmbedContentConfig(output_dimensionality=self.config.embedding_dim),
-        )
+        async with get_limiter(ProviderKind.embedder).slot():
+            result = await self.client.aio.models.embed_content(
+                model=self.config.embedding_model or DEFAULT_EMBEDDING_MODEL,
+                contents=[input_data],  # type: ignore[arg-type]  # mypy fails on broad union type
+                config=types.EmbedContentConfig(output_dimensionality=self.config.embedding_dim),
+            )
 
         if not result.embeddings or len(result.embeddings) == 0 or not result.embeddings[0].values:
             raise ValueError('No embeddings returned from Gemini API in create()')
@@ -71,13 +76,19 @@ class GeminiEmbedder(EmbedderClient):
         return result.embeddings[0].values
 
     async def create_batch(self, input_data_list: list[str]) -> list[list[float]]:
-        # Generate embeddings
-        result = await self.client.aio.models.embed_content(
-            model=self.config.embedding_model or DEFAULT_EMBEDDING_MODEL,
-            contents=input_data_list,  # type: ignore[arg-type]  # mypy fails on broad union type
-            config=types.EmbedContentConfig(output_dimensionality=self.config.embedding_dim),
+        return await self._create_batch_in_chunks(
+            input_data_list, self._create_batch_chunk, self.config
         )
 
+    async def _create_batch_chunk(self, input_data_list: list[str]) -> list[list[float]]:
+        # Generate embeddings
+        async with get_limiter(ProviderKind.embedder).slot():
+            result = await self.client.aio.models.embed_content(
+                model=self.config.embedding_model or DEFAULT_EMBEDDING_MODEL,
+                contents=input_data_list,  # type: ignore[arg-type]
+                config=types.EmbedContentConfig(output_dimensionality=self.config.embedding_dim),
+            )
+
         if not result.embeddings or len(result.embeddings) == 0:
             raise Exception('No embeddings returned')
 
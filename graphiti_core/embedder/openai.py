@@ -15,10 +15,12 @@ limitations under the License.
 """
 
 from collections.abc import Iterable
+from typing import ClassVar
 
 from openai import AsyncAzureOpenAI, AsyncOpenAI
 from openai.types import EmbeddingModel
 
+from ..utils.concurrency import ProviderKind, get_limiter
 from .client import EmbedderClient, EmbedderConfig
 
 DEFAULT_EMBEDDING_MODEL = 'text-embedding-3-small'
@@ -37,6 +39,9 @@ class OpenAIEmbedder(EmbedderClient):
     This client supports both AsyncOpenAI and AsyncAzureOpenAI clients.
     """
 
+    MAX_BATCH_SIZE: ClassVar[int] = 2048
+    MAX_BATCH_TOKENS: ClassVar[int | None] = 300_000
+
     def __init__(
         self,
         config: OpenAIEmbedderConfig | None = None,
@@ -54,13 +59,20 @@ class OpenAIEmbedder(EmbedderClient):
     async def create(
         self, input_data: str | list[str] | Iterable[int] | Iterable[Iterable[int]]
     ) -> list[float]:
-        result = await self.client.embeddings.create(
-            input=input_data, model=self.config.embedding_model
-        )
+        async with get_limiter(ProviderKind.embedder).slot():
+            result = await self.client.embeddings.create(
+                input=input_data, model=self.config.embedding_model
+            )
         return result.data[0].embedding[: self.config.embedding_dim]
 
     async def create_batch(self, input_data_list: list[str]) -> list[list[float]]:
-        result = await self.client.embeddings.create(
-            input=input_data_list, model=self.config.embedding_model
+        return await self._create_batch_in_chunks(
+            input_data_list, self._create_batch_chunk, self.config
         )
+
+    async def _create_batch_chunk(self, input_data_list: list[str]) -> list[list[float]]:
+        async with get_limiter(ProviderKind.embedder).slot():
+            result = await self.client.embeddings.create(
+                input=input_data_list, model=self.config.embedding_model
+            )
         return [embedding.embedding[: self.config.embedding_dim] for embedding in result.data]
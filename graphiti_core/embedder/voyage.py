@@ -15,10 +15,12 @@ limitations under the License.
 """
 
 from collections.abc import Iterable
+from typing import ClassVar
 
 import voyageai  # type: ignore
 from pydantic import Field
 
+from ..utils.concurrency import ProviderKind, get_limiter
 from .client import EmbedderClient, EmbedderConfig
 
 DEFAULT_EMBEDDING_MODEL = 'voyage-3'
@@ -34,6 +36,9 @@ class VoyageAIEmbedder(EmbedderClient):
     VoyageAI Embedder Client
     """
 
+    MAX_BATCH_SIZE: ClassVar[int] = 1000
+    MAX_BATCH_TOKENS: ClassVar[int | None] = 120_000
+
     def __init__(self, config: VoyageAIEmbedderConfig | None = None):
         if config is None:
             config = VoyageAIEmbedderConfig()
@@ -54,11 +59,18 @@ class VoyageAIEmbedder(EmbedderClient):
         if len(input_list) == 0:
             return []
 
-        result = await self.client.embed(input_list, model=self.config.embedding_model)
+        async with get_limiter(ProviderKind.embedder).slot():
+            result = await self.client.embed(input_list, model=self.config.embedding_model)
         return [float(x) for x in result.embeddings[0][: self.config.embedding_dim]]
 
     async def create_batch(self, input_data_list: list[str]) -> list[list[float]]:
-        result = await self.client.embed(input_data_list, model=self.config.embedding_model)
+        return await self._create_batch_in_chunks(
+            input_data_list, self._create_batch_chunk, self.config
+        )
+
+    async def _create_batch_chunk(self, input_data_list: list[str]) -> list[list[float]]:
+        async with get_limiter(ProviderKind.embedder).slot():
+            result = await self.client.embed(input_data_list, model=self.config.embedding_model)
         return [
             [float(x) for x in embedding[: self.config.embedding_dim]]
             for embedding in result.embeddings
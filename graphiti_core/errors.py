@@ -81,3 +81,11 @@ class GroupIdValidationError(GraphitiError):
     def __init__(self, group_id: str):
         self.message = f'group_id "{group_id}" must contain only alphanumeric characters, dashes, or underscores'
         super().__init__(self.message)
+
+
+class DeadlineExceededError(GraphitiError):
+    """Raised when an operation runs past the deadline set for it."""
+
+    def __init__(self, message: str = 'deadline exceeded'):
+        self.message = message
+        super().__init__(self.message)
@@ -112,23 +112,29 @@ def get_relationships_query(name: str, db_type: str = 'neo4j') -> str:
 
 def get_entity_node_save_bulk_query(nodes, db_type: str = 'neo4j') -> str | Any:
     if db_type == 'falkordb':
-        queries = []
+        # FalkorDB cannot set labels from a parameter, so nodes are written with one UNWIND
+        # query per distinct label set
+        nodes_by_labels: dict[tuple[str, ...], list[dict[str, Any]]] = {}
         for node in nodes:
-            for label in node['labels']:
-                queries.append(
-                    (
-                        f"""
+            labels = tuple(sorted(set(node['labels']) | {'Entity'}))
+            nodes_by_labels.setdefault(labels, []).append(node)
+
+        queries = []
+        for labels, label_nodes in nodes_by_labels.items():
+            queries.append(
+                (
+                    f"""
                     UNWIND $nodes AS node
                     MERGE (n:Entity {{uuid: node.uuid}})
-                    SET n:{label}
+                    SET n:{':'.join(labels)}
                     SET n = node
                     WITH n, node
                     SET n.name_embedding = vecf32(node.name_embedding)
                     RETURN n.uuid AS uuid
                 """,
-                        {'nodes': [node]},
-                    )
+                    {'nodes': label_nodes},
                 )
+            )
         return queries
     else:
         return ENTITY_NODE_SAVE_BULK
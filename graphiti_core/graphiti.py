@@ -15,8 +15,11 @@ limitations under the License.
 """
 
 import logging
+from collections.abc import AsyncIterable
+from contextlib import aclosing
 from datetime import datetime
 from time import time
+from uuid import UUID, uuid5
 
 from dotenv import load_dotenv
 from pydantic import BaseModel
@@ -25,7 +28,7 @@ from typing_extensions import LiteralString
 from graphiti_core.cross_encoder.client import CrossEncoderClient
 from graphiti_core.cross_encoder.openai_reranker_client import OpenAIRerankerClient
 from graphiti_core.driver.driver import GraphDriver
-from graphiti_core.driver.neo4j_driver import Neo4jDriver
+from graphiti_core.driver.neo4j_driver import Neo4jDriver, Neo4jDriverConfig, Neo4jMetricsHook
 from graphiti_core.edges import EntityEdge, EpisodicEdge
 from graphiti_core.embedder import EmbedderClient, OpenAIEmbedder
 from graphiti_core.graphiti_types import GraphitiClients
@@ -36,6 +39,8 @@ from graphiti_core.helpers import (
     validate_group_id,
 )
 from graphiti_core.llm_client import LLMClient, OpenAIClient
+from graphiti_core.models.edges.edge_db_queries import EDGE_DELETE
+from graphiti_core.models.nodes.node_db_queries import NODE_DELETE
 from graphiti_core.nodes import CommunityNode, EntityNode, EpisodeType, EpisodicNode
 from graphiti_core.search.search import SearchConfig, search
 from graphiti_core.search.search_config import DEFAULT_SEARCH_LIMIT, SearchResults
@@ -53,16 +58,34 @@ from graphiti_core.search.search_utils import (
 )
 from graphiti_core.telemetry import capture_event
 from graphiti_core.utils.bulk_utils import (
+    BULK_WRITE_CHUNK_SIZE,
+    DEFAULT_ENTITY_CACHE_SIZE,
+    DEFAULT_STREAM_WINDOW,
     RawEpisode,
+    StreamCheckpoint,
     add_nodes_and_edges_bulk,
+    add_nodes_and_edges_chunked,
     dedupe_edges_bulk,
     dedupe_nodes_bulk,
+    episode_windows,
     extract_edge_dates_bulk,
     extract_nodes_and_edges_bulk,
+    invalidate_edges_bulk,
+    load_stream_checkpoint,
     resolve_edge_pointers,
+    resolve_known_entities,
     retrieve_previous_episodes_bulk,
+    save_stream_checkpoint,
+    stream_episode_uuid,
+)
+from graphiti_core.utils.concurrency import (
+    ConcurrencyConfig,
+    Priority,
+    configure_limiters,
+    with_priority,
 )
 from graphiti_core.utils.datetime_utils import utc_now
+from graphiti_core.utils.deadline import deadline
 from graphiti_core.utils.maintenance.community_operations import (
     build_communities,
     remove_communities,
@@ -75,16 +98,25 @@ from graphiti_core.utils.maintenance.edge_operations import (
     resolve_extracted_edge,
     resolve_extracted_edges,
 )
+from graphiti_core.utils.maintenance.episode_context import (
+    EpisodeContextConfig,
+    EpisodeContextManager,
+)
 from graphiti_core.utils.maintenance.graph_data_operations import (
     EPISODE_WINDOW_LEN,
     build_indices_and_constraints,
     retrieve_episodes,
 )
+from graphiti_core.utils.maintenance.graph_extraction_operations import (
+    ExtractionMode,
+    extract_nodes_and_edges,
+)
 from graphiti_core.utils.maintenance.node_operations import (
     extract_attributes_from_nodes,
     extract_nodes,
     resolve_extracted_nodes,
 )
+from graphiti_core.utils.maintenance.reflexion_policy import ReflexionPolicy
 from graphiti_core.utils.ontology_utils.entity_types_utils import validate_entity_types
 
 logger = logging.getLogger(__name__)
@@ -110,6 +142,12 @@ class Graphiti:
         store_raw_episode_content: bool = True,
         graph_driver: GraphDriver | None = None,
         max_coroutines: int | None = None,
+        extraction_mode: ExtractionMode = ExtractionMode.sequential,
+        reflexion_policy: ReflexionPolicy | None = None,
+        episode_context: EpisodeContextConfig | None = None,
+        concurrency: ConcurrencyConfig | None = None,
+        neo4j_config: Neo4jDriverConfig | None = None,
+        metrics_hook: Neo4jMetricsHook | None = None,
     ):
         """
         Initialize a Graphiti instance.
@@ -142,6 +180,27 @@ class Graphiti:
         max_coroutines : int | None, optional
             The maximum number of concurrent operations allowed. Overrides SEMAPHORE_LIMIT set in the environment.
             If not set, the Graphiti default is used.
+        extraction_mode : ExtractionMode, optional
+            How entities and facts are extracted from episodes. ExtractionMode.combined extracts
+            both in a single LLM call instead of two sequential calls. Defaults to
+            ExtractionMode.sequential.
+        reflexion_policy : ReflexionPolicy | None, optional
+            Controls when the extraction reflexion follow-up runs. If not provided, reflexion runs
+            up to MAX_REFLEXION_ITERATIONS rounds for every episode.
+        episode_context : EpisodeContextConfig | None, optional
+            Token limits on the previous episodes embedded in extraction prompts, optionally
+            replacing older episodes with a cached rolling summary. If not provided, previous
+            episodes are used as retrieved.
+        concurrency : ConcurrencyConfig | None, optional
+            Process-wide limits for concurrent graph database, LLM, embedder and reranker calls,
+            shared by all Graphiti instances, with weighted sharing between search, ingestion and
+            maintenance work. If not provided, the current process-wide limiters are kept.
+        neo4j_config : Neo4jDriverConfig | None, optional
+            Connection pool sizes and timeouts, fetch size, read replica routing and a separate
+            read pool for the default Neo4jDriver. Ignored when graph_driver is provided.
+        metrics_hook : Callable[[str, dict[str, Any]], None] | None, optional
+            Called by the default Neo4jDriver after each query with the pool name ('read' or
+            'write') and a snapshot of its statistics. Ignored when graph_driver is provided.
 
         Returns
         -------
@@ -167,11 +226,15 @@ class Graphiti:
         else:
             if uri is None:
                 raise ValueError('uri must be provided when graph_driver is None')
-            self.driver = Neo4jDriver(uri, user, password)
+            self.driver = Neo4jDriver(
+                uri, user, password, config=neo4j_config, metrics_hook=metrics_hook
+            )
 
         self.database = DEFAULT_DATABASE
         self.store_raw_episode_content = store_raw_episode_content
         self.max_coroutines = max_coroutines
+        self.extraction_mode = extraction_mode
+        self.reflexion_policy = reflexion_policy
         if llm_client:
             self.llm_client = llm_client
         else:
@@ -184,6 +247,9 @@ class Graphiti:
             self.cross_encoder = cross_encoder
         else:
             self.cross_encoder = OpenAIRerankerClient()
+        self.episode_context_manager = EpisodeContextManager(episode_context, self.llm_client)
+        if concurrency is not None:
+            configure_limiters(concurrency)
 
         self.clients = GraphitiClients(
             driver=self.driver,
@@ -279,6 +345,7 @@ class Graphiti:
         """
         await self.driver.close()
 
+    @with_priority(Priority.maintenance)
     async def build_indices_and_constraints(self, delete_existing: bool = False):
         """
         Build indices and constraints in the Neo4j database.
@@ -314,6 +381,7 @@ class Graphiti:
         """
         await build_indices_and_constraints(self.driver, delete_existing)
 
+    @with_priority(Priority.interactive)
     async def retrieve_episodes(
         self,
         reference_time: datetime,
@@ -348,6 +416,7 @@ class Graphiti:
         """
         return await retrieve_episodes(self.driver, reference_time, last_n, group_ids, source)
 
+    @with_priority(Priority.ingestion)
     async def add_episode(
         self,
         name: str,
@@ -363,6 +432,7 @@ class Graphiti:
         previous_episode_uuids: list[str] | None = None,
         edge_types: dict[str, BaseModel] | None = None,
         edge_type_map: dict[tuple[str, str], list[str]] | None = None,
+        timeout: float | None = None,
     ) -> AddEpisodeResults:
         """
         Process an episode and update the graph.
@@ -397,6 +467,9 @@ class Graphiti:
         previous_episode_uuids : list[str] | None
             Optional.  list of episode uuids to use as the previous episodes. If this is not provided,
             the most recent episodes by created_at date will be used.
+        timeout : float | None
+            Optional. Seconds the whole operation may take. LLM, embedder and database calls
+            (including their retries) that would run past it raise DeadlineExceededError.
 
         Returns
         -------
@@ -419,125 +492,169 @@ class Graphiti:
                 background_tasks.add_task(graphiti.add_episode, **episode_data.dict())
                 return {"message": "Episode processing started"}
         """
-        try:
-            start = time()
-            now = utc_now()
-
-            validate_entity_types(entity_types)
-            validate_excluded_entity_types(excluded_entity_types, entity_types)
-            validate_group_id(group_id)
-
-            previous_episodes = (
-                await self.retrieve_episodes(
-                    reference_time,
-                    last_n=RELEVANT_SCHEMA_LIMIT,
-                    group_ids=[group_id],
-                    source=source,
+        with deadline(timeout):
+            try:
+                start = time()
+                now = utc_now()
+
+                validate_entity_types(entity_types)
+                validate_excluded_entity_types(excluded_entity_types, entity_types)
+                validate_group_id(group_id)
+
+                previous_episodes = (
+                    await self.retrieve_episodes(
+                        reference_time,
+                        last_n=RELEVANT_SCHEMA_LIMIT,
+                        group_ids=[group_id],
+                        source=source,
+                    )
+                    if previous_episode_uuids is None
+                    else await EpisodicNode.get_by_uuids(self.driver, previous_episode_uuids)
                 )
-                if previous_episode_uuids is None
-                else await EpisodicNode.get_by_uuids(self.driver, previous_episode_uuids)
-            )
 
-            episode = (
-                await EpisodicNode.get_by_uuid(self.driver, uuid)
-                if uuid is not None
-                else EpisodicNode(
-                    name=name,
-                    group_id=group_id,
-                    labels=[],
-                    source=source,
-                    content=episode_body,
-                    source_description=source_description,
-                    created_at=now,
-                    valid_at=reference_time,
+                episode = (
+                    await EpisodicNode.get_by_uuid(self.driver, uuid)
+                    if uuid is not None
+                    else EpisodicNode(
+                        name=name,
+                        group_id=group_id,
+                        labels=[],
+                        source=source,
+                        content=episode_body,
+                        source_description=source_description,
+                        created_at=now,
+                        valid_at=reference_time,
+                    )
                 )
-            )
-
-            # Create default edge type map
-            edge_type_map_default = (
-                {('Entity', 'Entity'): list(edge_types.keys())}
-                if edge_types is not None
-                else {('Entity', 'Entity'): []}
-            )
-
-            # Extract entities as nodes
 
-            extracted_nodes = await extract_nodes(
-                self.clients, episode, previous_episodes, entity_types, excluded_entity_types
-            )
-
-            # Extract edges and resolve nodes
-            (nodes, uuid_map, node_duplicates), extracted_edges = await semaphore_gather(
-                resolve_extracted_nodes(
-                    self.clients,
-                    extracted_nodes,
-                    episode,
-                    previous_episodes,
-                    entity_types,
-                ),
-                extract_edges(
-                    self.clients,
-                    episode,
-                    extracted_nodes,
-                    previous_episodes,
-                    edge_type_map or edge_type_map_default,
-                    group_id,
-                    edge_types,
-                ),
-                max_coroutines=self.max_coroutines,
-            )
-
-            edges = resolve_edge_pointers(extracted_edges, uuid_map)
+                # Compact the previous episode context once, it is shared by every prompt below
+                previous_episodes = await self.episode_context_manager.build(
+                    episode, previous_episodes
+                )
 
-            (resolved_edges, invalidated_edges), hydrated_nodes = await semaphore_gather(
-                resolve_extracted_edges(
-                    self.clients,
-                    edges,
-                    episode,
-                    nodes,
-                    edge_types or {},
-                    edge_type_map or edge_type_map_default,
-                ),
-                extract_attributes_from_nodes(
-                    self.clients, nodes, episode, previous_episodes, entity_types
-                ),
-                max_coroutines=self.max_coroutines,
-            )
+                # Create default edge type map
+                edge_type_map_default = (
+                    {('Entity', 'Entity'): list(edge_types.keys())}
+                    if edge_types is not None
+                    else {('Entity', 'Entity'): []}
+                )
 
-            duplicate_of_edges = build_duplicate_of_edges(episode, now, node_duplicates)
+                if self.extraction_mode == ExtractionMode.combined:
+                    # Extract entities and edges together, then resolve nodes
+                    extracted_nodes, extracted_edges = await extract_nodes_and_edges(
+                        self.clients,
+                        episode,
+                        previous_episodes,
+                        entity_types,
+                        excluded_entity_types,
+                        edge_type_map or edge_type_map_default,
+                        edge_types,
+                        group_id,
+                        self.reflexion_policy,
+                    )
+
+                    (nodes, uuid_map, node_duplicates) = await resolve_extracted_nodes(
+                        self.clients,
+                        extracted_nodes,
+                        episode,
+                        previous_episodes,
+                        entity_types,
+                    )
+                else:
+                    # Extract entities as nodes
+                    extracted_nodes = await extract_nodes(
+                        self.clients,
+                        episode,
+                        previous_episodes,
+                        entity_types,
+                        excluded_entity_types,
+                        self.reflexion_policy,
+                    )
+
+                    # Extract edges and resolve nodes
+                    (nodes, uuid_map, node_duplicates), extracted_edges = await semaphore_gather(
+                        resolve_extracted_nodes(
+                            self.clients,
+                            extracted_nodes,
+                            episode,
+                            previous_episodes,
+                            entity_types,
+                        ),
+                        extract_edges(
+                            self.clients,
+                            episode,
+                            extracted_nodes,
+                            previous_episodes,
+                            edge_type_map or edge_type_map_default,
+                            group_id,
+                            edge_types,
+                            self.reflexion_policy,
+                        ),
+                        max_coroutines=self.max_coroutines,
+                    )
+
+                edges = resolve_edge_pointers(extracted_edges, uuid_map)
+
+                (resolved_edges, invalidated_edges), hydrated_nodes = await semaphore_gather(
+                    resolve_extracted_edges(
+                        self.clients,
+                        edges,
+                        episode,
+                        nodes,
+                        edge_types or {},
+                        edge_type_map or edge_type_map_default,
+                    ),
+                    extract_attributes_from_nodes(
+                        self.clients, nodes, episode, previous_episodes, entity_types
+                    ),
+                    max_coroutines=self.max_coroutines,
+                )
 
-            entity_edges = resolved_edges + invalidated_edges + duplicate_of_edges
+                duplicate_of_edges = build_duplicate_of_edges(episode, now, node_duplicates)
 
-            episodic_edges = build_episodic_edges(nodes, episode, now)
+                entity_edges = resolved_edges + invalidated_edges + duplicate_of_edges
 
-            episode.entity_edges = [edge.uuid for edge in entity_edges]
+                episodic_edges = build_episodic_edges(nodes, episode, now)
 
-            if not self.store_raw_episode_content:
-                episode.content = ''
+                episode.entity_edges = [edge.uuid for edge in entity_edges]
 
-            await add_nodes_and_edges_bulk(
-                self.driver, [episode], episodic_edges, hydrated_nodes, entity_edges, self.embedder
-            )
+                if not self.store_raw_episode_content:
+                    episode.content = ''
 
-            # Update any communities
-            if update_communities:
-                await semaphore_gather(
-                    *[
-                        update_community(self.driver, self.llm_client, self.embedder, node)
-                        for node in nodes
-                    ],
-                    max_coroutines=self.max_coroutines,
+                await add_nodes_and_edges_bulk(
+                    self.driver,
+                    [episode],
+                    episodic_edges,
+                    hydrated_nodes,
+                    entity_edges,
+                    self.embedder,
                 )
-            end = time()
-            logger.info(f'Completed add_episode in {(end - start) * 1000} ms')
 
-            return AddEpisodeResults(episode=episode, nodes=nodes, edges=entity_edges)
+                # Update any communities
+                if update_communities:
+                    await semaphore_gather(
+                        *[
+                            update_community(self.driver, self.llm_client, self.embedder, node)
+                            for node in nodes
+                        ],
+                        max_coroutines=self.max_coroutines,
+                    )
+                end = time()
+                logger.info(f'Completed add_episode in {(end - start) * 1000} ms')
 
-        except Exception as e:
-            raise e
+                return AddEpisodeResults(episode=episode, nodes=nodes, edges=entity_edges)
+
+            except Exception as e:
+                raise e
 
     #### WIP: USE AT YOUR OWN RISK ####
-    async def add_episode_bulk(self, bulk_episodes: list[RawEpisode], group_id: str = ''):
+    @with_priority(Priority.ingestion)
+    async def add_episode_bulk(
+        self,
+        bulk_episodes: list[RawEpisode],
+        group_id: str = '',
+        write_chunk_size: int = BULK_WRITE_CHUNK_SIZE,
+    ):
         """
         Process multiple episodes in bulk and update the graph.
 
@@ -550,6 +667,8 @@ class Graphiti:
             A list of RawEpisode objects to be processed and added to the graph.
         group_id : str | None
             An id for the graph partition the episode is a part of.
+        write_chunk_size : int, optional
+            The number of rows written per transaction when saving to the graph.
 
         Returns
         -------
@@ -563,107 +682,258 @@ class Graphiti:
         - Extracting nodes and edges from all episodes
         - Generating embeddings for nodes and edges
         - Deduplicating nodes and edges
+        - Extracting edge dates and invalidating contradicted edges, in reference time order
         - Saving nodes, episodic edges, and entity edges to the knowledge graph
 
+        Writes go through chunked UNWIND transactions of write_chunk_size rows. They are not
+        atomic: a chunk that keeps failing raises after the chunks before it were saved.
+
         This bulk operation is designed for efficiency when processing multiple episodes
-        at once. However, it's important to ensure that the bulk operation doesn't
-        overwhelm system resources. Consider implementing rate limiting or chunking for
-        very large batches of episodes.
+        at once. All episodes and their extracted nodes and edges are held in memory, so use
+        `ingest_stream` for very large imports.
 
-        Important: This method does not perform edge invalidation or date extraction steps.
-        If these operations are required, use the `add_episode` method instead for each
-        individual episode.
+        Contradicted edges are invalidated as if the episodes were added one by one with
+        `add_episode`, in reference time order.
         """
         try:
             start = time()
-            now = utc_now()
 
             validate_group_id(group_id)
 
-            episodes = [
-                EpisodicNode(
-                    name=episode.name,
-                    labels=[],
-                    source=episode.source,
-                    content=episode.content,
-                    source_description=episode.source_description,
-                    group_id=group_id,
-                    created_at=now,
-                    valid_at=episode.reference_time,
-                )
-                for episode in bulk_episodes
-            ]
+            await self._add_episodes_bulk(bulk_episodes, group_id, write_chunk_size)
 
-            # Save all the episodes
-            await semaphore_gather(
-                *[episode.save(self.driver) for episode in episodes],
-                max_coroutines=self.max_coroutines,
-            )
+            end = time()
+            logger.info(f'Completed add_episode_bulk in {(end - start) * 1000} ms')
 
-            # Get previous episode context for each episode
-            episode_pairs = await retrieve_previous_episodes_bulk(self.driver, episodes)
-
-            # Extract all nodes and edges
-            (
-                extracted_nodes,
-                extracted_edges,
-                episodic_edges,
-            ) = await extract_nodes_and_edges_bulk(self.clients, episode_pairs, None, None)
-
-            # Generate embeddings
-            await semaphore_gather(
-                *[node.generate_name_embedding(self.embedder) for node in extracted_nodes],
-                *[edge.generate_embedding(self.embedder) for edge in extracted_edges],
-                max_coroutines=self.max_coroutines,
-            )
+        except Exception as e:
+            raise e
 
-            # Dedupe extracted nodes, compress extracted edges
-            (nodes, uuid_map), extracted_edges_timestamped = await semaphore_gather(
-                dedupe_nodes_bulk(self.driver, self.llm_client, extracted_nodes),
-                extract_edge_dates_bulk(self.llm_client, extracted_edges, episode_pairs),
-                max_coroutines=self.max_coroutines,
-            )
+    @with_priority(Priority.ingestion)
+    async def ingest_stream(
+        self,
+        episodes: AsyncIterable[RawEpisode],
+        group_id: str = '',
+        window_size: int = DEFAULT_STREAM_WINDOW,
+        max_pending: int | None = None,
+        checkpoint_path: str | None = None,
+        write_chunk_size: int = BULK_WRITE_CHUNK_SIZE,
+        entity_cache_size: int = DEFAULT_ENTITY_CACHE_SIZE,
+    ) -> int:
+        """
+        Ingest a stream of episodes of any length in windows, with bounded memory.
 
-            # save nodes to KG
-            await semaphore_gather(
-                *[node.save(self.driver) for node in nodes],
-                max_coroutines=self.max_coroutines,
-            )
+        Each window of episodes is sorted by reference time and added like add_episode_bulk, and
+        only one window is processed at a time. Entities resolved in earlier windows are
+        remembered, so later mentions of the same name map to them without deduplication.
 
-            # re-map edge pointers so that they don't point to discard dupe nodes
-            extracted_edges_with_resolved_pointers: list[EntityEdge] = resolve_edge_pointers(
-                extracted_edges_timestamped, uuid_map
-            )
-            episodic_edges_with_resolved_pointers: list[EpisodicEdge] = resolve_edge_pointers(
-                episodic_edges, uuid_map
-            )
+        Parameters
+        ----------
+        episodes : AsyncIterable[RawEpisode]
+            The episodes to ingest, ideally ordered by reference time.
+        group_id : str
+            An id for the graph partition the episodes are a part of.
+        window_size : int, optional
+            The number of episodes processed together.
+        max_pending : int | None, optional
+            The number of episodes read ahead of the current window. The stream is not read
+            further while this many are waiting. Defaults to window_size.
+        checkpoint_path : str | None, optional
+            A file recording progress after each window. If it exists, ingestion resumes after
+            the episodes it records, so the stream must yield the same episodes in the same
+            order when an import is restarted. A window interrupted part way is ingested again
+            with the same episode uuids, so its episodes are merged rather than duplicated.
+        write_chunk_size : int, optional
+            The number of rows written per transaction when saving to the graph.
+        entity_cache_size : int, optional
+            The number of resolved entities remembered across windows.
 
-            # save episodic edges to KG
-            await semaphore_gather(
-                *[edge.save(self.driver) for edge in episodic_edges_with_resolved_pointers],
-                max_coroutines=self.max_coroutines,
+        Returns
+        -------
+        int
+            The number of episodes ingested by this call, not counting resumed ones.
+        """
+        start = time()
+        validate_group_id(group_id)
+
+        checkpoint = load_stream_checkpoint(checkpoint_path) if checkpoint_path else None
+        if checkpoint is None:
+            checkpoint = StreamCheckpoint(group_id=group_id)
+        elif checkpoint.group_id != group_id:
+            raise ValueError(
+                f'Checkpoint {checkpoint_path} belongs to group {checkpoint.group_id!r}, '
+                f'not {group_id!r}'
             )
+        elif checkpoint.episodes_done > 0:
+            logger.info(f'Resuming ingestion after {checkpoint.episodes_done} episodes')
+        if checkpoint_path and checkpoint.episodes_done == 0:
+            # Saved up front, so a retried first window reuses the stream's episode uuids
+            save_stream_checkpoint(checkpoint_path, checkpoint)
+
+        ingested = 0
+        windows = episode_windows(
+            episodes,
+            window_size,
+            max_pending if max_pending is not None else window_size,
+            skip=checkpoint.episodes_done,
+        )
+        async with aclosing(windows):
+            async for window in windows:
+                # Episode uuids follow the stream offset, so retrying a window after a failure
+                # merges into the episodes it already wrote instead of duplicating them
+                uuids = [
+                    stream_episode_uuid(checkpoint.stream_id, checkpoint.episodes_done + i)
+                    for i in range(len(window))
+                ]
+                ordered = sorted(zip(window, uuids, strict=True), key=lambda p: p[0].reference_time)
+                window = [episode for episode, _ in ordered]
+                nodes = await self._add_episodes_bulk(
+                    window,
+                    group_id,
+                    write_chunk_size,
+                    checkpoint.entity_uuids,
+                    [uuid for _, uuid in ordered],
+                )
+
+                entity_uuids = checkpoint.entity_uuids
+                for node in nodes:
+                    entity_uuids.pop(node.name, None)
+                    entity_uuids[node.name] = node.uuid
+                while len(entity_uuids) > entity_cache_size:
+                    # Evict the least recently used entity
+                    del entity_uuids[next(iter(entity_uuids))]
+
+                checkpoint.episodes_done += len(window)
+                checkpoint.last_reference_time = window[-1].reference_time
+                if checkpoint_path:
+                    save_stream_checkpoint(checkpoint_path, checkpoint)
+
+                ingested += len(window)
+                logger.info(f'Ingested {checkpoint.episodes_done} episodes')
 
-            # Dedupe extracted edges
-            edges = await dedupe_edges_bulk(
-                self.driver, self.llm_client, extracted_edges_with_resolved_pointers
+        end = time()
+        logger.info(f'Completed ingest_stream of {ingested} episodes in {(end - start) * 1000} ms')
+
+        return ingested
+
+    async def _add_episodes_bulk(
+        self,
+        bulk_episodes: list[RawEpisode],
+        group_id: str,
+        write_chunk_size: int,
+        entity_uuids: dict[str, str] | None = None,
+        episode_uuids: list[str] | None = None,
+    ) -> list[EntityNode]:
+        """
+        Add episodes in bulk, returning the entity nodes they resolved to.
+
+        Extracted entities named in entity_uuids are mapped to those uuids without deduplication.
+        Episodes get episode_uuids when given, so adding the same episodes again merges into them.
+        """
+        now = utc_now()
+
+        episodes = [
+            EpisodicNode(
+                name=episode.name,
+                labels=[],
+                source=episode.source,
+                content=episode.content,
+                source_description=episode.source_description,
+                group_id=group_id,
+                created_at=now,
+                valid_at=episode.reference_time,
             )
-            logger.debug(f'extracted edge length: {len(edges)}')
+            for episode in bulk_episodes
+        ]
+        if episode_uuids is not None:
+            for episode, episode_uuid in zip(episodes, episode_uuids, strict=True):
+                episode.uuid = episode_uuid
+
+        # Save all the episodes
+        await add_nodes_and_edges_chunked(
+            self.driver, episodes, [], [], [], self.embedder, write_chunk_size
+        )
+
+        # Get previous episode context for each episode
+        episode_pairs = await retrieve_previous_episodes_bulk(self.driver, episodes)
+        compacted_previous_episodes = await semaphore_gather(
+            *[
+                self.episode_context_manager.build(episode, previous_episodes)
+                for episode, previous_episodes in episode_pairs
+            ],
+            max_coroutines=self.max_coroutines,
+        )
+        episode_pairs = [
+            (episode, compacted_previous_episodes[i])
+            for i, (episode, _) in enumerate(episode_pairs)
+        ]
+
+        # Extract all nodes and edges
+        (
+            extracted_nodes,
+            extracted_edges,
+            episodic_edges,
+        ) = await extract_nodes_and_edges_bulk(
+            self.clients, episode_pairs, None, None, self.reflexion_policy
+        )
 
-            # invalidate edges
+        # Map entities resolved by earlier calls
+        known_uuid_map: dict[str, str] = {}
+        if entity_uuids is not None:
+            extracted_nodes, known_uuid_map = resolve_known_entities(extracted_nodes, entity_uuids)
+
+        # Generate embeddings
+        await semaphore_gather(
+            *[node.generate_name_embedding(self.embedder) for node in extracted_nodes],
+            *[edge.generate_embedding(self.embedder) for edge in extracted_edges],
+            max_coroutines=self.max_coroutines,
+        )
 
-            # save edges to KG
-            await semaphore_gather(
-                *[edge.save(self.driver) for edge in edges],
-                max_coroutines=self.max_coroutines,
+        # Dedupe extracted nodes, compress extracted edges
+        (nodes, uuid_map), extracted_edges_timestamped = await semaphore_gather(
+            dedupe_nodes_bulk(self.driver, self.llm_client, extracted_nodes),
+            extract_edge_dates_bulk(self.llm_client, extracted_edges, episode_pairs),
+            max_coroutines=self.max_coroutines,
+        )
+        uuid_map.update(known_uuid_map)
+
+        # re-map edge pointers so that they don't point to discard dupe nodes
+        extracted_edges_with_resolved_pointers: list[EntityEdge] = resolve_edge_pointers(
+            extracted_edges_timestamped, uuid_map
+        )
+        episodic_edges_with_resolved_pointers: list[EpisodicEdge] = resolve_edge_pointers(
+            episodic_edges, uuid_map
+        )
+        # One mention per episode and entity, written again in place when a window is retried
+        for episodic_edge in episodic_edges_with_resolved_pointers:
+            episodic_edge.uuid = str(
+                uuid5(UUID(episodic_edge.source_node_uuid), episodic_edge.target_node_uuid)
             )
 
-            end = time()
-            logger.info(f'Completed add_episode_bulk in {(end - start) * 1000} ms')
+        # Dedupe extracted edges
+        edges = await dedupe_edges_bulk(
+            self.driver, self.llm_client, extracted_edges_with_resolved_pointers
+        )
+        logger.debug(f'extracted edge length: {len(edges)}')
 
-        except Exception as e:
-            raise e
+        # Invalidate edges contradicted by the new edges, in reference time order
+        invalidated_edges = await invalidate_edges_bulk(
+            self.driver, self.llm_client, edges, episodes
+        )
+
+        # save nodes, episodic edges and entity edges to KG
+        await add_nodes_and_edges_chunked(
+            self.driver,
+            [],
+            episodic_edges_with_resolved_pointers,
+            nodes,
+            edges + invalidated_edges,
+            self.embedder,
+            write_chunk_size,
+        )
 
+        return nodes
+
+    @with_priority(Priority.maintenance)
     async def build_communities(self, group_ids: list[str] | None = None) -> list[CommunityNode]:
         """
         Use a community clustering algorithm to find communities of nodes. Create community nodes summarising
@@ -695,6 +965,7 @@ class Graphiti:
 
         return community_nodes
 
+    @with_priority(Priority.interactive)
     async def search(
         self,
         query: str,
@@ -702,6 +973,7 @@ class Graphiti:
         group_ids: list[str] | None = None,
         num_results=DEFAULT_SEARCH_LIMIT,
         search_filter: SearchFilters | None = None,
+        timeout: float | None = None,
     ) -> list[EntityEdge]:
         """
         Perform a hybrid search on the knowledge graph.
@@ -722,6 +994,8 @@ class Graphiti:
             The graph partitions to return data from.
         num_results : int, optional
             The maximum number of results to return. Defaults to 10.
+        timeout : float | None, optional
+            Seconds the search may take. Calls that would run past it raise DeadlineExceededError.
 
         Returns
         -------
@@ -741,19 +1015,21 @@ class Graphiti:
         )
         search_config.limit = num_results
 
-        edges = (
-            await search(
-                self.clients,
-                query,
-                group_ids,
-                search_config,
-                search_filter if search_filter is not None else SearchFilters(),
-                center_node_uuid,
-            )
-        ).edges
+        with deadline(timeout):
+            edges = (
+                await search(
+                    self.clients,
+                    query,
+                    group_ids,
+                    search_config,
+                    search_filter if search_filter is not None else SearchFilters(),
+                    center_node_uuid,
+                )
+            ).edges
 
         return edges
 
+    @with_priority(Priority.interactive)
     async def _search(
         self,
         query: str,
@@ -768,6 +1044,7 @@ class Graphiti:
             query, config, group_ids, center_node_uuid, bfs_origin_node_uuids, search_filter
         )
 
+    @with_priority(Priority.interactive)
     async def search_(
         self,
         query: str,
@@ -776,24 +1053,31 @@ class Graphiti:
         center_node_uuid: str | None = None,
         bfs_origin_node_uuids: list[str] | None = None,
         search_filter: SearchFilters | None = None,
+        timeout: float | None = None,
     ) -> SearchResults:
         """search_ (replaces _search) is our advanced search method that returns Graph objects (nodes and edges) rather
         than a list of facts. This endpoint allows the end user to utilize more advanced features such as filters and
         different search and reranker methodologies across different layers in the graph.
 
         For different config recipes refer to search/search_config_recipes.
+
+        With a timeout, calls that would run past it raise DeadlineExceededError, except
+        cross-encoder reranking, which is skipped in favour of RRF ordering when the deadline is
+        near so that the search can still return its results.
         """
 
-        return await search(
-            self.clients,
-            query,
-            group_ids,
-            config,
-            search_filter if search_filter is not None else SearchFilters(),
-            center_node_uuid,
-            bfs_origin_node_uuids,
-        )
+        with deadline(timeout):
+            return await search(
+                self.clients,
+                query,
+                group_ids,
+                config,
+                search_filter if search_filter is not None else SearchFilters(),
+                center_node_uuid,
+                bfs_origin_node_uuids,
+            )
 
+    @with_priority(Priority.interactive)
     async def get_nodes_and_edges_by_episode(self, episode_uuids: list[str]) -> SearchResults:
         episodes = await EpisodicNode.get_by_uuids(self.driver, episode_uuids)
 
@@ -808,6 +1092,7 @@ class Graphiti:
 
         return SearchResults(edges=edges, nodes=nodes, episodes=[], communities=[])
 
+    @with_priority(Priority.ingestion)
     async def add_triplet(self, source_node: EntityNode, edge: EntityEdge, target_node: EntityNode):
         if source_node.name_embedding is None:
             await source_node.generate_name_embedding(self.embedder)
@@ -848,6 +1133,7 @@ class Graphiti:
             self.driver, [], [], resolved_nodes, [resolved_edge] + invalidated_edges, self.embedder
         )
 
+    @with_priority(Priority.maintenance)
     async def remove_episode(self, episode_uuid: str):
         # Find the episode to be deleted
         episode = await EpisodicNode.get_by_uuid(self.driver, episode_uuid)
@@ -864,23 +1150,20 @@ class Graphiti:
         # Find nodes mentioned by the episode
         nodes = await get_mentioned_nodes(self.driver, [episode])
         # We should delete all nodes that are only mentioned in the deleted episode
-        nodes_to_delete: list[EntityNode] = []
-        for node in nodes:
-            query: LiteralString = 'MATCH (e:Episodic)-[:MENTIONS]->(n:Entity {uuid: $uuid}) RETURN count(*) AS episode_count'
-            records, _, _ = await self.driver.execute_query(
-                query, uuid=node.uuid, database_=DEFAULT_DATABASE, routing_='r'
-            )
-
-            for record in records:
-                if record['episode_count'] == 1:
-                    nodes_to_delete.append(node)
-
-        await semaphore_gather(
-            *[node.delete(self.driver) for node in nodes_to_delete],
-            max_coroutines=self.max_coroutines,
+        query: LiteralString = 'MATCH (e:Episodic)-[:MENTIONS]->(n:Entity {uuid: $uuid}) RETURN count(*) AS episode_count'
+        results = await self.driver.execute_many(
+            [(query, {'uuid': node.uuid}) for node in nodes], database_=DEFAULT_DATABASE
         )
-        await semaphore_gather(
-            *[edge.delete(self.driver) for edge in edges_to_delete],
-            max_coroutines=self.max_coroutines,
+        nodes_to_delete: list[EntityNode] = [
+            node
+            for node, (records, _, _) in zip(nodes, results, strict=True)
+            if any(record['episode_count'] == 1 for record in records)
+        ]
+
+        await self.driver.execute_many(
+            [(NODE_DELETE, {'uuid': node.uuid}) for node in nodes_to_delete]
+            + [(EDGE_DELETE, {'uuid': edge.uuid}) for edge in edges_to_delete]
+            + [(NODE_DELETE, {'uuid': episode.uuid})],
+            database_=DEFAULT_DATABASE,
+            transactional=True,
         )
-        await episode.delete(self.driver)
@@ -15,6 +15,7 @@ limitations under the License.
 """
 
 import asyncio
+import inspect
 import os
 import re
 from collections.abc import Coroutine
@@ -96,18 +97,66 @@ def normalize_l2(embedding: list[float]) -> NDArray:
     return np.where(norm == 0, embedding_array, embedding_array / norm)
 
 
+def estimate_token_count(text: str) -> int:
+    # Rough estimate of roughly four characters per token, used for budgeting rather than billing
+    return (len(text) + 3) // 4
+
+
 # Use this instead of asyncio.gather() to bound coroutines
 async def semaphore_gather(
     *coroutines: Coroutine,
     max_coroutines: int | None = None,
+    partial_results: bool = False,
 ) -> list[Any]:
+    """
+    Run coroutines at most max_coroutines at a time and return their results in input order.
+
+    Like a TaskGroup, the first failure cancels the coroutines that are still running or waiting
+    for the semaphore, and is raised once they have all finished, so no work continues for a
+    result that would be thrown away. Cancelling the caller cancels all coroutines the same way.
+
+    With partial_results=True, for best-effort work, failures do not cancel the other coroutines
+    and the exception of each failed coroutine is returned in place of its result.
+    """
     semaphore = asyncio.Semaphore(max_coroutines or SEMAPHORE_LIMIT)
 
     async def _wrap_coroutine(coroutine):
         async with semaphore:
             return await coroutine
 
-    return await asyncio.gather(*(_wrap_coroutine(coroutine) for coroutine in coroutines))
+    if not coroutines:
+        return []
+
+    tasks = [asyncio.ensure_future(_wrap_coroutine(coroutine)) for coroutine in coroutines]
+    if partial_results:
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    first_error: list[BaseException] = []
+
+    def _on_done(task: asyncio.Future):
+        if not first_error and not task.cancelled() and task.exception() is not None:
+            first_error.append(task.exception())  # type: ignore[arg-type]
+            for sibling in tasks:
+                sibling.cancel()
+
+    for task in tasks:
+        task.add_done_callback(_on_done)
+
+    try:
+        await asyncio.wait(tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Coroutines cancelled before they started are closed so they are not reported as never
+        # awaited
+        for coroutine in coroutines:
+            if inspect.iscoroutine(coroutine):
+                coroutine.close()
+
+    if first_error:
+        raise first_error[0]
+    return [task.result() for task in tasks]
 
 
 def validate_group_id(group_id: str) -> bool:
@@ -19,17 +19,20 @@ import logging
 import os
 import typing
 from json import JSONDecodeError
-from typing import Literal
+from typing import ClassVar, Literal
 
 import anthropic
 from anthropic import AsyncAnthropic
-from anthropic.types import MessageParam, ToolChoiceParam, ToolUnionParam
+from anthropic.types import MessageParam, TextBlockParam, ToolChoiceParam, ToolUnionParam
 from pydantic import BaseModel, ValidationError
 
+from ..errors import DeadlineExceededError
 from ..prompts.models import Message
+from .cache import LLMCache
 from .client import LLMClient
 from .config import DEFAULT_MAX_TOKENS, LLMConfig, ModelSize
 from .errors import RateLimitError, RefusalError
+from .utils import get_response_model_schema
 
 logger = logging.getLogger(__name__)
 
@@ -58,9 +61,10 @@ class AnthropicClient(LLMClient):
 
     Args:
         config: A configuration object for the LLM.
-        cache: Whether to cache the LLM responses.
+        cache: Whether to cache the LLM responses, or the LLMCache to use.
         client: An optional client instance to use.
         max_tokens: The maximum number of tokens to generate.
+        prompt_caching: Whether to mark the tools and system prompt as a cacheable prefix.
 
     Methods:
         generate_response: Generate a response from the LLM.
@@ -73,12 +77,16 @@ class AnthropicClient(LLMClient):
 
     model: AnthropicModel
 
+    # The response model is enforced through the tool input schema
+    SCHEMA_IN_PROMPT: ClassVar[bool] = False
+
     def __init__(
         self,
         config: LLMConfig | None = None,
-        cache: bool = False,
+        cache: bool | LLMCache = False,
         client: AsyncAnthropic | None = None,
         max_tokens: int = DEFAULT_MAX_TOKENS,
+        prompt_caching: bool = True,
     ) -> None:
         if config is None:
             config = LLMConfig()
@@ -91,6 +99,7 @@ class AnthropicClient(LLMClient):
         super().__init__(config, cache)
         # Explicitly set the instance model to the config model to prevent type checking errors
         self.model = typing.cast(AnthropicModel, config.model)
+        self.prompt_caching = prompt_caching
 
         if not client:
             self.client = AsyncAnthropic(
@@ -140,7 +149,7 @@ class AnthropicClient(LLMClient):
         """
         if response_model is not None:
             # Use the response_model to define the tool
-            model_schema = response_model.model_json_schema()
+            model_schema = get_response_model_schema(response_model)
             tool_name = response_model.__name__
             description = model_schema.get('description', f'Extract {tool_name} information')
         else:
@@ -188,6 +197,18 @@ class AnthropicClient(LLMClient):
             Exception: If an error occurs during the generation process.
         """
         system_message = messages[0]
+        # The tool definition and system prompt only depend on the prompt, so a cache breakpoint
+        # after the system prompt lets repeated calls reuse them. Prompts shorter than the model's
+        # minimum cacheable length are processed normally.
+        system: str | list[TextBlockParam] = system_message.content
+        if self.prompt_caching:
+            system = [
+                {
+                    'type': 'text',
+                    'text': system_message.content,
+                    'cache_control': {'type': 'ephemeral'},
+                }
+            ]
         user_messages = [{'role': m.role, 'content': m.content} for m in messages[1:]]
         user_messages_cast = typing.cast(list[MessageParam], user_messages)
 
@@ -202,7 +223,7 @@ class AnthropicClient(LLMClient):
             # Create the appropriate tool based on whether response_model is provided
             tools, tool_choice = self._create_tool(response_model)
             result = await self.client.messages.create(
-                system=system_message.content,
+                system=system,
                 max_tokens=max_creation_tokens,
                 temperature=self.temperature,
                 messages=user_messages_cast,
@@ -211,6 +232,17 @@ class AnthropicClient(LLMClient):
                 tool_choice=tool_choice,
             )
 
+            usage = getattr(result, 'usage', None)
+            if usage is not None:
+                # input_tokens excludes the tokens read from or written to the cache
+                self.token_usage.record(
+                    prompt_tokens=usage.input_tokens,
+                    completion_tokens=usage.output_tokens,
+                    cached_prompt_tokens=getattr(usage, 'cache_read_input_tokens', 0),
+                    cache_creation_tokens=getattr(usage, 'cache_creation_input_tokens', 0),
+                    cache_tokens_in_prompt=False,
+                )
+
             # Extract the tool output from the response
             for content_item in result.content:
                 if content_item.type == 'tool_use':
@@ -246,15 +278,15 @@ class AnthropicClient(LLMClient):
         except Exception as e:
             raise e
 
-    async def generate_response(
+    async def _generate_response_with_retry(
         self,
         messages: list[Message],
         response_model: type[BaseModel] | None = None,
-        max_tokens: int | None = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
         model_size: ModelSize = ModelSize.medium,
     ) -> dict[str, typing.Any]:
         """
-        Generate a response from the LLM.
+        Generate a response from the LLM, retrying invalid responses.
 
         Args:
             messages: List of message objects to send to the LLM.
@@ -269,16 +301,13 @@ class AnthropicClient(LLMClient):
             RefusalError: If the LLM refuses to respond.
             Exception: If an error occurs during the generation process.
         """
-        if max_tokens is None:
-            max_tokens = self.max_tokens
-
         retry_count = 0
         max_retries = 2
         last_error: Exception | None = None
 
         while retry_count <= max_retries:
             try:
-                response = await self._generate_response(
+                response = await self._generate_response_limited(
                     messages, response_model, max_tokens, model_size
                 )
 
@@ -291,7 +320,7 @@ class AnthropicClient(LLMClient):
                 # If no validation needed, return the response
                 return response
 
-            except (RateLimitError, RefusalError):
+            except (RateLimitError, RefusalError, DeadlineExceededError):
                 # These errors should not trigger retries
                 raise
             except Exception as e:
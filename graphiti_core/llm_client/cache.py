@@ -0,0 +1,232 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import typing
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from diskcache import Cache
+from pydantic import BaseModel
+
+from ..prompts.models import Message
+from .utils import serialize_response_model_schema
+
+logger = logging.getLogger(__name__)
+
+# Bump when the key derivation or the stored format changes to invalidate existing caches
+CACHE_FORMAT_VERSION = 2
+DEFAULT_CACHE_DIR = './llm_cache'
+DEFAULT_MEMORY_CACHE_ENTRIES = 10_000
+
+
+def request_key(
+    model: str | None,
+    messages: list[Message],
+    response_model: type[BaseModel] | None = None,
+    **params: typing.Any,
+) -> str:
+    """
+    Hash everything that determines an LLM response.
+
+    That is the model that actually serves the call, the request parameters, the messages, the
+    response model and its JSON schema, and CACHE_FORMAT_VERSION.
+    """
+    key_data = {
+        'version': CACHE_FORMAT_VERSION,
+        'model': model,
+        'params': params,
+        'response_model': response_model.__name__ if response_model is not None else None,
+        'schema': serialize_response_model_schema(response_model)
+        if response_model is not None
+        else None,
+        'messages': [m.model_dump() for m in messages],
+    }
+    key_str = json.dumps(key_data, sort_keys=True, default=str)
+    return hashlib.sha256(key_str.encode()).hexdigest()
+
+
+class LLMCacheBackend(ABC):
+    """Storage for serialized LLM responses. Implementations must not block the event loop."""
+
+    @abstractmethod
+    async def get(self, key: str) -> str | None:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: str) -> None:
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        pass
+
+
+class InMemoryLLMCache(LLMCacheBackend):
+    """Process-local LRU cache bounded by entry count and total size, with an optional TTL."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MEMORY_CACHE_ENTRIES,
+        max_bytes: int | None = None,
+        ttl: float | None = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float | None, str]] = OrderedDict()
+        self._bytes = 0
+
+    async def get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        if key in self._entries:
+            self._remove(key)
+
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._entries[key] = (expires_at, value)
+        self._bytes += len(value)
+
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            self._remove(next(iter(self._entries)))
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, key: str):
+        _, value = self._entries.pop(key)
+        self._bytes -= len(value)
+
+
+class DiskLLMCache(LLMCacheBackend):
+    """
+    Persistent cache backed by diskcache, evicting least recently used entries over size_limit.
+
+    diskcache is synchronous, so every operation runs in a worker thread.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_CACHE_DIR,
+        size_limit: int = 2**30,
+        ttl: float | None = None,
+    ):
+        self.ttl = ttl
+        self._cache = Cache(directory, size_limit=size_limit, eviction_policy='least-recently-used')
+
+    async def get(self, key: str) -> str | None:
+        return await asyncio.to_thread(self._cache.get, key)
+
+    async def set(self, key: str, value: str) -> None:
+        await asyncio.to_thread(self._cache.set, key, value, expire=self.ttl)
+
+    async def clear(self) -> None:
+        await asyncio.to_thread(self._cache.clear)
+
+    def close(self):
+        self._cache.close()
+
+
+class LLMCacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'writes': self.writes,
+            'errors': self.errors,
+            'bytes_read': self.bytes_read,
+            'bytes_written': self.bytes_written,
+        }
+
+    def reset(self):
+        self.__init__()
+
+
+class LLMCache:
+    """
+    Response cache used by LLMClient.generate_response.
+
+    Entries are keyed by request_key, scoped to an optional namespace. Responses are stored as
+    JSON, so a cache directory can be shared or replayed without unpickling. Backend failures
+    are logged and counted, and never fail the LLM call.
+    """
+
+    def __init__(self, backend: LLMCacheBackend | None = None, namespace: str = ''):
+        self.backend = backend if backend is not None else DiskLLMCache()
+        self.namespace = namespace
+        self.stats = LLMCacheStats()
+
+    def key(self, request_key: str) -> str:
+        """Scope a request_key to this cache's namespace."""
+        if not self.namespace:
+            return request_key
+        return hashlib.sha256(f'{self.namespace}:{request_key}'.encode()).hexdigest()
+
+    async def get(self, key: str) -> dict[str, typing.Any] | None:
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f'LLM cache read failed: {e}')
+            return None
+
+        if value is None:
+            self.stats.misses += 1
+            return None
+
+        self.stats.hits += 1
+        self.stats.bytes_read += len(value)
+        logger.debug(f'Cache hit for {key}')
+        return json.loads(value)
+
+    async def set(self, key: str, response: dict[str, typing.Any]) -> None:
+        try:
+            value = json.dumps(response, default=str)
+            await self.backend.set(key, value)
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f'LLM cache write failed: {e}')
+            return
+
+        self.stats.writes += 1
+        self.stats.bytes_written += len(value)
@@ -14,23 +14,33 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import hashlib
-import json
+import asyncio
+import copy
 import logging
 import typing
 from abc import ABC, abstractmethod
+from typing import ClassVar
 
 import httpx
-from diskcache import Cache
 from pydantic import BaseModel
 from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
 
 from ..prompts.models import Message
+from ..utils.concurrency import (
+    AdaptiveLimiter,
+    ProviderKind,
+    get_limiter,
+    hedged,
+    is_server_or_retry_error,
+)
+from ..utils.deadline import stop_before_deadline
+from .cache import DEFAULT_CACHE_DIR, DiskLLMCache, LLMCache, request_key
 from .config import DEFAULT_MAX_TOKENS, LLMConfig, ModelSize
 from .errors import RateLimitError
+from .token_usage import TokenUsage
+from .utils import serialize_response_model_schema
 
 DEFAULT_TEMPERATURE = 0
-DEFAULT_CACHE_DIR = './llm_cache'
 
 MULTILINGUAL_EXTRACTION_RESPONSES = (
     '\n\nAny extracted information should be returned in the same language as it was written in.'
@@ -39,17 +49,26 @@ MULTILINGUAL_EXTRACTION_RESPONSES = (
 logger = logging.getLogger(__name__)
 
 
-def is_server_or_retry_error(exception):
-    if isinstance(exception, RateLimitError | json.decoder.JSONDecodeError):
-        return True
+class InflightStats:
+    """Counts LLM requests sent to the provider and identical requests that joined one in flight."""
 
-    return (
-        isinstance(exception, httpx.HTTPStatusError) and 500 <= exception.response.status_code < 600
-    )
+    def __init__(self):
+        self.requests = 0
+        self.coalesced = 0
+
+    def snapshot(self) -> dict[str, int]:
+        return {'requests': self.requests, 'coalesced': self.coalesced}
+
+    def reset(self):
+        self.__init__()
 
 
 class LLMClient(ABC):
-    def __init__(self, config: LLMConfig | None, cache: bool = False):
+    # Whether the JSON schema of the response model is described in the prompt. Clients that
+    # enforce the schema through the provider API (structured outputs, tools) turn this off.
+    SCHEMA_IN_PROMPT: ClassVar[bool] = True
+
+    def __init__(self, config: LLMConfig | None, cache: bool | LLMCache = False):
         if config is None:
             config = LLMConfig()
 
@@ -58,12 +77,26 @@ class LLMClient(ABC):
         self.small_model = config.small_model
         self.temperature = config.temperature
         self.max_tokens = config.max_tokens
-        self.cache_enabled = cache
-        self.cache_dir = None
-
-        # Only create the cache directory if caching is enabled
-        if self.cache_enabled:
-            self.cache_dir = Cache(DEFAULT_CACHE_DIR)
+        self.token_usage = TokenUsage()
+        # Limits concurrent requests of this client; defaults to the process-wide LLM limiter
+        self.limiter: AdaptiveLimiter | None = None
+        # Seconds after which a duplicate of a slow request is sent, the first response winning
+        self.hedge_after: float | None = None
+
+        # Identical concurrent requests share one provider call
+        self.coalesce_requests = True
+        self.inflight_stats = InflightStats()
+        self._inflight: dict[str, asyncio.Task[dict[str, typing.Any]]] = {}
+        # Callers waiting on each shared call
+        self._inflight_waiters: dict[asyncio.Task[dict[str, typing.Any]], int] = {}
+
+        # cache=True keeps the original behaviour of a disk cache in DEFAULT_CACHE_DIR
+        self.cache: LLMCache | None = None
+        if isinstance(cache, LLMCache):
+            self.cache = cache
+        elif cache:
+            self.cache = LLMCache(DiskLLMCache(DEFAULT_CACHE_DIR))
+        self.cache_enabled = self.cache is not None
 
     def _clean_input(self, input: str) -> str:
         """Clean input string of invalid unicode and control characters.
@@ -88,7 +121,7 @@ class LLMClient(ABC):
         return cleaned
 
     @retry(
-        stop=stop_after_attempt(4),
+        stop=stop_after_attempt(4) | stop_before_deadline(),
         wait=wait_random_exponential(multiplier=10, min=5, max=120),
         retry=retry_if_exception(is_server_or_retry_error),
         after=lambda retry_state: logger.warning(
@@ -106,64 +139,165 @@ class LLMClient(ABC):
         model_size: ModelSize = ModelSize.medium,
     ) -> dict[str, typing.Any]:
         try:
-            return await self._generate_response(messages, response_model, max_tokens, model_size)
+            return await self._generate_response_limited(
+                messages, response_model, max_tokens, model_size
+            )
         except (httpx.HTTPStatusError, RateLimitError) as e:
             raise e
 
-    @abstractmethod
-    async def _generate_response(
+    async def _generate_response_limited(
         self,
         messages: list[Message],
         response_model: type[BaseModel] | None = None,
         max_tokens: int = DEFAULT_MAX_TOKENS,
         model_size: ModelSize = ModelSize.medium,
     ) -> dict[str, typing.Any]:
-        pass
+        """
+        Make one provider request within the adaptive concurrency limit of this client and the
+        current deadline, hedged with a duplicate request when hedge_after is set.
+        """
+        limiter = self.limiter if self.limiter is not None else get_limiter(ProviderKind.llm)
 
-    def _get_cache_key(self, messages: list[Message]) -> str:
-        # Create a unique cache key based on the messages and model
-        message_str = json.dumps([m.model_dump() for m in messages], sort_keys=True)
-        key_str = f'{self.model}:{message_str}'
-        return hashlib.md5(key_str.encode()).hexdigest()
+        async def attempt() -> dict[str, typing.Any]:
+            async with limiter.slot():
+                return await self._generate_response(
+                    messages, response_model, max_tokens, model_size
+                )
 
-    async def generate_response(
+        return await hedged(attempt, self.hedge_after)
+
+    @abstractmethod
+    async def _generate_response(
         self,
         messages: list[Message],
         response_model: type[BaseModel] | None = None,
-        max_tokens: int | None = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
         model_size: ModelSize = ModelSize.medium,
     ) -> dict[str, typing.Any]:
-        if max_tokens is None:
-            max_tokens = self.max_tokens
+        pass
+
+    def _add_output_instructions(
+        self, messages: list[Message], response_model: type[BaseModel] | None = None
+    ) -> None:
+        """
+        Append the response format and language instructions to the first (system) message.
 
-        if response_model is not None:
-            serialized_model = json.dumps(response_model.model_json_schema())
-            messages[
-                -1
-            ].content += (
+        Both depend only on the prompt and response model, never on the episode being processed,
+        so keeping them in the system message makes the start of every request identical across
+        calls of the same prompt, which is what provider-side prompt caching matches on.
+        """
+        instructions = ''
+        if response_model is not None and self.SCHEMA_IN_PROMPT:
+            serialized_model = serialize_response_model_schema(response_model)
+            instructions += (
                 f'\n\nRespond with a JSON object in the following format:\n\n{serialized_model}'
             )
+        instructions += MULTILINGUAL_EXTRACTION_RESPONSES
 
-        # Add multilingual extraction instructions
-        messages[0].content += MULTILINGUAL_EXTRACTION_RESPONSES
+        messages[0].content += instructions
 
-        if self.cache_enabled and self.cache_dir is not None:
-            cache_key = self._get_cache_key(messages)
+    def _get_model_for_size(self, model_size: ModelSize) -> str | None:
+        """Get the model that serves a request of the given size."""
+        if model_size == ModelSize.small and self.small_model:
+            return self.small_model
+        return self.model
 
-            cached_response = self.cache_dir.get(cache_key)
+    def _get_request_key(
+        self,
+        messages: list[Message],
+        response_model: type[BaseModel] | None = None,
+        max_tokens: int | None = None,
+        model_size: ModelSize = ModelSize.medium,
+    ) -> str:
+        return request_key(
+            self._get_model_for_size(model_size),
+            messages,
+            response_model,
+            max_tokens=max_tokens,
+            temperature=self.temperature,
+        )
+
+    async def _generate_response_cached(
+        self,
+        key: str,
+        messages: list[Message],
+        response_model: type[BaseModel] | None,
+        max_tokens: int,
+        model_size: ModelSize,
+    ) -> dict[str, typing.Any]:
+        if self.cache is not None:
+            cached_response = await self.cache.get(self.cache.key(key))
             if cached_response is not None:
-                logger.debug(f'Cache hit for {cache_key}')
                 return cached_response
 
-        for message in messages:
-            message.content = self._clean_input(message.content)
-
+        self.inflight_stats.requests += 1
         response = await self._generate_response_with_retry(
             messages, response_model, max_tokens, model_size
         )
 
-        if self.cache_enabled and self.cache_dir is not None:
-            cache_key = self._get_cache_key(messages)
-            self.cache_dir.set(cache_key, response)
+        if self.cache is not None:
+            await self.cache.set(self.cache.key(key), response)
 
         return response
+
+    def _inflight_done(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved in case every waiting caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def generate_response(
+        self,
+        messages: list[Message],
+        response_model: type[BaseModel] | None = None,
+        max_tokens: int | None = None,
+        model_size: ModelSize = ModelSize.medium,
+    ) -> dict[str, typing.Any]:
+        if max_tokens is None:
+            max_tokens = self.max_tokens
+
+        self._add_output_instructions(messages, response_model)
+
+        for message in messages:
+            message.content = self._clean_input(message.content)
+
+        # The key is computed before the retry loop, which may append correction messages
+        key = self._get_request_key(messages, response_model, max_tokens, model_size)
+        if not self.coalesce_requests:
+            return await self._generate_response_cached(
+                key, messages, response_model, max_tokens, model_size
+            )
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self._generate_response_cached(
+                    key, messages, response_model, max_tokens, model_size
+                )
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._inflight_done(key, done))
+        else:
+            self.inflight_stats.coalesced += 1
+            logger.debug(f'Joining in-flight LLM request {key}')
+
+        # Shielded so that a cancelled caller doesn't cancel the call for the others. The last
+        # caller to be cancelled cancels the call, so no provider call runs for nobody. Every
+        # caller gets its own copy of the response, as callers may modify it.
+        waiters = self._inflight_waiters
+        waiters[task] = waiters.get(task, 0) + 1
+        try:
+            response = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if waiters[task] == 1 and not task.done():
+                task.cancel()
+                # New callers start a fresh call instead of joining the cancelled one
+                if self._inflight.get(key) is task:
+                    del self._inflight[key]
+            raise
+        finally:
+            waiters[task] -= 1
+            if waiters[task] == 0:
+                del waiters[task]
+        return copy.deepcopy(response)
@@ -23,10 +23,13 @@ from google import genai  # type: ignore
 from google.genai import types  # type: ignore
 from pydantic import BaseModel
 
+from ..errors import DeadlineExceededError
 from ..prompts.models import Message
-from .client import MULTILINGUAL_EXTRACTION_RESPONSES, LLMClient
+from .cache import LLMCache
+from .client import LLMClient
 from .config import DEFAULT_MAX_TOKENS, LLMConfig, ModelSize
 from .errors import RateLimitError
+from .utils import serialize_response_model_schema
 
 logger = logging.getLogger(__name__)
 
@@ -56,11 +59,13 @@ class GeminiClient(LLMClient):
 
     # Class-level constants
     MAX_RETRIES: ClassVar[int] = 2
+    # The schema is passed as response_schema and described in the system instruction below
+    SCHEMA_IN_PROMPT: ClassVar[bool] = False
 
     def __init__(
         self,
         config: LLMConfig | None = None,
-        cache: bool = False,
+        cache: bool | LLMCache = False,
         max_tokens: int = DEFAULT_MAX_TOKENS,
         thinking_config: types.ThinkingConfig | None = None,
     ):
@@ -69,7 +74,7 @@ class GeminiClient(LLMClient):
 
         Args:
             config (LLMConfig | None): The configuration for the LLM client, including API key, model, temperature, and max tokens.
-            cache (bool): Whether to use caching for responses. Defaults to False.
+            cache (bool | LLMCache): Whether to use caching for responses, or the cache to use. Defaults to False.
             thinking_config (types.ThinkingConfig | None): Optional thinking configuration for models that support it.
                 Only use with models that support thinking (gemini-2.5+). Defaults to None.
 
@@ -159,11 +164,11 @@ class GeminiClient(LLMClient):
             system_prompt = ''
             if response_model is not None:
                 # Get the schema from the Pydantic model
-                pydantic_schema = response_model.model_json_schema()
+                pydantic_schema = serialize_response_model_schema(response_model)
 
                 # Create instruction to output in the desired JSON format
                 system_prompt += (
-                    f'Output ONLY valid JSON matching this schema: {json.dumps(pydantic_schema)}.\n'
+                    f'Output ONLY valid JSON matching this schema: {pydantic_schema}.\n'
                     'Do not include any explanatory text before or after the JSON.\n\n'
                 )
 
@@ -200,6 +205,14 @@ class GeminiClient(LLMClient):
                 config=generation_config,
             )
 
+            usage_metadata = getattr(response, 'usage_metadata', None)
+            if usage_metadata is not None:
+                self.token_usage.record(
+                    prompt_tokens=getattr(usage_metadata, 'prompt_token_count', 0),
+                    completion_tokens=getattr(usage_metadata, 'candidates_token_count', 0),
+                    cached_prompt_tokens=getattr(usage_metadata, 'cached_content_token_count', 0),
+                )
+
             # Check for safety and prompt blocks
             self._check_safety_blocks(response)
             self._check_prompt_blocks(response)
@@ -234,11 +247,11 @@ class GeminiClient(LLMClient):
             logger.error(f'Error in generating LLM response: {e}')
             raise
 
-    async def generate_response(
+    async def _generate_response_with_retry(
         self,
         messages: list[Message],
         response_model: type[BaseModel] | None = None,
-        max_tokens: int | None = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
         model_size: ModelSize = ModelSize.medium,
     ) -> dict[str, typing.Any]:
         """
@@ -248,32 +261,26 @@ class GeminiClient(LLMClient):
         Args:
             messages (list[Message]): A list of messages to send to the language model.
             response_model (type[BaseModel] | None): An optional Pydantic model to parse the response into.
-            max_tokens (int | None): The maximum number of tokens to generate in the response.
+            max_tokens (int): The maximum number of tokens to generate in the response.
             model_size (ModelSize): The size of the model to use (small or medium).
 
         Returns:
             dict[str, typing.Any]: The response from the language model.
         """
-        if max_tokens is None:
-            max_tokens = self.max_tokens
-
         retry_count = 0
         last_error = None
 
-        # Add multilingual extraction instructions
-        messages[0].content += MULTILINGUAL_EXTRACTION_RESPONSES
-
         while retry_count <= self.MAX_RETRIES:
             try:
-                response = await self._generate_response(
+                response = await self._generate_response_limited(
                     messages=messages,
                     response_model=response_model,
                     max_tokens=max_tokens,
                     model_size=model_size,
                 )
                 return response
-            except RateLimitError:
-                # Rate limit errors should not trigger retries (fail fast)
+            except (RateLimitError, DeadlineExceededError):
+                # Rate limit and deadline errors should not trigger retries (fail fast)
                 raise
             except Exception as e:
                 last_error = e
@@ -24,6 +24,7 @@ from groq.types.chat import ChatCompletionMessageParam
 from pydantic import BaseModel
 
 from ..prompts.models import Message
+from .cache import LLMCache
 from .client import LLMClient
 from .config import LLMConfig, ModelSize
 from .errors import RateLimitError
@@ -35,7 +36,7 @@ DEFAULT_MAX_TOKENS = 2048
 
 
 class GroqClient(LLMClient):
-    def __init__(self, config: LLMConfig | None = None, cache: bool = False):
+    def __init__(self, config: LLMConfig | None = None, cache: bool | LLMCache = False):
         if config is None:
             config = LLMConfig(max_tokens=DEFAULT_MAX_TOKENS)
         elif config.max_tokens is None:
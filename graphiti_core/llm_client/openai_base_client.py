@@ -24,8 +24,10 @@ import openai
 from openai.types.chat import ChatCompletionMessageParam
 from pydantic import BaseModel
 
+from ..errors import DeadlineExceededError
 from ..prompts.models import Message
-from .client import MULTILINGUAL_EXTRACTION_RESPONSES, LLMClient
+from .cache import LLMCache
+from .client import LLMClient
 from .config import DEFAULT_MAX_TOKENS, LLMConfig, ModelSize
 from .errors import RateLimitError, RefusalError
 
@@ -45,16 +47,15 @@ class BaseOpenAIClient(LLMClient):
 
     # Class-level constants
     MAX_RETRIES: ClassVar[int] = 2
+    # Structured outputs enforce the response model, so the schema is not repeated in the prompt
+    SCHEMA_IN_PROMPT: ClassVar[bool] = False
 
     def __init__(
         self,
         config: LLMConfig | None = None,
-        cache: bool = False,
+        cache: bool | LLMCache = False,
         max_tokens: int = DEFAULT_MAX_TOKENS,
     ):
-        if cache:
-            raise NotImplementedError('Caching is not implemented for OpenAI-based clients')
-
         if config is None:
             config = LLMConfig()
 
@@ -116,6 +117,18 @@ class BaseOpenAIClient(LLMClient):
         else:
             raise Exception(f'Invalid response from LLM: {response_object.model_dump()}')
 
+    def _record_usage(self, response: Any) -> None:
+        """Record token usage, including prompt tokens served from OpenAI's prompt cache."""
+        usage = getattr(response, 'usage', None)
+        if usage is None:
+            return
+        details = getattr(usage, 'prompt_tokens_details', None)
+        self.token_usage.record(
+            prompt_tokens=usage.prompt_tokens,
+            completion_tokens=usage.completion_tokens,
+            cached_prompt_tokens=getattr(details, 'cached_tokens', 0),
+        )
+
     def _handle_json_response(self, response: Any) -> dict[str, Any]:
         """Handle JSON response parsing."""
         result = response.choices[0].message.content or '{}'
@@ -141,6 +154,7 @@ class BaseOpenAIClient(LLMClient):
                     max_tokens=max_tokens or self.max_tokens,
                     response_model=response_model,
                 )
+                self._record_usage(response)
                 return self._handle_structured_response(response)
             else:
                 response = await self._create_completion(
@@ -149,6 +163,7 @@ class BaseOpenAIClient(LLMClient):
                     temperature=self.temperature,
                     max_tokens=max_tokens or self.max_tokens,
                 )
+                self._record_usage(response)
                 return self._handle_json_response(response)
 
         except openai.LengthFinishReasonError as e:
@@ -159,30 +174,24 @@ class BaseOpenAIClient(LLMClient):
             logger.error(f'Error in generating LLM response: {e}')
             raise
 
-    async def generate_response(
+    async def _generate_response_with_retry(
         self,
         messages: list[Message],
         response_model: type[BaseModel] | None = None,
-        max_tokens: int | None = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
         model_size: ModelSize = ModelSize.medium,
     ) -> dict[str, typing.Any]:
         """Generate a response with retry logic and error handling."""
-        if max_tokens is None:
-            max_tokens = self.max_tokens
-
         retry_count = 0
         last_error = None
 
-        # Add multilingual extraction instructions
-        messages[0].content += MULTILINGUAL_EXTRACTION_RESPONSES
-
         while retry_count <= self.MAX_RETRIES:
             try:
-                response = await self._generate_response(
+                response = await self._generate_response_limited(
                     messages, response_model, max_tokens, model_size
                 )
                 return response
-            except (RateLimitError, RefusalError):
+            except (RateLimitError, RefusalError, DeadlineExceededError):
                 # These errors should not trigger retries
                 raise
             except (openai.APITimeoutError, openai.APIConnectionError, openai.InternalServerError):
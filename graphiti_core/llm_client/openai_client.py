@@ -20,6 +20,7 @@ from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletionMessageParam
 from pydantic import BaseModel
 
+from .cache import LLMCache
 from .config import DEFAULT_MAX_TOKENS, LLMConfig
 from .openai_base_client import BaseOpenAIClient
 
@@ -38,7 +39,7 @@ class OpenAIClient(BaseOpenAIClient):
     def __init__(
         self,
         config: LLMConfig | None = None,
-        cache: bool = False,
+        cache: bool | LLMCache = False,
         client: typing.Any = None,
         max_tokens: int = DEFAULT_MAX_TOKENS,
     ):
@@ -47,7 +48,7 @@ class OpenAIClient(BaseOpenAIClient):
 
         Args:
             config (LLMConfig | None): The configuration for the LLM client, including API key, model, base URL, temperature, and max tokens.
-            cache (bool): Whether to use caching for responses. Defaults to False.
+            cache (bool | LLMCache): Whether to use caching for responses, or the cache to use. Defaults to False.
             client (Any | None): An optional async client instance to use. If not provided, a new AsyncOpenAI client is created.
         """
         super().__init__(config, cache, max_tokens)
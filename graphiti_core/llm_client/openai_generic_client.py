@@ -24,8 +24,10 @@ from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletionMessageParam
 from pydantic import BaseModel
 
+from ..errors import DeadlineExceededError
 from ..prompts.models import Message
-from .client import MULTILINGUAL_EXTRACTION_RESPONSES, LLMClient
+from .cache import LLMCache
+from .client import LLMClient
 from .config import DEFAULT_MAX_TOKENS, LLMConfig, ModelSize
 from .errors import RateLimitError, RefusalError
 
@@ -48,7 +50,7 @@ class OpenAIGenericClient(LLMClient):
         max_tokens (int): The maximum number of tokens to generate in a response.
 
     Methods:
-        __init__(config: LLMConfig | None = None, cache: bool = False, client: typing.Any = None):
+        __init__(config: LLMConfig | None = None, cache: bool | LLMCache = False, client: typing.Any = None):
             Initializes the OpenAIClient with the provided configuration, cache setting, and client.
 
         _generate_response(messages: list[Message]) -> dict[str, typing.Any]:
@@ -59,21 +61,20 @@ class OpenAIGenericClient(LLMClient):
     MAX_RETRIES: ClassVar[int] = 2
 
     def __init__(
-        self, config: LLMConfig | None = None, cache: bool = False, client: typing.Any = None
+        self,
+        config: LLMConfig | None = None,
+        cache: bool | LLMCache = False,
+        client: typing.Any = None,
     ):
         """
         Initialize the OpenAIClient with the provided configuration, cache setting, and client.
 
         Args:
             config (LLMConfig | None): The configuration for the LLM client, including API key, model, base URL, temperature, and max tokens.
-            cache (bool): Whether to use caching for responses. Defaults to False.
+            cache (bool | LLMCache): Whether to use caching for responses, or the cache to use. Defaults to False.
             client (Any | None): An optional async client instance to use. If not provided, a new AsyncOpenAI client is created.
 
         """
-        # removed caching to simplify the `generate_response` override
-        if cache:
-            raise NotImplementedError('Caching is not implemented for OpenAI')
-
         if config is None:
             config = LLMConfig()
 
@@ -84,6 +85,18 @@ class OpenAIGenericClient(LLMClient):
         else:
             self.client = client
 
+    def _record_usage(self, response: typing.Any) -> None:
+        # OpenAI-compatible servers that cache prompt prefixes report hits in prompt_tokens_details
+        usage = getattr(response, 'usage', None)
+        if usage is None:
+            return
+        details = getattr(usage, 'prompt_tokens_details', None)
+        self.token_usage.record(
+            prompt_tokens=usage.prompt_tokens,
+            completion_tokens=usage.completion_tokens,
+            cached_prompt_tokens=getattr(details, 'cached_tokens', 0),
+        )
+
     async def _generate_response(
         self,
         messages: list[Message],
@@ -106,6 +119,7 @@ class OpenAIGenericClient(LLMClient):
                 max_tokens=self.max_tokens,
                 response_format={'type': 'json_object'},
             )
+            self._record_usage(response)
             result = response.choices[0].message.content or ''
             return json.loads(result)
         except openai.RateLimitError as e:
@@ -114,37 +128,23 @@ class OpenAIGenericClient(LLMClient):
             logger.error(f'Error in generating LLM response: {e}')
             raise
 
-    async def generate_response(
+    async def _generate_response_with_retry(
         self,
         messages: list[Message],
         response_model: type[BaseModel] | None = None,
-        max_tokens: int | None = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
         model_size: ModelSize = ModelSize.medium,
     ) -> dict[str, typing.Any]:
-        if max_tokens is None:
-            max_tokens = self.max_tokens
-
         retry_count = 0
         last_error = None
 
-        if response_model is not None:
-            serialized_model = json.dumps(response_model.model_json_schema())
-            messages[
-                -1
-            ].content += (
-                f'\n\nRespond with a JSON object in the following format:\n\n{serialized_model}'
-            )
-
-        # Add multilingual extraction instructions
-        messages[0].content += MULTILINGUAL_EXTRACTION_RESPONSES
-
         while retry_count <= self.MAX_RETRIES:
             try:
-                response = await self._generate_response(
+                response = await self._generate_response_limited(
                     messages, response_model, max_tokens=max_tokens, model_size=model_size
                 )
                 return response
-            except (RateLimitError, RefusalError):
+            except (RateLimitError, RefusalError, DeadlineExceededError):
                 # These errors should not trigger retries
                 raise
             except (openai.APITimeoutError, openai.APIConnectionError, openai.InternalServerError):
@@ -0,0 +1,376 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import logging
+import typing
+from collections import Counter, deque
+from collections.abc import Iterable
+from enum import Enum
+from time import monotonic
+
+from pydantic import BaseModel, Field
+
+from ..errors import DeadlineExceededError
+from ..prompts.models import Message
+from ..utils.concurrency import AdaptiveLimiter
+from .client import LLMClient
+from .config import DEFAULT_MAX_TOKENS, ModelSize
+from .errors import RefusalError
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest sample in the latency and error rate moving averages
+EWMA_ALPHA = 0.2
+# Number of recent latencies kept per endpoint for percentiles
+LATENCY_WINDOW = 200
+# How much a fully failing endpoint's expected latency is inflated when ranking endpoints
+ERROR_PENALTY = 4.0
+
+
+class CircuitState(Enum):
+    closed = 'closed'
+    open = 'open'
+    half_open = 'half_open'
+
+
+class RouterConfig(BaseModel):
+    failure_threshold: int = Field(
+        default=5, description='Consecutive failures that open the circuit of an endpoint'
+    )
+    error_rate_threshold: float = Field(
+        default=0.5, description='Moving error rate that opens the circuit of an endpoint'
+    )
+    min_requests: int = Field(
+        default=20, description='Requests an endpoint must have served before its error rate counts'
+    )
+    open_seconds: float = Field(
+        default=30.0, description='Time an open circuit rejects calls before a trial call'
+    )
+    max_failovers: int = Field(
+        default=1, description='Other endpoints tried after a failed call, before raising'
+    )
+    hedge_percentile: float | None = Field(
+        default=None,
+        description='Start a second request on another endpoint when a call runs longer than this '
+        'latency percentile (e.g. 0.95) of its endpoint. Disabled by default',
+    )
+    hedge_min_samples: int = Field(
+        default=20, description='Latency samples an endpoint needs before its calls are hedged'
+    )
+
+
+class RouterEndpoint:
+    """
+    One LLM client behind a RouterLLMClient, with the health the router observed for it.
+
+    Every endpoint gets its own adaptive concurrency limiter, so rate limits of one endpoint only
+    slow down that endpoint. The free capacity of the limiter is the endpoint's rate-limit
+    headroom when calls are routed.
+    """
+
+    def __init__(
+        self,
+        client: LLMClient,
+        name: str | None = None,
+        model_sizes: Iterable[ModelSize] | None = None,
+        limiter: AdaptiveLimiter | None = None,
+    ):
+        self.client = client
+        self.name = name or f'{type(client).__name__}:{client.model}'
+        self.model_sizes = frozenset(model_sizes if model_sizes is not None else ModelSize)
+        self.limiter = limiter if limiter is not None else AdaptiveLimiter(name=self.name)
+        client.limiter = self.limiter
+
+        self.latency: float | None = None
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.state = CircuitState.closed
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+
+        self.requests = 0
+        self.failures = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def latency_percentile(self, percentile: float) -> float | None:
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        return latencies[min(int(percentile * len(latencies)), len(latencies) - 1)]
+
+    def expected_latency(self) -> float:
+        """Estimated time for a new call: observed latency, queueing behind the limit and errors."""
+        # Endpoints without observations rank first, so each one is tried, unless they only failed
+        if self.latency is None:
+            return 0.0 if self.failures == 0 else float('inf')
+        limiter = self.limiter
+        queued = max(limiter.in_flight + limiter.waiting - limiter.limit + 1, 0)
+        return self.latency * (1 + queued / limiter.limit) * (1 + ERROR_PENALTY * self.error_rate)
+
+    def snapshot(self) -> dict[str, typing.Any]:
+        return {
+            'state': self.state.value,
+            'requests': self.requests,
+            'failures': self.failures,
+            'error_rate': self.error_rate,
+            'latency_ms': self.latency * 1000 if self.latency is not None else None,
+            'hedges': self.hedges,
+            'hedge_wins': self.hedge_wins,
+            'limit': self.limiter.limit,
+            'in_flight': self.limiter.in_flight,
+        }
+
+
+class RouterLLMClient(LLMClient):
+    """
+    Routes each LLM call to one of several endpoints serving its model size.
+
+    Calls go to the endpoint with the lowest expected latency, from its observed latency, its
+    queue behind its concurrency limit and its recent error rate. An endpoint whose calls keep
+    failing has its circuit opened and receives no calls for open_seconds, after which a single
+    trial call decides whether it is closed again. A failed call is retried on the next best
+    endpoint, and calls that run past a latency percentile of their endpoint can be hedged with a
+    second request to another endpoint, the first successful response winning.
+
+    Each endpoint client keeps its own response cache, request coalescing and token usage.
+    """
+
+    def __init__(
+        self,
+        endpoints: list[RouterEndpoint | LLMClient],
+        config: RouterConfig | None = None,
+    ):
+        if not endpoints:
+            raise ValueError('RouterLLMClient needs at least one endpoint')
+
+        self.endpoints = [
+            endpoint if isinstance(endpoint, RouterEndpoint) else RouterEndpoint(endpoint)
+            for endpoint in endpoints
+        ]
+        # Endpoints sharing a name, such as two clients for the same model, get their position added
+        name_counts = Counter(endpoint.name for endpoint in self.endpoints)
+        for position, endpoint in enumerate(self.endpoints):
+            if name_counts[endpoint.name] > 1:
+                name = f'{endpoint.name}#{position}'
+                if endpoint.limiter.name == endpoint.name:
+                    endpoint.limiter.name = name
+                endpoint.name = name
+        first_client = self.endpoints[0].client
+        super().__init__(first_client.config)
+        self.router_config = config if config is not None else RouterConfig()
+        self.failovers = 0
+
+    async def generate_response(
+        self,
+        messages: list[Message],
+        response_model: type[BaseModel] | None = None,
+        max_tokens: int | None = None,
+        model_size: ModelSize = ModelSize.medium,
+    ) -> dict[str, typing.Any]:
+        tried: set[RouterEndpoint] = set()
+        last_error: Exception | None = None
+        for attempt in range(self.router_config.max_failovers + 1):
+            endpoint = self._choose(model_size, tried)
+            if endpoint is None:
+                break
+            if attempt > 0:
+                self.failovers += 1
+                logger.warning(f'Retrying LLM request on endpoint {endpoint.name}: {last_error}')
+
+            try:
+                return await self._call_hedged(
+                    endpoint, tried, messages, response_model, max_tokens, model_size
+                )
+            except (RefusalError, DeadlineExceededError):
+                raise
+            except Exception as e:
+                last_error = e
+
+        if last_error is not None:
+            raise last_error
+        raise ValueError(f'No LLM endpoint serves {model_size.value} requests')
+
+    async def _generate_response(
+        self,
+        messages: list[Message],
+        response_model: type[BaseModel] | None = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        model_size: ModelSize = ModelSize.medium,
+    ) -> dict[str, typing.Any]:
+        # Requests are forwarded whole to the endpoint clients by generate_response
+        raise NotImplementedError('RouterLLMClient forwards requests to its endpoints')
+
+    def snapshot(self) -> dict[str, typing.Any]:
+        return {
+            'failovers': self.failovers,
+            'endpoints': {endpoint.name: endpoint.snapshot() for endpoint in self.endpoints},
+        }
+
+    def _choose(self, model_size: ModelSize, tried: set[RouterEndpoint]) -> RouterEndpoint | None:
+        eligible = [
+            endpoint
+            for endpoint in self.endpoints
+            if model_size in endpoint.model_sizes and endpoint not in tried
+        ]
+        if not eligible:
+            return None
+
+        available = [endpoint for endpoint in eligible if self._allows(endpoint)]
+        if not available:
+            # Every circuit is open: use the endpoint that has been open the longest
+            endpoint = min(eligible, key=lambda e: e.opened_at)
+            tried.add(endpoint)
+            return endpoint
+
+        endpoint = min(available, key=lambda e: (e.expected_latency(), e.limiter.in_flight))
+        if endpoint.state == CircuitState.half_open:
+            endpoint.trial_in_flight = True
+        tried.add(endpoint)
+        return endpoint
+
+    def _allows(self, endpoint: RouterEndpoint) -> bool:
+        if endpoint.state == CircuitState.closed:
+            return True
+        if endpoint.state == CircuitState.open:
+            if monotonic() - endpoint.opened_at < self.router_config.open_seconds:
+                return False
+            endpoint.state = CircuitState.half_open
+        return not endpoint.trial_in_flight
+
+    async def _call_hedged(
+        self,
+        endpoint: RouterEndpoint,
+        tried: set[RouterEndpoint],
+        messages: list[Message],
+        response_model: type[BaseModel] | None,
+        max_tokens: int | None,
+        model_size: ModelSize,
+    ) -> dict[str, typing.Any]:
+        hedge_after = self._hedge_delay(endpoint)
+        if hedge_after is None:
+            return await self._call(endpoint, messages, response_model, max_tokens, model_size)
+
+        primary = asyncio.create_task(
+            self._call(endpoint, messages, response_model, max_tokens, model_size)
+        )
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=hedge_after)
+            if done:
+                return primary.result()
+
+            backup_endpoint = self._choose(model_size, tried)
+            if backup_endpoint is None:
+                return await primary
+
+            backup_endpoint.hedges += 1
+            logger.debug(
+                f'Hedging LLM request on {endpoint.name} after {hedge_after * 1000:.0f} ms '
+                f'with {backup_endpoint.name}'
+            )
+            backup = asyncio.create_task(
+                self._call(backup_endpoint, messages, response_model, max_tokens, model_size)
+            )
+
+            pending = {primary, backup}
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task_error = task.exception()
+                    if task_error is None:
+                        if task is backup:
+                            backup_endpoint.hedge_wins += 1
+                        return task.result()
+                    error = task_error
+        finally:
+            # Also reached when the caller is cancelled while a call is still running
+            for task in pending:
+                task.cancel()
+
+        assert error is not None
+        raise error
+
+    def _hedge_delay(self, endpoint: RouterEndpoint) -> float | None:
+        percentile = self.router_config.hedge_percentile
+        if percentile is None or len(endpoint.latencies) < self.router_config.hedge_min_samples:
+            return None
+        return endpoint.latency_percentile(percentile)
+
+    async def _call(
+        self,
+        endpoint: RouterEndpoint,
+        messages: list[Message],
+        response_model: type[BaseModel] | None,
+        max_tokens: int | None,
+        model_size: ModelSize,
+    ) -> dict[str, typing.Any]:
+        endpoint.requests += 1
+        start = monotonic()
+        try:
+            # Clients add their own instructions to the messages, so each call gets a copy
+            response = await endpoint.client.generate_response(
+                [message.model_copy() for message in messages],
+                response_model=response_model,
+                max_tokens=max_tokens,
+                model_size=model_size,
+            )
+        except (asyncio.CancelledError, RefusalError, DeadlineExceededError):
+            endpoint.trial_in_flight = False
+            raise
+        except Exception:
+            self._record_failure(endpoint)
+            raise
+
+        self._record_success(endpoint, monotonic() - start)
+        return response
+
+    def _record_success(self, endpoint: RouterEndpoint, latency: float):
+        endpoint.latency = (
+            latency
+            if endpoint.latency is None
+            else EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * endpoint.latency
+        )
+        endpoint.latencies.append(latency)
+        endpoint.error_rate *= 1 - EWMA_ALPHA
+        endpoint.consecutive_failures = 0
+        endpoint.trial_in_flight = False
+        if endpoint.state != CircuitState.closed:
+            logger.info(f'Closing circuit of LLM endpoint {endpoint.name}')
+            endpoint.state = CircuitState.closed
+
+    def _record_failure(self, endpoint: RouterEndpoint):
+        config = self.router_config
+        endpoint.failures += 1
+        endpoint.error_rate = EWMA_ALPHA + (1 - EWMA_ALPHA) * endpoint.error_rate
+        endpoint.consecutive_failures += 1
+        endpoint.trial_in_flight = False
+
+        if (
+            endpoint.state == CircuitState.half_open
+            or endpoint.consecutive_failures >= config.failure_threshold
+            or (
+                endpoint.requests >= config.min_requests
+                and endpoint.error_rate >= config.error_rate_threshold
+            )
+        ):
+            if endpoint.state != CircuitState.open:
+                logger.warning(f'Opening circuit of LLM endpoint {endpoint.name}')
+            endpoint.state = CircuitState.open
+            endpoint.opened_at = monotonic()
@@ -0,0 +1,79 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import typing
+
+
+def _as_int(value: typing.Any) -> int:
+    # Providers omit usage fields they don't support, or report them as None
+    return value if isinstance(value, int) else 0
+
+
+class TokenUsage:
+    """Running totals of the token counts reported by an LLM provider, including cache hits."""
+
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_prompt_tokens = 0
+        self.cache_creation_tokens = 0
+
+    def record(
+        self,
+        prompt_tokens: typing.Any = 0,
+        completion_tokens: typing.Any = 0,
+        cached_prompt_tokens: typing.Any = 0,
+        cache_creation_tokens: typing.Any = 0,
+        cache_tokens_in_prompt: bool = True,
+    ):
+        """
+        Record the usage of one call.
+
+        cached_prompt_tokens were read from the provider's prompt cache and cache_creation_tokens
+        were written to it. Set cache_tokens_in_prompt to False for providers whose prompt_tokens
+        only count the uncached part of the prompt.
+        """
+        cached_prompt_tokens = _as_int(cached_prompt_tokens)
+        cache_creation_tokens = _as_int(cache_creation_tokens)
+        prompt_tokens = _as_int(prompt_tokens)
+        if not cache_tokens_in_prompt:
+            prompt_tokens += cached_prompt_tokens + cache_creation_tokens
+
+        self.calls += 1
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += _as_int(completion_tokens)
+        self.cached_prompt_tokens += cached_prompt_tokens
+        self.cache_creation_tokens += cache_creation_tokens
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        if self.prompt_tokens == 0:
+            return 0.0
+        return self.cached_prompt_tokens / self.prompt_tokens
+
+    def snapshot(self) -> dict[str, int | float]:
+        return {
+            'calls': self.calls,
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'cached_prompt_tokens': self.cached_prompt_tokens,
+            'cache_creation_tokens': self.cache_creation_tokens,
+            'cache_hit_ratio': self.cache_hit_ratio,
+        }
+
+    def reset(self):
+        self.__init__()
@@ -14,13 +14,20 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import json
 import logging
+from functools import lru_cache
 from time import time
+from typing import Any
+
+from pydantic import BaseModel
 
 from graphiti_core.embedder.client import EmbedderClient
 
 logger = logging.getLogger(__name__)
 
+RESPONSE_SCHEMA_CACHE_SIZE = 512
+
 
 async def generate_embedding(embedder: EmbedderClient, text: str):
     start = time()
@@ -32,3 +39,18 @@ async def generate_embedding(embedder: EmbedderClient, text: str):
     logger.debug(f'embedded text of length {len(text)} in {end - start} ms')
 
     return embedding
+
+
+@lru_cache(maxsize=RESPONSE_SCHEMA_CACHE_SIZE)
+def get_response_model_schema(response_model: type[BaseModel]) -> dict[str, Any]:
+    """Return the JSON schema of a response model, computed once per model class.
+
+    The returned dict is shared between callers and must not be mutated.
+    """
+    return response_model.model_json_schema()
+
+
+@lru_cache(maxsize=RESPONSE_SCHEMA_CACHE_SIZE)
+def serialize_response_model_schema(response_model: type[BaseModel]) -> str:
+    """Return the JSON schema of a response model serialized to a string, computed once per model class."""
+    return json.dumps(get_response_model_schema(response_model))
@@ -33,7 +33,9 @@ from graphiti_core.models.nodes.node_db_queries import (
     COMMUNITY_NODE_SAVE,
     ENTITY_NODE_SAVE,
     EPISODIC_NODE_SAVE,
+    NODE_DELETE,
 )
+from graphiti_core.query_registry import registered_query
 from graphiti_core.utils.datetime_utils import utc_now
 
 logger = logging.getLogger(__name__)
@@ -98,10 +100,7 @@ class Node(BaseModel, ABC):
 
     async def delete(self, driver: GraphDriver):
         result = await driver.execute_query(
-            """
-        MATCH (n:Entity|Episodic|Community {uuid: $uuid})
-        DETACH DELETE n
-        """,
+            NODE_DELETE,
             uuid=self.uuid,
             database_=DEFAULT_DATABASE,
         )
@@ -229,28 +228,8 @@ class EpisodicNode(Node):
         limit: int | None = None,
         uuid_cursor: str | None = None,
     ):
-        cursor_query: LiteralString = 'AND e.uuid < $uuid' if uuid_cursor else ''
-        limit_query: LiteralString = 'LIMIT $limit' if limit is not None else ''
-
         records, _, _ = await driver.execute_query(
-            """
-        MATCH (e:Episodic) WHERE e.group_id IN $group_ids
-        """
-            + cursor_query
-            + """
-            RETURN DISTINCT
-            e.content AS content,
-            e.created_at AS created_at,
-            e.valid_at AS valid_at,
-            e.uuid AS uuid,
-            e.name AS name,
-            e.group_id AS group_id,
-            e.source_description AS source_description,
-            e.source AS source,
-            e.entity_edges AS entity_edges
-        ORDER BY e.uuid DESC
-        """
-            + limit_query,
+            episodic_nodes_by_group_ids_query(bool(uuid_cursor), limit is not None),
             group_ids=group_ids,
             uuid=uuid_cursor,
             limit=limit,
@@ -387,19 +366,8 @@ class EntityNode(Node):
         limit: int | None = None,
         uuid_cursor: str | None = None,
     ):
-        cursor_query: LiteralString = 'AND n.uuid < $uuid' if uuid_cursor else ''
-        limit_query: LiteralString = 'LIMIT $limit' if limit is not None else ''
-
         records, _, _ = await driver.execute_query(
-            """
-        MATCH (n:Entity) WHERE n.group_id IN $group_ids
-        """
-            + cursor_query
-            + ENTITY_NODE_RETURN
-            + """
-        ORDER BY n.uuid DESC
-        """
-            + limit_query,
+            entity_nodes_by_group_ids_query(bool(uuid_cursor), limit is not None),
             group_ids=group_ids,
             uuid=uuid_cursor,
             limit=limit,
@@ -508,24 +476,8 @@ class CommunityNode(Node):
         limit: int | None = None,
         uuid_cursor: str | None = None,
     ):
-        cursor_query: LiteralString = 'AND n.uuid < $uuid' if uuid_cursor else ''
-        limit_query: LiteralString = 'LIMIT $limit' if limit is not None else ''
-
         records, _, _ = await driver.execute_query(
-            """
-        MATCH (n:Community) WHERE n.group_id IN $group_ids
-        """
-            + cursor_query
-            + """
-        RETURN
-            n.uuid As uuid, 
-            n.name AS name,
-            n.group_id AS group_id,
-            n.created_at AS created_at, 
-            n.summary AS summary
-        ORDER BY n.uuid DESC
-        """
-            + limit_query,
+            community_nodes_by_group_ids_query(bool(uuid_cursor), limit is not None),
             group_ids=group_ids,
             uuid=uuid_cursor,
             limit=limit,
@@ -538,6 +490,74 @@ class CommunityNode(Node):
         return communities
 
 
+@registered_query
+def episodic_nodes_by_group_ids_query(has_cursor: bool, has_limit: bool) -> str:
+    cursor_query: LiteralString = 'AND e.uuid < $uuid' if has_cursor else ''
+    limit_query: LiteralString = 'LIMIT $limit' if has_limit else ''
+
+    return (
+        """
+        MATCH (e:Episodic) WHERE e.group_id IN $group_ids
+        """
+        + cursor_query
+        + """
+        RETURN DISTINCT
+        e.content AS content,
+        e.created_at AS created_at,
+        e.valid_at AS valid_at,
+        e.uuid AS uuid,
+        e.name AS name,
+        e.group_id AS group_id,
+        e.source_description AS source_description,
+        e.source AS source,
+        e.entity_edges AS entity_edges
+        ORDER BY e.uuid DESC
+        """
+        + limit_query
+    )
+
+
+@registered_query
+def entity_nodes_by_group_ids_query(has_cursor: bool, has_limit: bool) -> str:
+    cursor_query: LiteralString = 'AND n.uuid < $uuid' if has_cursor else ''
+    limit_query: LiteralString = 'LIMIT $limit' if has_limit else ''
+
+    return (
+        """
+        MATCH (n:Entity) WHERE n.group_id IN $group_ids
+        """
+        + cursor_query
+        + ENTITY_NODE_RETURN
+        + """
+        ORDER BY n.uuid DESC
+        """
+        + limit_query
+    )
+
+
+@registered_query
+def community_nodes_by_group_ids_query(has_cursor: bool, has_limit: bool) -> str:
+    cursor_query: LiteralString = 'AND n.uuid < $uuid' if has_cursor else ''
+    limit_query: LiteralString = 'LIMIT $limit' if has_limit else ''
+
+    return (
+        """
+        MATCH (n:Community) WHERE n.group_id IN $group_ids
+        """
+        + cursor_query
+        + """
+        RETURN
+        n.uuid As uuid, 
+        n.name AS name,
+        n.group_id AS group_id,
+        n.created_at AS created_at, 
+        n.summary AS summary
+        ORDER BY n.uuid DESC
+        """
+        + limit_query
+    )
+
+
 # Node helpers
 def get_episodic_node_from_record(record: Any) -> EpisodicNode:
     created_at = parse_db_date(record['created_at'])
@@ -0,0 +1,169 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+from typing import Any, Protocol, TypedDict
+
+from pydantic import BaseModel, Field
+
+from .extract_edges import Edge
+from .extract_nodes import ExtractedEntity
+from .models import Message, PromptFunction, PromptVersion
+
+
+class ExtractedGraph(BaseModel):
+    extracted_entities: list[ExtractedEntity] = Field(
+        ...,
+        description='List of extracted entities. The id of an entity is its position in this list, starting at 0.',
+    )
+    edges: list[Edge] = Field(
+        ...,
+        description='List of facts between the extracted entities, referencing entities by id.',
+    )
+
+
+class MissedGraph(BaseModel):
+    missed_entities: list[ExtractedEntity] = Field(
+        ...,
+        description="Entities that weren't extracted. Their ids continue after the last id in EXTRACTED ENTITIES.",
+    )
+    missed_facts: list[Edge] = Field(
+        ...,
+        description="Facts that weren't extracted, referencing entities by id.",
+    )
+
+
+class Prompt(Protocol):
+    extract: PromptVersion
+    reflexion: PromptVersion
+
+
+class Versions(TypedDict):
+    extract: PromptFunction
+    reflexion: PromptFunction
+
+
+SOURCE_INSTRUCTIONS = {
+    'message': 'The CURRENT EPISODE is a conversational message. Always extract the speaker '
+    '(the part before the colon `:` in each dialogue line) as an entity.',
+    'text': 'The CURRENT EPISODE is unstructured text.',
+    'json': 'The CURRENT EPISODE is a JSON document. Use the SOURCE DESCRIPTION to understand it.',
+}
+
+
+def extract(context: dict[str, Any]) -> list[Message]:
+    sys_prompt = """You are an AI assistant that builds knowledge graphs. In a single pass you extract
+    the significant entities mentioned in an episode and the factual relationships between them."""
+
+    user_prompt = f"""
+<PREVIOUS EPISODES>
+{json.dumps([ep for ep in context['previous_episodes']], indent=2)}
+</PREVIOUS EPISODES>
+
+<SOURCE DESCRIPTION>
+{context['source_description']}
+</SOURCE DESCRIPTION>
+
+<CURRENT EPISODE>
+{context['episode_content']}
+</CURRENT EPISODE>
+
+<REFERENCE_TIME>
+{context['reference_time']}  # ISO 8601 (UTC); used to resolve relative time mentions
+</REFERENCE_TIME>
+
+<ENTITY TYPES>
+{context['entity_types']}
+</ENTITY TYPES>
+
+<FACT TYPES>
+{context['edge_types']}
+</FACT TYPES>
+
+# TASK
+{SOURCE_INSTRUCTIONS.get(context['source'], '')}
+
+1. Extract all significant entities, concepts, or actors mentioned **explicitly or implicitly** in the CURRENT EPISODE.
+   - Disambiguate pronouns to the names of the entities they refer to.
+   - Do NOT extract entities mentioned only in the PREVIOUS EPISODES; they are for context only.
+   - Do NOT extract entities representing relationships or actions, or dates and times.
+   - Be explicit and unambiguous in naming entities (e.g., use full names when available).
+   - Classify each entity using the descriptions in ENTITY TYPES and set its `entity_type_id`.
+   - The id of an entity is its position in `extracted_entities`, starting at 0.
+
+2. Extract all factual relationships between the extracted entities that are clearly stated or
+   unambiguously implied in the CURRENT EPISODE.
+   - Each fact must involve two **distinct** entities, referenced by their ids.
+   - Use a SCREAMING_SNAKE_CASE string as the `relation_type` (e.g., FOUNDED, WORKS_AT).
+   - The FACT TYPES are the most important types of facts, but are not exhaustive. Each FACT TYPE
+     contains its fact_type_signature which represents the source and target entity types.
+   - The `fact` should quote or closely paraphrase the original source sentence(s).
+   - Do not emit duplicate or semantically redundant facts.
+
+# DATETIME RULES
+
+- Use ISO 8601 with “Z” suffix (UTC) (e.g., 2025-04-30T00:00:00Z).
+- Use REFERENCE_TIME to resolve vague or relative temporal expressions (e.g., "last week").
+- If the fact is ongoing (present tense), set `valid_at` to REFERENCE_TIME.
+- If a change/termination is expressed, set `invalid_at` to the relevant timestamp.
+- Leave both fields `null` if no explicit or resolvable time is stated.
+
+{context['custom_prompt']}
+"""
+    return [
+        Message(role='system', content=sys_prompt),
+        Message(role='user', content=user_prompt),
+    ]
+
+
+def reflexion(context: dict[str, Any]) -> list[Message]:
+    sys_prompt = """You are an AI assistant that determines which entities and facts have not been
+    extracted from the given context"""
+
+    user_prompt = f"""
+<PREVIOUS EPISODES>
+{json.dumps([ep for ep in context['previous_episodes']], indent=2)}
+</PREVIOUS EPISODES>
+
+<CURRENT EPISODE>
+{context['episode_content']}
+</CURRENT EPISODE>
+
+<ENTITY TYPES>
+{context['entity_types']}
+</ENTITY TYPES>
+
+<EXTRACTED ENTITIES>
+{context['extracted_entities']}
+</EXTRACTED ENTITIES>
+
+<EXTRACTED FACTS>
+{context['extracted_facts']}
+</EXTRACTED FACTS>
+
+Given the above CURRENT EPISODE, the EXTRACTED ENTITIES and the EXTRACTED FACTS, return only the
+significant entities and facts from the CURRENT EPISODE that are missing.
+- Missed entities are numbered after the EXTRACTED ENTITIES: the first missed entity has id {context['next_entity_id']}.
+- Missed facts may reference both EXTRACTED ENTITIES and missed entities by id.
+- Return empty lists if nothing was missed.
+"""
+    return [
+        Message(role='system', content=sys_prompt),
+        Message(role='user', content=user_prompt),
+    ]
+
+
+versions: Versions = {'extract': extract, 'reflexion': reflexion}
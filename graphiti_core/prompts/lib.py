@@ -31,6 +31,9 @@ from .extract_edge_dates import versions as extract_edge_dates_versions
 from .extract_edges import Prompt as ExtractEdgesPrompt
 from .extract_edges import Versions as ExtractEdgesVersions
 from .extract_edges import versions as extract_edges_versions
+from .extract_graph import Prompt as ExtractGraphPrompt
+from .extract_graph import Versions as ExtractGraphVersions
+from .extract_graph import versions as extract_graph_versions
 from .extract_nodes import Prompt as ExtractNodesPrompt
 from .extract_nodes import Versions as ExtractNodesVersions
 from .extract_nodes import versions as extract_nodes_versions
@@ -48,6 +51,7 @@ class PromptLibrary(Protocol):
     extract_nodes: ExtractNodesPrompt
     dedupe_nodes: DedupeNodesPrompt
     extract_edges: ExtractEdgesPrompt
+    extract_graph: ExtractGraphPrompt
     dedupe_edges: DedupeEdgesPrompt
     invalidate_edges: InvalidateEdgesPrompt
     extract_edge_dates: ExtractEdgeDatesPrompt
@@ -59,6 +63,7 @@ class PromptLibraryImpl(TypedDict):
     extract_nodes: ExtractNodesVersions
     dedupe_nodes: DedupeNodesVersions
     extract_edges: ExtractEdgesVersions
+    extract_graph: ExtractGraphVersions
     dedupe_edges: DedupeEdgesVersions
     invalidate_edges: InvalidateEdgesVersions
     extract_edge_dates: ExtractEdgeDatesVersions
@@ -93,6 +98,7 @@ PROMPT_LIBRARY_IMPL: PromptLibraryImpl = {
     'extract_nodes': extract_nodes_versions,
     'dedupe_nodes': dedupe_nodes_versions,
     'extract_edges': extract_edges_versions,
+    'extract_graph': extract_graph_versions,
     'dedupe_edges': dedupe_edges_versions,
     'invalidate_edges': invalidate_edges_versions,
     'extract_edge_dates': extract_edge_dates_versions,
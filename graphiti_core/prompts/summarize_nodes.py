@@ -29,6 +29,13 @@ class Summary(BaseModel):
     )
 
 
+class EpisodesSummary(BaseModel):
+    summary: str = Field(
+        ...,
+        description='Summary containing the important information from the episodes. Under 250 words',
+    )
+
+
 class SummaryDescription(BaseModel):
     description: str = Field(..., description='One sentence description of the provided summary')
 
@@ -37,12 +44,14 @@ class Prompt(Protocol):
     summarize_pair: PromptVersion
     summarize_context: PromptVersion
     summary_description: PromptVersion
+    summarize_episodes: PromptVersion
 
 
 class Versions(TypedDict):
     summarize_pair: PromptFunction
     summarize_context: PromptFunction
     summary_description: PromptFunction
+    summarize_episodes: PromptFunction
 
 
 def summarize_pair(context: dict[str, Any]) -> list[Message]:
@@ -126,8 +135,36 @@ def summary_description(context: dict[str, Any]) -> list[Message]:
     ]
 
 
+def summarize_episodes(context: dict[str, Any]) -> list[Message]:
+    return [
+        Message(
+            role='system',
+            content='You are a helpful assistant that condenses conversation and document history.',
+        ),
+        Message(
+            role='user',
+            content=f"""
+        <PREVIOUS SUMMARY>
+        {context['summary']}
+        </PREVIOUS SUMMARY>
+
+        <EPISODES>
+        {json.dumps(context['episodes'], indent=2)}
+        </EPISODES>
+
+        Update the PREVIOUS SUMMARY with the information from the EPISODES, which are listed in chronological order.
+        Keep the names of people, organizations, places and other entities, and the facts and dates that relate them.
+        Drop greetings, filler and repeated information. If there is no PREVIOUS SUMMARY, summarize the EPISODES.
+
+        Summaries must be under 250 words.
+        """,
+        ),
+    ]
+
+
 versions: Versions = {
     'summarize_pair': summarize_pair,
     'summarize_context': summarize_context,
     'summary_description': summary_description,
+    'summarize_episodes': summarize_episodes,
 }
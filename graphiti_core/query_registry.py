@@ -0,0 +1,88 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import functools
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+# Query variants kept before the least recently used one is dropped
+DEFAULT_MAX_QUERIES = 1024
+
+
+class QueryRegistry:
+    """
+    Query texts built once per query name and query shape.
+
+    The shape of a query is everything that changes its text, such as the graph provider and the
+    filters of a search, but never a value, which is passed as a parameter. Calls with the same
+    shape get the exact same text, so the database can reuse the plan it cached for it.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_QUERIES):
+        self.max_size = max_size
+        self._queries: OrderedDict[tuple[Hashable, ...], str] = OrderedDict()
+        self._stats: dict[str, dict[str, int]] = {}
+
+    def get(self, name: str, shape: tuple[Hashable, ...], build: Callable[[], str]) -> str:
+        key = (name, *shape)
+        stats = self._stats.setdefault(name, {'hits': 0, 'misses': 0})
+
+        query = self._queries.get(key)
+        if query is not None:
+            self._queries.move_to_end(key)
+            stats['hits'] += 1
+            return query
+
+        stats['misses'] += 1
+        query = build()
+        self._queries[key] = query
+        if len(self._queries) > self.max_size:
+            self._queries.popitem(last=False)
+        return query
+
+    def clear(self):
+        self._queries.clear()
+        self._stats.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        hits = sum(stats['hits'] for stats in self._stats.values())
+        misses = sum(stats['misses'] for stats in self._stats.values())
+        return {
+            'variants': len(self._queries),
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'queries': {name: dict(stats) for name, stats in self._stats.items()},
+        }
+
+
+query_registry = QueryRegistry()
+
+
+def registered_query(build: Callable[..., str]) -> Callable[..., str]:
+    """Build the query text once for every distinct set of positional arguments."""
+    name = build.__name__
+
+    @functools.wraps(build)
+    def get(*shape: Hashable) -> str:
+        return query_registry.get(name, shape, lambda: build(*shape))
+
+    return get
+
+
+def query_registry_stats() -> dict[str, Any]:
+    return query_registry.snapshot()
@@ -21,7 +21,7 @@ from time import time
 from graphiti_core.cross_encoder.client import CrossEncoderClient
 from graphiti_core.driver.driver import GraphDriver
 from graphiti_core.edges import EntityEdge
-from graphiti_core.errors import SearchRerankerError
+from graphiti_core.errors import DeadlineExceededError, SearchRerankerError
 from graphiti_core.graphiti_types import GraphitiClients
 from graphiti_core.helpers import semaphore_gather
 from graphiti_core.nodes import CommunityNode, EntityNode, EpisodicNode
@@ -59,9 +59,33 @@ from graphiti_core.search.search_utils import (
     node_similarity_search,
     rrf,
 )
+from graphiti_core.utils.concurrency import ProviderKind, get_limiter
+from graphiti_core.utils.deadline import deadline_near
 
 logger = logging.getLogger(__name__)
 
+# Cross-encoder reranking is skipped when less time than this is left before the search deadline
+CROSS_ENCODER_DEADLINE_MARGIN = 1.0
+
+
+async def cross_encoder_rank(
+    cross_encoder: CrossEncoderClient, query: str, passages: list[str]
+) -> list[tuple[str, float]] | None:
+    """
+    Rank passages with the cross-encoder, or return None if the search deadline does not leave
+    time for it, in which case callers fall back to the RRF order.
+    """
+    if deadline_near(CROSS_ENCODER_DEADLINE_MARGIN):
+        logger.debug('Skipping cross-encoder reranking, the search deadline is near')
+        return None
+
+    try:
+        async with get_limiter(ProviderKind.reranker).slot():
+            return await cross_encoder.rank(query, passages)
+    except DeadlineExceededError:
+        logger.warning('Cross-encoder reranking ran past the search deadline, using RRF order')
+        return None
+
 
 async def search(
     clients: GraphitiClients,
@@ -221,10 +245,20 @@ async def edge_search(
         )
     elif config.reranker == EdgeReranker.cross_encoder:
         fact_to_uuid_map = {edge.fact: edge.uuid for edge in list(edge_uuid_map.values())[:limit]}
-        reranked_facts = await cross_encoder.rank(query, list(fact_to_uuid_map.keys()))
-        reranked_uuids = [
-            fact_to_uuid_map[fact] for fact, score in reranked_facts if score >= reranker_min_score
-        ]
+        reranked_facts = await cross_encoder_rank(
+            cross_encoder, query, list(fact_to_uuid_map.keys())
+        )
+        if reranked_facts is None:
+            reranked_uuids = rrf(
+                [[edge.uuid for edge in result] for result in search_results],
+                min_score=reranker_min_score,
+            )
+        else:
+            reranked_uuids = [
+                fact_to_uuid_map[fact]
+                for fact, score in reranked_facts
+                if score >= reranker_min_score
+            ]
     elif config.reranker == EdgeReranker.node_distance:
         if center_node_uuid is None:
             raise SearchRerankerError('No center node provided for Node Distance reranker')
@@ -315,12 +349,17 @@ async def node_search(
     elif config.reranker == NodeReranker.cross_encoder:
         name_to_uuid_map = {node.name: node.uuid for node in list(node_uuid_map.values())}
 
-        reranked_node_names = await cross_encoder.rank(query, list(name_to_uuid_map.keys()))
-        reranked_uuids = [
-            name_to_uuid_map[name]
-            for name, score in reranked_node_names
-            if score >= reranker_min_score
-        ]
+        reranked_node_names = await cross_encoder_rank(
+            cross_encoder, query, list(name_to_uuid_map.keys())
+        )
+        if reranked_node_names is None:
+            reranked_uuids = rrf(search_result_uuids, min_score=reranker_min_score)
+        else:
+            reranked_uuids = [
+                name_to_uuid_map[name]
+                for name, score in reranked_node_names
+                if score >= reranker_min_score
+            ]
     elif config.reranker == NodeReranker.episode_mentions:
         reranked_uuids = await episode_mentions_reranker(
             driver, search_result_uuids, min_score=reranker_min_score
@@ -375,12 +414,17 @@ async def episode_search(
 
         content_to_uuid_map = {episode.content: episode.uuid for episode in rrf_results}
 
-        reranked_contents = await cross_encoder.rank(query, list(content_to_uuid_map.keys()))
-        reranked_uuids = [
-            content_to_uuid_map[content]
-            for content, score in reranked_contents
-            if score >= reranker_min_score
-        ]
+        reranked_contents = await cross_encoder_rank(
+            cross_encoder, query, list(content_to_uuid_map.keys())
+        )
+        if reranked_contents is None:
+            reranked_uuids = rrf_result_uuids
+        else:
+            reranked_uuids = [
+                content_to_uuid_map[content]
+                for content, score in reranked_contents
+                if score >= reranker_min_score
+            ]
 
     reranked_episodes = [episode_uuid_map[uuid] for uuid in reranked_uuids]
 
@@ -429,10 +473,17 @@ async def community_search(
         )
     elif config.reranker == CommunityReranker.cross_encoder:
         name_to_uuid_map = {node.name: node.uuid for result in search_results for node in result}
-        reranked_nodes = await cross_encoder.rank(query, list(name_to_uuid_map.keys()))
-        reranked_uuids = [
-            name_to_uuid_map[name] for name, score in reranked_nodes if score >= reranker_min_score
-        ]
+        reranked_nodes = await cross_encoder_rank(
+            cross_encoder, query, list(name_to_uuid_map.keys())
+        )
+        if reranked_nodes is None:
+            reranked_uuids = rrf(search_result_uuids, min_score=reranker_min_score)
+        else:
+            reranked_uuids = [
+                name_to_uuid_map[name]
+                for name, score in reranked_nodes
+                if score >= reranker_min_score
+            ]
 
     reranked_communities = [community_uuid_map[uuid] for uuid in reranked_uuids]
 
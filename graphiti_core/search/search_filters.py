@@ -57,7 +57,7 @@ def node_search_filter_query_constructor(
     filter_params: dict[str, Any] = {}
 
     if filters.node_labels is not None:
-        node_labels = '|'.join(filters.node_labels)
+        node_labels = '|'.join(sorted(filters.node_labels))
         node_label_filter = ' AND n:' + node_labels
         filter_query += node_label_filter
 
@@ -77,7 +77,7 @@ def edge_search_filter_query_constructor(
         filter_params['edge_types'] = edge_types
 
     if filters.node_labels is not None:
-        node_labels = '|'.join(filters.node_labels)
+        node_labels = '|'.join(sorted(filters.node_labels))
         node_label_filter = '\nAND n:' + node_labels + ' AND m:' + node_labels
         filter_query += node_label_filter
 
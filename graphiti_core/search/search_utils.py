@@ -46,6 +46,7 @@ from graphiti_core.nodes import (
     get_entity_node_from_record,
     get_episodic_node_from_record,
 )
+from graphiti_core.query_registry import registered_query
 from graphiti_core.search.search_filters import (
     SearchFilters,
     edge_search_filter_query_constructor,
@@ -152,22 +153,10 @@ async def get_communities_by_nodes(
     return communities
 
 
-async def edge_fulltext_search(
-    driver: GraphDriver,
-    query: str,
-    search_filter: SearchFilters,
-    group_ids: list[str] | None = None,
-    limit=RELEVANT_SCHEMA_LIMIT,
-) -> list[EntityEdge]:
-    # fulltext search over facts
-    fuzzy_query = fulltext_query(query, group_ids)
-    if fuzzy_query == '':
-        return []
-
-    filter_query, filter_params = edge_search_filter_query_constructor(search_filter)
-
-    query = (
-        get_relationships_query('edge_name_and_fact', db_type=driver.provider)
+@registered_query
+def edge_fulltext_search_query(provider: str, filter_query: str) -> str:
+    return (
+        get_relationships_query('edge_name_and_fact', db_type=provider)
         + """
         YIELD relationship AS rel, score
         MATCH (n:Entity)-[r:RELATES_TO]->(m:Entity)
@@ -192,6 +181,23 @@ async def edge_fulltext_search(
         """
     )
 
+
+async def edge_fulltext_search(
+    driver: GraphDriver,
+    query: str,
+    search_filter: SearchFilters,
+    group_ids: list[str] | None = None,
+    limit=RELEVANT_SCHEMA_LIMIT,
+) -> list[EntityEdge]:
+    # fulltext search over facts
+    fuzzy_query = fulltext_query(query, group_ids)
+    if fuzzy_query == '':
+        return []
+
+    filter_query, filter_params = edge_search_filter_query_constructor(search_filter)
+
+    query = edge_fulltext_search_query(driver.provider, filter_query)
+
     records, _, _ = await driver.execute_query(
         query,
         params=filter_params,
@@ -207,6 +213,39 @@ async def edge_fulltext_search(
     return edges
 
 
+@registered_query
+def edge_similarity_search_query(provider: str, group_filter_query: str, filter_query: str) -> str:
+    return (
+        RUNTIME_QUERY
+        + """
+        MATCH (n:Entity)-[r:RELATES_TO]->(m:Entity)
+        """
+        + group_filter_query
+        + filter_query
+        + """
+        WITH DISTINCT r, """
+        + get_vector_cosine_func_query('r.fact_embedding', '$search_vector', provider)
+        + """ AS score
+        WHERE score > $min_score
+        RETURN
+            r.uuid AS uuid,
+            r.group_id AS group_id,
+            startNode(r).uuid AS source_node_uuid,
+            endNode(r).uuid AS target_node_uuid,
+            r.created_at AS created_at,
+            r.name AS name,
+            r.fact AS fact,
+            r.episodes AS episodes,
+            r.expired_at AS expired_at,
+            r.valid_at AS valid_at,
+            r.invalid_at AS invalid_at,
+            properties(r) AS attributes
+        ORDER BY score DESC
+        LIMIT $limit
+        """
+    )
+
+
 async def edge_similarity_search(
     driver: GraphDriver,
     search_vector: list[float],
@@ -236,35 +275,7 @@ async def edge_similarity_search(
         if target_node_uuid is not None:
             group_filter_query += '\nAND (m.uuid IN [$source_uuid, $target_uuid])'
 
-    query = (
-        RUNTIME_QUERY
-        + """
-        MATCH (n:Entity)-[r:RELATES_TO]->(m:Entity)
-        """
-        + group_filter_query
-        + filter_query
-        + """
-        WITH DISTINCT r, """
-        + get_vector_cosine_func_query('r.fact_embedding', '$search_vector', driver.provider)
-        + """ AS score
-        WHERE score > $min_score
-        RETURN
-            r.uuid AS uuid,
-            r.group_id AS group_id,
-            startNode(r).uuid AS source_node_uuid,
-            endNode(r).uuid AS target_node_uuid,
-            r.created_at AS created_at,
-            r.name AS name,
-            r.fact AS fact,
-            r.episodes AS episodes,
-            r.expired_at AS expired_at,
-            r.valid_at AS valid_at,
-            r.invalid_at AS invalid_at,
-            properties(r) AS attributes
-        ORDER BY score DESC
-        LIMIT $limit
-        """
-    )
+    query = edge_similarity_search_query(driver.provider, group_filter_query, filter_query)
     records, header, _ = await driver.execute_query(
         query,
         params=query_params,
@@ -283,20 +294,9 @@ async def edge_similarity_search(
     return edges
 
 
-async def edge_bfs_search(
-    driver: GraphDriver,
-    bfs_origin_node_uuids: list[str] | None,
-    bfs_max_depth: int,
-    search_filter: SearchFilters,
-    limit: int,
-) -> list[EntityEdge]:
-    # vector similarity search over embedded facts
-    if bfs_origin_node_uuids is None:
-        return []
-
-    filter_query, filter_params = edge_search_filter_query_constructor(search_filter)
-
-    query = (
+@registered_query
+def edge_bfs_search_query(filter_query: str) -> str:
+    return (
         """
                                     UNWIND $bfs_origin_node_uuids AS origin_uuid
                                     MATCH path = (origin:Entity|Episodic {uuid: origin_uuid})-[:RELATES_TO|MENTIONS]->{1,3}(n:Entity)
@@ -323,6 +323,22 @@ async def edge_bfs_search(
         """
     )
 
+
+async def edge_bfs_search(
+    driver: GraphDriver,
+    bfs_origin_node_uuids: list[str] | None,
+    bfs_max_depth: int,
+    search_filter: SearchFilters,
+    limit: int,
+) -> list[EntityEdge]:
+    # vector similarity search over embedded facts
+    if bfs_origin_node_uuids is None:
+        return []
+
+    filter_query, filter_params = edge_search_filter_query_constructor(search_filter)
+
+    query = edge_bfs_search_query(filter_query)
+
     records, _, _ = await driver.execute_query(
         query,
         params=filter_params,
@@ -338,6 +354,24 @@ async def edge_bfs_search(
     return edges
 
 
+@registered_query
+def node_fulltext_search_query(provider: str, filter_query: str) -> str:
+    return (
+        get_nodes_query(provider, 'node_name_and_summary', '$query')
+        + """
+        YIELD node AS n, score
+            WITH n, score
+            LIMIT $limit
+            WHERE n:Entity
+        """
+        + filter_query
+        + ENTITY_NODE_RETURN
+        + """
+        ORDER BY score DESC
+        """
+    )
+
+
 async def node_fulltext_search(
     driver: GraphDriver,
     query: str,
@@ -351,20 +385,7 @@ async def node_fulltext_search(
         return []
     filter_query, filter_params = node_search_filter_query_constructor(search_filter)
 
-    query = (
-        get_nodes_query(driver.provider, 'node_name_and_summary', '$query')
-        + """
-        YIELD node AS n, score
-            WITH n, score
-            LIMIT $limit
-            WHERE n:Entity
-        """
-        + filter_query
-        + ENTITY_NODE_RETURN
-        + """
-        ORDER BY score DESC
-        """
-    )
+    query = node_fulltext_search_query(driver.provider, filter_query)
     records, header, _ = await driver.execute_query(
         query,
         params=filter_params,
@@ -380,6 +401,28 @@ async def node_fulltext_search(
     return nodes
 
 
+@registered_query
+def node_similarity_search_query(provider: str, group_filter_query: str, filter_query: str) -> str:
+    return (
+        RUNTIME_QUERY
+        + """
+        MATCH (n:Entity)
+        """
+        + group_filter_query
+        + filter_query
+        + """
+        WITH n, """
+        + get_vector_cosine_func_query('n.name_embedding', '$search_vector', provider)
+        + """ AS score
+        WHERE score > $min_score"""
+        + ENTITY_NODE_RETURN
+        + """
+        ORDER BY score DESC
+        LIMIT $limit
+            """
+    )
+
+
 async def node_similarity_search(
     driver: GraphDriver,
     search_vector: list[float],
@@ -399,24 +442,7 @@ async def node_similarity_search(
     filter_query, filter_params = node_search_filter_query_constructor(search_filter)
     query_params.update(filter_params)
 
-    query = (
-        RUNTIME_QUERY
-        + """
-        MATCH (n:Entity)
-        """
-        + group_filter_query
-        + filter_query
-        + """
-        WITH n, """
-        + get_vector_cosine_func_query('n.name_embedding', '$search_vector', driver.provider)
-        + """ AS score
-        WHERE score > $min_score"""
-        + ENTITY_NODE_RETURN
-        + """
-        ORDER BY score DESC
-        LIMIT $limit
-            """
-    )
+    query = node_similarity_search_query(driver.provider, group_filter_query, filter_query)
 
     records, header, _ = await driver.execute_query(
         query,
@@ -434,6 +460,22 @@ async def node_similarity_search(
     return nodes
 
 
+@registered_query
+def node_bfs_search_query(filter_query: str) -> str:
+    return (
+        """
+                            UNWIND $bfs_origin_node_uuids AS origin_uuid
+                            MATCH (origin:Entity|Episodic {uuid: origin_uuid})-[:RELATES_TO|MENTIONS]->{1,3}(n:Entity)
+                            WHERE n.group_id = origin.group_id
+                            """
+        + filter_query
+        + ENTITY_NODE_RETURN
+        + """
+        LIMIT $limit
+        """
+    )
+
+
 async def node_bfs_search(
     driver: GraphDriver,
     bfs_origin_node_uuids: list[str] | None,
@@ -447,18 +489,7 @@ async def node_bfs_search(
 
     filter_query, filter_params = node_search_filter_query_constructor(search_filter)
 
-    query = (
-        """
-                            UNWIND $bfs_origin_node_uuids AS origin_uuid
-                            MATCH (origin:Entity|Episodic {uuid: origin_uuid})-[:RELATES_TO|MENTIONS]->{1,3}(n:Entity)
-                            WHERE n.group_id = origin.group_id
-                            """
-        + filter_query
-        + ENTITY_NODE_RETURN
-        + """
-        LIMIT $limit
-        """
-    )
+    query = node_bfs_search_query(filter_query)
     records, _, _ = await driver.execute_query(
         query,
         params=filter_params,
@@ -473,20 +504,10 @@ async def node_bfs_search(
     return nodes
 
 
-async def episode_fulltext_search(
-    driver: GraphDriver,
-    query: str,
-    _search_filter: SearchFilters,
-    group_ids: list[str] | None = None,
-    limit=RELEVANT_SCHEMA_LIMIT,
-) -> list[EpisodicNode]:
-    # BM25 search to get top episodes
-    fuzzy_query = fulltext_query(query, group_ids)
-    if fuzzy_query == '':
-        return []
-
-    query = (
-        get_nodes_query(driver.provider, 'episode_content', '$query')
+@registered_query
+def episode_fulltext_search_query(provider: str) -> str:
+    return (
+        get_nodes_query(provider, 'episode_content', '$query')
         + """
         YIELD node AS episode, score
         MATCH (e:Episodic)
@@ -506,6 +527,21 @@ async def episode_fulltext_search(
         """
     )
 
+
+async def episode_fulltext_search(
+    driver: GraphDriver,
+    query: str,
+    _search_filter: SearchFilters,
+    group_ids: list[str] | None = None,
+    limit=RELEVANT_SCHEMA_LIMIT,
+) -> list[EpisodicNode]:
+    # BM25 search to get top episodes
+    fuzzy_query = fulltext_query(query, group_ids)
+    if fuzzy_query == '':
+        return []
+
+    query = episode_fulltext_search_query(driver.provider)
+
     records, _, _ = await driver.execute_query(
         query,
         query=fuzzy_query,
@@ -519,19 +555,10 @@ async def episode_fulltext_search(
     return episodes
 
 
-async def community_fulltext_search(
-    driver: GraphDriver,
-    query: str,
-    group_ids: list[str] | None = None,
-    limit=RELEVANT_SCHEMA_LIMIT,
-) -> list[CommunityNode]:
-    # BM25 search to get top communities
-    fuzzy_query = fulltext_query(query, group_ids)
-    if fuzzy_query == '':
-        return []
-
-    query = (
-        get_nodes_query(driver.provider, 'community_name', '$query')
+@registered_query
+def community_fulltext_search_query(provider: str) -> str:
+    return (
+        get_nodes_query(provider, 'community_name', '$query')
         + """
         YIELD node AS comm, score
         RETURN
@@ -545,6 +572,20 @@ async def community_fulltext_search(
         """
     )
 
+
+async def community_fulltext_search(
+    driver: GraphDriver,
+    query: str,
+    group_ids: list[str] | None = None,
+    limit=RELEVANT_SCHEMA_LIMIT,
+) -> list[CommunityNode]:
+    # BM25 search to get top communities
+    fuzzy_query = fulltext_query(query, group_ids)
+    if fuzzy_query == '':
+        return []
+
+    query = community_fulltext_search_query(driver.provider)
+
     records, _, _ = await driver.execute_query(
         query,
         query=fuzzy_query,
@@ -558,22 +599,9 @@ async def community_fulltext_search(
     return communities
 
 
-async def community_similarity_search(
-    driver: GraphDriver,
-    search_vector: list[float],
-    group_ids: list[str] | None = None,
-    limit=RELEVANT_SCHEMA_LIMIT,
-    min_score=DEFAULT_MIN_SCORE,
-) -> list[CommunityNode]:
-    # vector similarity search over entity names
-    query_params: dict[str, Any] = {}
-
-    group_filter_query: LiteralString = ''
-    if group_ids is not None:
-        group_filter_query += 'WHERE comm.group_id IN $group_ids'
-        query_params['group_ids'] = group_ids
-
-    query = (
+@registered_query
+def community_similarity_search_query(provider: str, group_filter_query: str) -> str:
+    return (
         RUNTIME_QUERY
         + """
            MATCH (comm:Community)
@@ -581,7 +609,7 @@ async def community_similarity_search(
         + group_filter_query
         + """
            WITH comm, """
-        + get_vector_cosine_func_query('comm.name_embedding', '$search_vector', driver.provider)
+        + get_vector_cosine_func_query('comm.name_embedding', '$search_vector', provider)
         + """ AS score
            WHERE score > $min_score
            RETURN
@@ -595,6 +623,24 @@ async def community_similarity_search(
         """
     )
 
+
+async def community_similarity_search(
+    driver: GraphDriver,
+    search_vector: list[float],
+    group_ids: list[str] | None = None,
+    limit=RELEVANT_SCHEMA_LIMIT,
+    min_score=DEFAULT_MIN_SCORE,
+) -> list[CommunityNode]:
+    # vector similarity search over entity names
+    query_params: dict[str, Any] = {}
+
+    group_filter_query: LiteralString = ''
+    if group_ids is not None:
+        group_filter_query += 'WHERE comm.group_id IN $group_ids'
+        query_params['group_ids'] = group_ids
+
+    query = community_similarity_search_query(driver.provider, group_filter_query)
+
     records, _, _ = await driver.execute_query(
         query,
         search_vector=search_vector,
@@ -683,25 +729,9 @@ async def hybrid_node_search(
     return relevant_nodes
 
 
-async def get_relevant_nodes(
-    driver: GraphDriver,
-    nodes: list[EntityNode],
-    search_filter: SearchFilters,
-    min_score: float = DEFAULT_MIN_SCORE,
-    limit: int = RELEVANT_SCHEMA_LIMIT,
-) -> list[list[EntityNode]]:
-    if len(nodes) == 0:
-        return []
-
-    group_id = nodes[0].group_id
-
-    # vector similarity search over entity names
-    query_params: dict[str, Any] = {}
-
-    filter_query, filter_params = node_search_filter_query_constructor(search_filter)
-    query_params.update(filter_params)
-
-    query = (
+@registered_query
+def relevant_nodes_query(provider: str, filter_query: str) -> str:
+    return (
         RUNTIME_QUERY
         + """
         UNWIND $nodes AS node
@@ -710,12 +740,12 @@ async def get_relevant_nodes(
         + filter_query
         + """
         WITH node, n, """
-        + get_vector_cosine_func_query('n.name_embedding', 'node.name_embedding', driver.provider)
+        + get_vector_cosine_func_query('n.name_embedding', 'node.name_embedding', provider)
         + """ AS score
         WHERE score > $min_score
         WITH node, collect(n)[..$limit] AS top_vector_nodes, collect(n.uuid) AS vector_node_uuids
         """
-        + get_nodes_query(driver.provider, 'node_name_and_summary', 'node.fulltext_query')
+        + get_nodes_query(provider, 'node_name_and_summary', 'node.fulltext_query')
         + """
         YIELD node AS m
         WHERE m.group_id = $group_id
@@ -745,6 +775,27 @@ async def get_relevant_nodes(
         """
     )
 
+
+async def get_relevant_nodes(
+    driver: GraphDriver,
+    nodes: list[EntityNode],
+    search_filter: SearchFilters,
+    min_score: float = DEFAULT_MIN_SCORE,
+    limit: int = RELEVANT_SCHEMA_LIMIT,
+) -> list[list[EntityNode]]:
+    if len(nodes) == 0:
+        return []
+
+    group_id = nodes[0].group_id
+
+    # vector similarity search over entity names
+    query_params: dict[str, Any] = {}
+
+    filter_query, filter_params = node_search_filter_query_constructor(search_filter)
+    query_params.update(filter_params)
+
+    query = relevant_nodes_query(driver.provider, filter_query)
+
     query_nodes = [
         {
             'uuid': node.uuid,
@@ -778,22 +829,9 @@ async def get_relevant_nodes(
     return relevant_nodes
 
 
-async def get_relevant_edges(
-    driver: GraphDriver,
-    edges: list[EntityEdge],
-    search_filter: SearchFilters,
-    min_score: float = DEFAULT_MIN_SCORE,
-    limit: int = RELEVANT_SCHEMA_LIMIT,
-) -> list[list[EntityEdge]]:
-    if len(edges) == 0:
-        return []
-
-    query_params: dict[str, Any] = {}
-
-    filter_query, filter_params = edge_search_filter_query_constructor(search_filter)
-    query_params.update(filter_params)
-
-    query = (
+@registered_query
+def relevant_edges_query(provider: str, filter_query: str) -> str:
+    return (
         RUNTIME_QUERY
         + """
         UNWIND $edges AS edge
@@ -802,7 +840,7 @@ async def get_relevant_edges(
         + filter_query
         + """
         WITH e, edge, """
-        + get_vector_cosine_func_query('e.fact_embedding', 'edge.fact_embedding', driver.provider)
+        + get_vector_cosine_func_query('e.fact_embedding', 'edge.fact_embedding', provider)
         + """ AS score
         WHERE score > $min_score
         WITH edge, e, score
@@ -826,6 +864,24 @@ async def get_relevant_edges(
         """
     )
 
+
+async def get_relevant_edges(
+    driver: GraphDriver,
+    edges: list[EntityEdge],
+    search_filter: SearchFilters,
+    min_score: float = DEFAULT_MIN_SCORE,
+    limit: int = RELEVANT_SCHEMA_LIMIT,
+) -> list[list[EntityEdge]]:
+    if len(edges) == 0:
+        return []
+
+    query_params: dict[str, Any] = {}
+
+    filter_query, filter_params = edge_search_filter_query_constructor(search_filter)
+    query_params.update(filter_params)
+
+    query = relevant_edges_query(driver.provider, filter_query)
+
     results, _, _ = await driver.execute_query(
         query,
         params=query_params,
@@ -848,22 +904,9 @@ async def get_relevant_edges(
     return relevant_edges
 
 
-async def get_edge_invalidation_candidates(
-    driver: GraphDriver,
-    edges: list[EntityEdge],
-    search_filter: SearchFilters,
-    min_score: float = DEFAULT_MIN_SCORE,
-    limit: int = RELEVANT_SCHEMA_LIMIT,
-) -> list[list[EntityEdge]]:
-    if len(edges) == 0:
-        return []
-
-    query_params: dict[str, Any] = {}
-
-    filter_query, filter_params = edge_search_filter_query_constructor(search_filter)
-    query_params.update(filter_params)
-
-    query = (
+@registered_query
+def edge_invalidation_candidates_query(provider: str, filter_query: str) -> str:
+    return (
         RUNTIME_QUERY
         + """
         UNWIND $edges AS edge
@@ -873,7 +916,7 @@ async def get_edge_invalidation_candidates(
         + filter_query
         + """
         WITH edge, e, """
-        + get_vector_cosine_func_query('e.fact_embedding', 'edge.fact_embedding', driver.provider)
+        + get_vector_cosine_func_query('e.fact_embedding', 'edge.fact_embedding', provider)
         + """ AS score
         WHERE score > $min_score
         WITH edge, e, score
@@ -897,6 +940,24 @@ async def get_edge_invalidation_candidates(
         """
     )
 
+
+async def get_edge_invalidation_candidates(
+    driver: GraphDriver,
+    edges: list[EntityEdge],
+    search_filter: SearchFilters,
+    min_score: float = DEFAULT_MIN_SCORE,
+    limit: int = RELEVANT_SCHEMA_LIMIT,
+) -> list[list[EntityEdge]]:
+    if len(edges) == 0:
+        return []
+
+    query_params: dict[str, Any] = {}
+
+    filter_query, filter_params = edge_search_filter_query_constructor(search_filter)
+    query_params.update(filter_params)
+
+    query = edge_invalidation_candidates_query(driver.provider, filter_query)
+
     results, _, _ = await driver.execute_query(
         query,
         params=query_params,
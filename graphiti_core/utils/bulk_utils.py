@@ -14,19 +14,29 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import asyncio
 import logging
+import os
 import typing
 from collections import defaultdict
+from collections.abc import AsyncIterable, AsyncIterator, Callable
 from datetime import datetime
-from math import ceil
-
-from numpy import dot, sqrt
-from pydantic import BaseModel
+from uuid import UUID, uuid4, uuid5
+
+import numpy as np
+from pydantic import BaseModel, Field
+from tenacity import (
+    AsyncRetrying,
+    retry_if_not_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
 from typing_extensions import Any
 
 from graphiti_core.driver.driver import GraphDriver, GraphDriverSession
-from graphiti_core.edges import Edge, EntityEdge, EpisodicEdge
+from graphiti_core.edges import Edge, EntityEdge, EpisodicEdge, create_entity_edge_embeddings
 from graphiti_core.embedder import EmbedderClient
+from graphiti_core.errors import DeadlineExceededError
 from graphiti_core.graph_queries import (
     get_entity_edge_save_bulk_query,
     get_entity_node_save_bulk_query,
@@ -40,11 +50,24 @@ from graphiti_core.models.edges.edge_db_queries import (
 from graphiti_core.models.nodes.node_db_queries import (
     EPISODIC_NODE_SAVE_BULK,
 )
-from graphiti_core.nodes import EntityNode, EpisodeType, EpisodicNode
+from graphiti_core.nodes import (
+    EntityNode,
+    EpisodeType,
+    EpisodicNode,
+    create_entity_node_embeddings,
+)
 from graphiti_core.search.search_filters import SearchFilters
-from graphiti_core.search.search_utils import get_relevant_edges, get_relevant_nodes
+from graphiti_core.search.search_utils import (
+    DEFAULT_MIN_SCORE,
+    get_edge_invalidation_candidates,
+    get_relevant_edges,
+    get_relevant_nodes,
+)
+from graphiti_core.utils.concurrency import ProviderKind, get_limiter
 from graphiti_core.utils.datetime_utils import utc_now
+from graphiti_core.utils.deadline import stop_before_deadline
 from graphiti_core.utils.maintenance.edge_operations import (
+    apply_edge_invalidation,
     build_episodic_edges,
     dedupe_edge_list,
     dedupe_extracted_edges,
@@ -59,11 +82,30 @@ from graphiti_core.utils.maintenance.node_operations import (
     dedupe_node_list,
     extract_nodes,
 )
-from graphiti_core.utils.maintenance.temporal_operations import extract_edge_dates
+from graphiti_core.utils.maintenance.reflexion_policy import ReflexionPolicy
+from graphiti_core.utils.maintenance.temporal_operations import (
+    extract_edge_dates,
+    get_edge_contradictions,
+)
 
 logger = logging.getLogger(__name__)
 
 CHUNK_SIZE = 10
+# Minimum fact similarity of an edge that another edge can invalidate
+INVALIDATION_MIN_SCORE = 0.2
+# Rows of the similarity matrix computed at once when clustering nodes and edges
+SIMILARITY_BLOCK_SIZE = 1024
+# Maximum nodes or edges deduplicated by one LLM call
+MAX_DEDUPE_CHUNK_SIZE = 30
+# Maximum LLM deduplication passes over the nodes or edges of a bulk batch
+MAX_COMPRESS_PASSES = 3
+# Rows written per UNWIND transaction by add_nodes_and_edges_chunked
+BULK_WRITE_CHUNK_SIZE = int(os.getenv('BULK_WRITE_CHUNK_SIZE', 500))
+BULK_WRITE_ATTEMPTS = 3
+# Episodes processed together by Graphiti.ingest_stream
+DEFAULT_STREAM_WINDOW = 50
+# Resolved entities remembered across the windows of Graphiti.ingest_stream
+DEFAULT_ENTITY_CACHE_SIZE = 10000
 
 
 class RawEpisode(BaseModel):
@@ -74,6 +116,115 @@ class RawEpisode(BaseModel):
     reference_time: datetime
 
 
+class StreamCheckpoint(BaseModel):
+    group_id: str
+    stream_id: str = Field(
+        default_factory=lambda: str(uuid4()),
+        description='Namespace of the episode uuids, so a retried window reuses the same uuids',
+    )
+    episodes_done: int = Field(
+        default=0, description='Episodes of the stream, in stream order, saved to the graph'
+    )
+    last_reference_time: datetime | None = None
+    entity_uuids: dict[str, str] = Field(
+        default_factory=dict,
+        description='Uuids of resolved entities by name, least recently used first',
+    )
+
+
+def load_stream_checkpoint(path: str) -> StreamCheckpoint | None:
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return StreamCheckpoint.model_validate_json(f.read())
+
+
+def stream_episode_uuid(stream_id: str, offset: int) -> str:
+    """Uuid of the episode at offset in a stream, the same every time the stream is ingested."""
+    return str(uuid5(UUID(stream_id), str(offset)))
+
+
+def save_stream_checkpoint(path: str, checkpoint: StreamCheckpoint):
+    # Write and rename, so an interruption never leaves a partial checkpoint
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(checkpoint.model_dump_json())
+    os.replace(tmp_path, path)
+
+
+async def episode_windows(
+    episodes: AsyncIterable[RawEpisode],
+    window_size: int,
+    max_pending: int,
+    skip: int = 0,
+) -> AsyncIterator[list[RawEpisode]]:
+    """
+    Group the episodes of a stream into windows of window_size episodes, after skipping skip.
+
+    The stream is read ahead by a background task into a queue of max_pending episodes. Once the
+    queue is full the stream is not read further until windows are taken, so a fast producer is
+    held back by the ingestion instead of filling memory.
+    """
+    if window_size < 1:
+        raise ValueError('window_size must be at least 1')
+
+    # The stream ends with None, or with the exception the stream raised
+    queue: asyncio.Queue[RawEpisode | Exception | None] = asyncio.Queue(maxsize=max(max_pending, 1))
+
+    async def produce():
+        position = 0
+        try:
+            async for episode in episodes:
+                position += 1
+                if position > skip:
+                    await queue.put(episode)
+        except Exception as e:
+            await queue.put(e)
+            return
+        await queue.put(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+        window: list[RawEpisode] = []
+        while True:
+            item = await queue.get()
+            if isinstance(item, Exception):
+                raise item
+            if item is None:
+                break
+            window.append(item)
+            if len(window) == window_size:
+                yield window
+                window = []
+        if window:
+            yield window
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+
+
+def resolve_known_entities(
+    extracted_nodes: list[EntityNode], entity_uuids: dict[str, str]
+) -> tuple[list[EntityNode], dict[str, str]]:
+    """
+    Map extracted nodes named like an already resolved entity to that entity's uuid.
+
+    Returns the nodes left to deduplicate and the uuid map of the mapped nodes. Matched entries
+    of entity_uuids are moved to the end, as the most recently used.
+    """
+    unresolved: list[EntityNode] = []
+    uuid_map: dict[str, str] = {}
+    for node in extracted_nodes:
+        known_uuid = entity_uuids.pop(node.name, None)
+        if known_uuid is None:
+            unresolved.append(node)
+            continue
+        entity_uuids[node.name] = known_uuid
+        uuid_map[node.uuid] = known_uuid
+
+    return unresolved, uuid_map
+
+
 async def retrieve_previous_episodes_bulk(
     driver: GraphDriver, episodes: list[EpisodicNode]
 ) -> list[tuple[EpisodicNode, list[EpisodicNode]]]:
@@ -100,6 +251,9 @@ async def add_nodes_and_edges_bulk(
     entity_edges: list[EntityEdge],
     embedder: EmbedderClient,
 ):
+    # Embed before the transaction, so slow embedding requests don't keep it open
+    await create_missing_embeddings(embedder, entity_nodes, entity_edges)
+
     session = driver.session(database=DEFAULT_DATABASE)
     try:
         await session.execute_write(
@@ -124,13 +278,144 @@ async def add_nodes_and_edges_bulk_tx(
     embedder: EmbedderClient,
     driver: GraphDriver,
 ):
+    # A no-op when called through add_nodes_and_edges_bulk, which embeds before the transaction
+    await create_missing_embeddings(embedder, entity_nodes, entity_edges)
+
+    episodes = episodic_node_rows(episodic_nodes)
+    nodes = entity_node_rows(entity_nodes)
+    edges = entity_edge_rows(entity_edges)
+
+    await tx.run(EPISODIC_NODE_SAVE_BULK, episodes=episodes)
+    entity_node_save_bulk = get_entity_node_save_bulk_query(nodes, driver.provider)
+    await tx.run(entity_node_save_bulk, nodes=nodes)
+    await tx.run(
+        EPISODIC_EDGE_SAVE_BULK, episodic_edges=[edge.model_dump() for edge in episodic_edges]
+    )
+    entity_edge_save_bulk = get_entity_edge_save_bulk_query(driver.provider)
+    await tx.run(entity_edge_save_bulk, entity_edges=edges)
+
+
+async def add_nodes_and_edges_chunked(
+    driver: GraphDriver,
+    episodic_nodes: list[EpisodicNode],
+    episodic_edges: list[EpisodicEdge],
+    entity_nodes: list[EntityNode],
+    entity_edges: list[EntityEdge],
+    embedder: EmbedderClient,
+    chunk_size: int = BULK_WRITE_CHUNK_SIZE,
+):
+    """
+    Save nodes and edges with UNWIND queries of at most chunk_size rows per transaction.
+
+    Unlike add_nodes_and_edges_bulk the write is not atomic: each chunk is its own transaction,
+    and a failed chunk is retried on its own. Nodes are written before the edges between them.
+    """
+    await create_missing_embeddings(embedder, entity_nodes, entity_edges)
+
+    episodes = episodic_node_rows(episodic_nodes)
+    nodes = entity_node_rows(entity_nodes)
+    edges = entity_edge_rows(entity_edges)
+
+    await write_rows_chunked(
+        driver, episodes, 'episodes', lambda _: EPISODIC_NODE_SAVE_BULK, chunk_size
+    )
+    await write_rows_chunked(
+        driver,
+        nodes,
+        'nodes',
+        lambda chunk: get_entity_node_save_bulk_query(chunk, driver.provider),
+        chunk_size,
+    )
+    await write_rows_chunked(
+        driver,
+        [edge.model_dump() for edge in episodic_edges],
+        'episodic_edges',
+        lambda _: EPISODIC_EDGE_SAVE_BULK,
+        chunk_size,
+    )
+    await write_rows_chunked(
+        driver,
+        edges,
+        'entity_edges',
+        lambda _: get_entity_edge_save_bulk_query(driver.provider),
+        chunk_size,
+    )
+
+
+async def write_rows_chunked(
+    driver: GraphDriver,
+    rows: list[dict[str, Any]],
+    param_name: str,
+    build_query: Callable[[list[dict[str, Any]]], Any],
+    chunk_size: int = BULK_WRITE_CHUNK_SIZE,
+    attempts: int = BULK_WRITE_ATTEMPTS,
+):
+    """
+    Run the UNWIND query of build_query over rows, passed as param_name, in chunk_size chunks.
+
+    Chunks are written one after another, each in its own write transaction, so a bulk load
+    keeps a single transaction in flight. A failed chunk is retried while the current deadline
+    allows; chunks already written are not written again.
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be at least 1')
+
+    async def run_chunk(tx: GraphDriverSession, query: Any, chunk: list[dict[str, Any]]):
+        await tx.run(query, **{param_name: chunk})
+
+    async def write_chunk(chunk: list[dict[str, Any]]):
+        query = build_query(chunk)
+        async with get_limiter(ProviderKind.graph_db).slot():
+            session = driver.session(database=DEFAULT_DATABASE)
+            try:
+                await session.execute_write(run_chunk, query, chunk)
+            finally:
+                await session.close()
+
+    async def write_chunk_with_retry(chunk: list[dict[str, Any]]):
+        # Retry state lives on the AsyncRetrying object, so each chunk gets its own
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(max(attempts, 1)) | stop_before_deadline(),
+            wait=wait_random_exponential(multiplier=1, min=1, max=30),
+            retry=retry_if_not_exception_type(DeadlineExceededError),
+            before_sleep=lambda retry_state: logger.warning(
+                f'Retrying write of {len(chunk)} {param_name} rows '
+                f'(attempt {retry_state.attempt_number})'
+            ),
+            reraise=True,
+        )
+        await retrying(write_chunk, chunk)
+
+    for start in range(0, len(rows), chunk_size):
+        await write_chunk_with_retry(rows[start : start + chunk_size])
+
+    logger.debug(f'Wrote {len(rows)} {param_name} rows in chunks of {chunk_size}')
+
+
+def episodic_node_rows(episodic_nodes: list[EpisodicNode]) -> list[dict[str, Any]]:
     episodes = [dict(episode) for episode in episodic_nodes]
     for episode in episodes:
         episode['source'] = str(episode['source'].value)
+    return episodes
+
+
+async def create_missing_embeddings(
+    embedder: EmbedderClient, entity_nodes: list[EntityNode], entity_edges: list[EntityEdge]
+):
+    """Embed the nodes and edges without an embedding, with one create_batch call per kind."""
+    await semaphore_gather(
+        create_entity_node_embeddings(
+            embedder, [node for node in entity_nodes if node.name_embedding is None]
+        ),
+        create_entity_edge_embeddings(
+            embedder, [edge for edge in entity_edges if edge.fact_embedding is None]
+        ),
+    )
+
+
+def entity_node_rows(entity_nodes: list[EntityNode]) -> list[dict[str, Any]]:
     nodes: list[dict[str, Any]] = []
     for node in entity_nodes:
-        if node.name_embedding is None:
-            await node.generate_name_embedding(embedder)
         entity_data: dict[str, Any] = {
             'uuid': node.uuid,
             'name': node.name,
@@ -144,10 +429,12 @@ async def add_nodes_and_edges_bulk_tx(
         entity_data['labels'] = list(set(node.labels + ['Entity']))
         nodes.append(entity_data)
 
+    return nodes
+
+
+def entity_edge_rows(entity_edges: list[EntityEdge]) -> list[dict[str, Any]]:
     edges: list[dict[str, Any]] = []
     for edge in entity_edges:
-        if edge.fact_embedding is None:
-            await edge.generate_embedding(embedder)
         edge_data: dict[str, Any] = {
             'uuid': edge.uuid,
             'source_node_uuid': edge.source_node_uuid,
@@ -166,14 +453,7 @@ async def add_nodes_and_edges_bulk_tx(
         edge_data.update(edge.attributes or {})
         edges.append(edge_data)
 
-    await tx.run(EPISODIC_NODE_SAVE_BULK, episodes=episodes)
-    entity_node_save_bulk = get_entity_node_save_bulk_query(nodes, driver.provider)
-    await tx.run(entity_node_save_bulk, nodes=nodes)
-    await tx.run(
-        EPISODIC_EDGE_SAVE_BULK, episodic_edges=[edge.model_dump() for edge in episodic_edges]
-    )
-    entity_edge_save_bulk = get_entity_edge_save_bulk_query(driver.provider)
-    await tx.run(entity_edge_save_bulk, entity_edges=edges)
+    return edges
 
 
 async def extract_nodes_and_edges_bulk(
@@ -181,10 +461,18 @@ async def extract_nodes_and_edges_bulk(
     episode_tuples: list[tuple[EpisodicNode, list[EpisodicNode]]],
     entity_types: dict[str, BaseModel] | None = None,
     excluded_entity_types: list[str] | None = None,
+    reflexion_policy: ReflexionPolicy | None = None,
 ) -> tuple[list[EntityNode], list[EntityEdge], list[EpisodicEdge]]:
     extracted_nodes_bulk = await semaphore_gather(
         *[
-            extract_nodes(clients, episode, previous_episodes, entity_types, excluded_entity_types)
+            extract_nodes(
+                clients,
+                episode,
+                previous_episodes,
+                entity_types,
+                excluded_entity_types,
+                reflexion_policy,
+            )
             for episode, previous_episodes in episode_tuples
         ]
     )
@@ -203,6 +491,7 @@ async def extract_nodes_and_edges_bulk(
                 previous_episodes_list[i],
                 {},
                 episode.group_id,
+                reflexion_policy=reflexion_policy,
             )
             for i, episode in enumerate(episodes)
         ]
@@ -288,6 +577,109 @@ async def dedupe_edges_bulk(
     return edges
 
 
+async def invalidate_edges_bulk(
+    driver: GraphDriver,
+    llm_client: LLMClient,
+    edges: list[EntityEdge],
+    episodes: list[EpisodicNode],
+) -> list[EntityEdge]:
+    """
+    Invalidate the edges contradicted by a bulk batch, as adding its episodes one by one would.
+
+    The invalidation candidates of each edge are edges of the graph touching its nodes, searched
+    in batches, and edges of earlier episodes of the batch touching its nodes. Contradictions are
+    resolved concurrently and applied in the reference time order of the episodes.
+
+    Edges of the batch are updated in place. Returns the invalidated edges of the graph.
+    """
+    episode_order = {
+        episode.uuid: i
+        for i, episode in enumerate(sorted(episodes, key=lambda episode: episode.valid_at))
+    }
+    ordered_edges: list[tuple[int, EntityEdge]] = []
+    for edge in edges:
+        positions = [episode_order[uuid] for uuid in edge.episodes if uuid in episode_order]
+        if positions:
+            ordered_edges.append((max(positions), edge))
+    ordered_edges.sort(key=lambda item: item[0])
+    if len(ordered_edges) == 0:
+        return []
+
+    batch_edges = [edge for _, edge in ordered_edges]
+    batch_uuids = {edge.uuid for edge in batch_edges}
+    edge_chunks = [batch_edges[i : i + CHUNK_SIZE] for i in range(0, len(batch_edges), CHUNK_SIZE)]
+    candidate_chunks: list[list[list[EntityEdge]]] = list(
+        await semaphore_gather(
+            *[
+                get_edge_invalidation_candidates(
+                    driver, edge_chunk, SearchFilters(), INVALIDATION_MIN_SCORE
+                )
+                for edge_chunk in edge_chunks
+            ]
+        )
+    )
+
+    # The same graph edge is found for several batch edges. Use one object for it, so each
+    # invalidation sees the ones applied before it.
+    graph_edges: dict[str, EntityEdge] = {}
+    candidates_list: list[list[EntityEdge]] = []
+    for i, (position, edge) in enumerate(ordered_edges):
+        graph_candidates = candidate_chunks[i // CHUNK_SIZE][i % CHUNK_SIZE]
+        candidates = [
+            graph_edges.setdefault(candidate.uuid, candidate)
+            for candidate in graph_candidates
+            if candidate.uuid not in batch_uuids
+        ]
+        candidates += [
+            other
+            for other_position, other in ordered_edges[:i]
+            if other_position < position
+            and edges_share_node(edge, other)
+            and fact_similarity(edge, other) > INVALIDATION_MIN_SCORE
+        ]
+        candidates_list.append(candidates)
+
+    async def find_contradictions(
+        edge: EntityEdge, candidates: list[EntityEdge]
+    ) -> list[EntityEdge]:
+        if len(candidates) == 0:
+            return []
+        return await get_edge_contradictions(llm_client, edge, candidates)
+
+    contradictions: list[list[EntityEdge]] = list(
+        await semaphore_gather(
+            *[
+                find_contradictions(edge, candidates)
+                for edge, candidates in zip(batch_edges, candidates_list, strict=True)
+            ]
+        )
+    )
+
+    invalidated_edges: dict[str, EntityEdge] = {}
+    for edge, contradicted_edges in zip(batch_edges, contradictions, strict=True):
+        for invalidated_edge in apply_edge_invalidation(edge, contradicted_edges):
+            if invalidated_edge.uuid not in batch_uuids:
+                invalidated_edges[invalidated_edge.uuid] = invalidated_edge
+
+    logger.debug(f'Invalidated {len(invalidated_edges)} edges of the graph')
+
+    return list(invalidated_edges.values())
+
+
+def edges_share_node(edge: EntityEdge, other: EntityEdge) -> bool:
+    return bool(
+        {edge.source_node_uuid, edge.target_node_uuid}
+        & {other.source_node_uuid, other.target_node_uuid}
+    )
+
+
+def fact_similarity(edge: EntityEdge, other: EntityEdge) -> float:
+    if not edge.fact_embedding or not other.fact_embedding:
+        return 0.0
+    norm = np.linalg.norm(edge.fact_embedding) * np.linalg.norm(other.fact_embedding)
+    return float(np.dot(edge.fact_embedding, other.fact_embedding) / norm) if norm else 0.0
+
+
 def node_name_match(nodes: list[EntityNode]) -> tuple[list[EntityNode], dict[str, str]]:
     uuid_map: dict[str, str] = {}
     name_map: dict[str, EntityNode] = {}
@@ -302,99 +694,160 @@ def node_name_match(nodes: list[EntityNode]) -> tuple[list[EntityNode], dict[str
 
 
 async def compress_nodes(
-    llm_client: LLMClient, nodes: list[EntityNode], uuid_map: dict[str, str]
+    llm_client: LLMClient,
+    nodes: list[EntityNode],
+    uuid_map: dict[str, str],
+    min_score: float = DEFAULT_MIN_SCORE,
+    max_passes: int = MAX_COMPRESS_PASSES,
 ) -> tuple[list[EntityNode], dict[str, str]]:
     # We want to first compress the nodes by deduplicating nodes across each of the episodes added in bulk
-    if len(nodes) == 0:
-        return nodes, uuid_map
-
-    # Our approach involves us deduplicating chunks of nodes in parallel.
-    # We want n chunks of size n so that n ** 2 == len(nodes).
-    # We want chunk sizes to be at least 10 for optimizing LLM processing time
-    chunk_size = max(int(sqrt(len(nodes))), CHUNK_SIZE)
-
-    # First calculate similarity scores between nodes
-    similarity_scores: list[tuple[int, int, float]] = [
-        (i, j, dot(n.name_embedding or [], m.name_embedding or []))
-        for i, n in enumerate(nodes)
-        for j, m in enumerate(nodes[:i])
-    ]
-
-    # We now sort by semantic similarity
-    similarity_scores.sort(key=lambda score_tuple: score_tuple[2])
-
-    # initialize our chunks based on chunk size
-    node_chunks: list[list[EntityNode]] = [[] for _ in range(ceil(len(nodes) / chunk_size))]
-
-    # Draft the most similar nodes into the same chunk
-    while len(similarity_scores) > 0:
-        i, j, _ = similarity_scores.pop()
-        # determine if any of the nodes have already been drafted into a chunk
-        n = nodes[i]
-        m = nodes[j]
-        # make sure the shortest chunks get preference
-        node_chunks.sort(reverse=True, key=lambda chunk: len(chunk))
-
-        n_chunk = max([i if n in chunk else -1 for i, chunk in enumerate(node_chunks)])
-        m_chunk = max([i if m in chunk else -1 for i, chunk in enumerate(node_chunks)])
-
-        # both nodes already in a chunk
-        if n_chunk > -1 and m_chunk > -1:
-            continue
+    extended_map = dict(uuid_map)
+    for _ in range(max_passes):
+        # Only nodes with a similar name can be duplicates, the others skip the LLM
+        clusters = [
+            cluster
+            for cluster in similarity_clusters([node.name_embedding for node in nodes], min_score)
+            if len(cluster) > 1
+        ]
+        if len(clusters) == 0:
+            break
 
-        # n has a chunk and that chunk is not full
-        elif n_chunk > -1 and len(node_chunks[n_chunk]) < chunk_size:
-            # put m in the same chunk as n
-            node_chunks[n_chunk].append(m)
+        node_chunks = [
+            [nodes[i] for i in chunk] for chunk in pack_clusters(clusters, MAX_DEDUPE_CHUNK_SIZE)
+        ]
+        results = await semaphore_gather(
+            *[dedupe_node_list(llm_client, chunk) for chunk in node_chunks]
+        )
 
-        # m has a chunk and that chunk is not full
-        elif m_chunk > -1 and len(node_chunks[m_chunk]) < chunk_size:
-            # put n in the same chunk as m
-            node_chunks[m_chunk].append(n)
+        deduped_uuids = {node.uuid for chunk in node_chunks for node in chunk}
+        kept_uuids: set[str] = set()
+        for node_chunk, uuid_map_chunk in results:
+            kept_uuids.update(node.uuid for node in node_chunk)
+            extended_map.update(uuid_map_chunk)
 
-        # neither node has a chunk or the chunk is full
-        else:
-            # add both nodes to the shortest chunk
-            node_chunks[-1].extend([n, m])
+        compressed_nodes = [
+            node for node in nodes if node.uuid not in deduped_uuids or node.uuid in kept_uuids
+        ]
+        # Stop once a pass finds no more duplicates
+        if len(compressed_nodes) == len(nodes):
+            break
+        nodes = compressed_nodes
 
-    results = await semaphore_gather(
-        *[dedupe_node_list(llm_client, chunk) for chunk in node_chunks]
-    )
+    return nodes, compress_uuid_map(extended_map)
 
-    extended_map = dict(uuid_map)
-    compressed_nodes: list[EntityNode] = []
-    for node_chunk, uuid_map_chunk in results:
-        compressed_nodes += node_chunk
-        extended_map.update(uuid_map_chunk)
 
-    # Check if we have removed all duplicates
-    if len(compressed_nodes) == len(nodes):
-        compressed_uuid_map = compress_uuid_map(extended_map)
-        return compressed_nodes, compressed_uuid_map
+async def compress_edges(
+    llm_client: LLMClient,
+    edges: list[EntityEdge],
+    min_score: float = DEFAULT_MIN_SCORE,
+    max_passes: int = MAX_COMPRESS_PASSES,
+) -> list[EntityEdge]:
+    # We drop loop edges
+    edges = [edge for edge in edges if edge.source_node_uuid != edge.target_node_uuid]
+    for _ in range(max_passes):
+        # We only want to dedupe similar edges that are between the same pair of nodes
+        edge_chunks: list[list[EntityEdge]] = []
+        for pair_edges in chunk_edges_by_nodes(edges):
+            clusters = [
+                cluster
+                for cluster in similarity_clusters(
+                    [edge.fact_embedding for edge in pair_edges], min_score
+                )
+                if len(cluster) > 1
+            ]
+            edge_chunks += [
+                [pair_edges[i] for i in chunk]
+                for chunk in pack_clusters(clusters, MAX_DEDUPE_CHUNK_SIZE)
+            ]
+        if len(edge_chunks) == 0:
+            break
 
-    return await compress_nodes(llm_client, compressed_nodes, extended_map)
+        results = await semaphore_gather(
+            *[dedupe_edge_list(llm_client, chunk) for chunk in edge_chunks]
+        )
 
+        deduped_uuids = {edge.uuid for chunk in edge_chunks for edge in chunk}
+        kept_uuids = {edge.uuid for edge_chunk in results for edge in edge_chunk}
+        compressed_edges = [
+            edge for edge in edges if edge.uuid not in deduped_uuids or edge.uuid in kept_uuids
+        ]
+        # Stop once a pass finds no more duplicates
+        if len(compressed_edges) == len(edges):
+            break
+        edges = compressed_edges
 
-async def compress_edges(llm_client: LLMClient, edges: list[EntityEdge]) -> list[EntityEdge]:
-    if len(edges) == 0:
-        return edges
-    # We only want to dedupe edges that are between the same pair of nodes
-    # We build a map of the edges based on their source and target nodes.
-    edge_chunks = chunk_edges_by_nodes(edges)
+    return edges
 
-    results = await semaphore_gather(
-        *[dedupe_edge_list(llm_client, chunk) for chunk in edge_chunks]
-    )
 
-    compressed_edges: list[EntityEdge] = []
-    for edge_chunk in results:
-        compressed_edges += edge_chunk
+def similarity_clusters(
+    embeddings: list[list[float] | None],
+    min_score: float,
+    block_size: int = SIMILARITY_BLOCK_SIZE,
+) -> list[list[int]]:
+    """
+    Group the indices of embeddings into clusters of items with a cosine similarity of at least
+    min_score, directly or through other items of the cluster.
+
+    The similarity matrix is computed block_size rows at a time, so memory grows with
+    block_size * len(embeddings) rather than its square. Items without an embedding cannot be
+    compared and are clustered together.
+    """
+    parent = list(range(len(embeddings)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int):
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    embedded = [i for i, embedding in enumerate(embeddings) if embedding]
+    missing = [i for i, embedding in enumerate(embeddings) if not embedding]
+    for i in missing[1:]:
+        union(missing[0], i)
+
+    if len(embedded) > 1:
+        matrix = np.asarray([embeddings[i] for i in embedded], dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1, norms)
+        for start in range(0, len(embedded), block_size):
+            scores = matrix[start : start + block_size] @ matrix.T
+            # Each pair once: only columns after the row's own item
+            rows, cols = np.nonzero(np.triu(scores >= min_score, k=start + 1))
+            for row, col in zip(rows.tolist(), cols.tolist(), strict=True):
+                union(embedded[start + row], embedded[col])
+
+    clusters: dict[int, list[int]] = defaultdict(list)
+    for i in range(len(embeddings)):
+        clusters[find(i)].append(i)
+
+    return list(clusters.values())
+
+
+def pack_clusters(clusters: list[list[int]], max_size: int) -> list[list[int]]:
+    """
+    Pack clusters into chunks of at most max_size items, keeping each cluster that fits in a chunk
+    together. Larger clusters are split into chunks of max_size items.
+    """
+    chunks: list[list[int]] = []
+    current: list[int] = []
+    for cluster in sorted(clusters, key=len, reverse=True):
+        if len(cluster) > max_size:
+            chunks += [cluster[i : i + max_size] for i in range(0, len(cluster), max_size)]
+            continue
+        if len(current) + len(cluster) > max_size:
+            chunks.append(current)
+            current = []
+        current += cluster
 
-    # Check if we have removed all duplicates
-    if len(compressed_edges) == len(edges):
-        return compressed_edges
+    if current:
+        chunks.append(current)
 
-    return await compress_edges(llm_client, compressed_edges)
+    return chunks
 
 
 def compress_uuid_map(uuid_map: dict[str, str]) -> dict[str, str]:
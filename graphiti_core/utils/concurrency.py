@@ -0,0 +1,445 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+from collections import Counter, deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager, suppress
+from contextvars import ContextVar
+from enum import Enum
+from time import monotonic
+from typing import Any, ParamSpec, TypeVar
+
+import httpx
+from pydantic import BaseModel, Field
+
+from graphiti_core.errors import DeadlineExceededError
+from graphiti_core.helpers import SEMAPHORE_LIMIT
+from graphiti_core.utils.deadline import enforce_deadline
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest sample in the latency moving average
+LATENCY_EWMA_ALPHA = 0.2
+# Per-call growth of the latency baseline, so it follows slow drifts in provider latency
+LATENCY_BASELINE_DRIFT = 0.01
+RATE_LIMIT_STATUS_CODES = frozenset({429})
+# graphiti_core.llm_client.errors and the openai, anthropic and groq SDKs all use this name
+RATE_LIMIT_ERROR_NAMES = frozenset({'RateLimitError'})
+
+
+P = ParamSpec('P')
+T = TypeVar('T')
+
+
+class ProviderKind(Enum):
+    llm = 'llm'
+    embedder = 'embedder'
+    reranker = 'reranker'
+    graph_db = 'graph_db'
+
+
+class Priority(Enum):
+    """
+    Priority class of the work a provider call belongs to.
+
+    interactive: latency-sensitive reads such as search.
+    ingestion: adding episodes and triplets.
+    maintenance: index, community and cleanup work that can wait.
+    """
+
+    interactive = 'interactive'
+    ingestion = 'ingestion'
+    maintenance = 'maintenance'
+
+
+DEFAULT_PRIORITY = Priority.ingestion
+DEFAULT_PRIORITY_WEIGHTS: dict[Priority, float] = {
+    Priority.interactive: 8.0,
+    Priority.ingestion: 3.0,
+    Priority.maintenance: 1.0,
+}
+
+_priority: ContextVar[Priority | None] = ContextVar('graphiti_priority', default=None)
+
+
+def current_priority() -> Priority:
+    return _priority.get() or DEFAULT_PRIORITY
+
+
+@contextmanager
+def priority(value: Priority) -> Iterator[None]:
+    """Run the provider calls made in this context, and in tasks started from it, at a priority."""
+    token = _priority.set(value)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def with_priority(
+    value: Priority,
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    """
+    Decorate a coroutine function so its provider calls run at a priority.
+
+    A priority set by the caller is kept, so work started from an explicit priority context keeps
+    that priority.
+    """
+
+    def decorator(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            if _priority.get() is not None:
+                return await func(*args, **kwargs)
+            with priority(value):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Return True if an error reports that the provider is throttling requests."""
+    if any(cls.__name__ in RATE_LIMIT_ERROR_NAMES for cls in type(error).__mro__):
+        return True
+
+    for source in (error, getattr(error, 'response', None)):
+        status = getattr(source, 'status_code', None) or getattr(source, 'code', None)
+        if status in RATE_LIMIT_STATUS_CODES:
+            return True
+
+    return False
+
+
+def is_server_or_retry_error(exception: BaseException) -> bool:
+    """Return True for rate limits, unparseable responses and HTTP 5xx errors."""
+    if is_rate_limit_error(exception) or isinstance(exception, json.decoder.JSONDecodeError):
+        return True
+
+    return (
+        isinstance(exception, httpx.HTTPStatusError) and 500 <= exception.response.status_code < 600
+    )
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit shared by every request to one provider, adjusted from its responses.
+
+    The limit follows additive increase, multiplicative decrease: while the limit is in full use,
+    calls succeed and their latency stays within latency_tolerance of the best observed latency, it
+    grows by roughly `increase` per round of `limit` calls. A rate limit error (RateLimitError or an
+    HTTP 429) cuts it by decrease_factor, at most once per decrease_interval seconds so that one
+    burst of throttled requests counts as a single signal.
+
+    When calls have to wait, free slots are shared between priority classes in proportion to their
+    weights (stride scheduling), so a large ingestion keeps making progress without starving
+    interactive searches, and a class that was idle does not bank credit while it waited.
+
+    Waiters are plain futures created on the running loop when they are needed, so one limiter can
+    be shared by every client of a process, across event loops that run one after the other.
+    """
+
+    def __init__(
+        self,
+        name: str = '',
+        initial_limit: int = SEMAPHORE_LIMIT,
+        min_limit: int = 1,
+        max_limit: int | None = None,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        decrease_interval: float = 1.0,
+        latency_tolerance: float = 2.0,
+        priority_weights: dict[Priority, float] | None = None,
+    ):
+        if min_limit < 1:
+            raise ValueError('min_limit must be at least 1')
+        if not 0 < decrease_factor < 1:
+            raise ValueError('decrease_factor must be between 0 and 1')
+        weights = {**DEFAULT_PRIORITY_WEIGHTS, **(priority_weights or {})}
+        if any(weight <= 0 for weight in weights.values()):
+            raise ValueError('priority weights must be positive')
+
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit if max_limit is not None else initial_limit * 4, min_limit)
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.decrease_interval = decrease_interval
+        self.latency_tolerance = latency_tolerance
+        self.priority_weights = weights
+
+        self._limit = float(min(max(initial_limit, min_limit), self.max_limit))
+        self._in_flight = 0
+        self._waiters: dict[Priority, deque[asyncio.Future[None]]] = {p: deque() for p in Priority}
+        # Stride scheduling state: the next pass of each class and the pass last served
+        self._pass: dict[Priority, float] = {p: 0.0 for p in Priority}
+        self._current_pass = 0.0
+        self._last_decrease = float('-inf')
+        self._latency: float | None = None
+        self._latency_baseline: float | None = None
+        self.reset_stats()
+
+    @property
+    def limit(self) -> int:
+        return max(int(self._limit), self.min_limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    async def acquire(self, priority_class: Priority | None = None):
+        priority_class = priority_class or current_priority()
+        if self._in_flight < self.limit and not self.waiting:
+            self._in_flight += 1
+            self.acquired[priority_class.value] += 1
+            return
+
+        waiters = self._waiters[priority_class]
+        if not waiters:
+            self._pass[priority_class] = max(self._pass[priority_class], self._current_pass)
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        waiters.append(future)
+        self.waited[priority_class.value] += 1
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just before the waiter was cancelled
+                self.release()
+            else:
+                with suppress(ValueError):
+                    waiters.remove(future)
+            raise
+
+    def release(self):
+        self._in_flight -= 1
+        self._wake_waiters()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Hold one unit of concurrency for a provider call and feed its outcome back.
+
+        Waiting for the slot and the call itself are bounded by the current deadline.
+        """
+        async with enforce_deadline():
+            await self.acquire()
+            start = monotonic()
+            try:
+                yield
+            except DeadlineExceededError:
+                raise
+            except Exception as e:
+                self.record_error(e)
+                raise
+            else:
+                self.record_success(monotonic() - start)
+            finally:
+                self.release()
+
+    def record_success(self, latency: float):
+        self.successes += 1
+        if self._latency is None or self._latency_baseline is None:
+            self._latency = latency
+            self._latency_baseline = latency
+        else:
+            self._latency = LATENCY_EWMA_ALPHA * latency + (1 - LATENCY_EWMA_ALPHA) * self._latency
+            self._latency_baseline = min(
+                self._latency, self._latency_baseline * (1 + LATENCY_BASELINE_DRIFT)
+            )
+
+        if self._latency > self._latency_baseline * self.latency_tolerance:
+            return
+        # Only grow when the current limit is the bottleneck, not while callers leave it unused
+        if self._in_flight < self.limit and not self.waiting:
+            return
+        if self._limit >= self.max_limit:
+            return
+
+        previous = self.limit
+        self._limit = min(self._limit + self.increase / self._limit, float(self.max_limit))
+        if self.limit > previous:
+            self.increases += 1
+            self._wake_waiters()
+
+    def record_error(self, error: BaseException):
+        if not is_rate_limit_error(error):
+            self.errors += 1
+            return
+
+        self.rate_limited += 1
+        now = monotonic()
+        if now - self._last_decrease < self.decrease_interval:
+            return
+        self._last_decrease = now
+
+        previous = self.limit
+        self._limit = max(self._limit * self.decrease_factor, float(self.min_limit))
+        if self.limit < previous:
+            self.decreases += 1
+            logger.warning(
+                f'Rate limited by {self.name or "provider"}, reducing concurrency from '
+                f'{previous} to {self.limit}'
+            )
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            'limit': self.limit,
+            'in_flight': self._in_flight,
+            'waiting': self.waiting,
+            'successes': self.successes,
+            'errors': self.errors,
+            'rate_limited': self.rate_limited,
+            'increases': self.increases,
+            'decreases': self.decreases,
+            'acquired': dict(self.acquired),
+            'waited': dict(self.waited),
+            'latency_ms': self._latency * 1000 if self._latency is not None else None,
+        }
+
+    def reset_stats(self):
+        self.successes = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.increases = 0
+        self.decreases = 0
+        self.acquired: Counter[str] = Counter()
+        self.waited: Counter[str] = Counter()
+
+    def _wake_waiters(self):
+        while self._in_flight < self.limit:
+            ready = [p for p, waiters in self._waiters.items() if waiters]
+            if not ready:
+                return
+            priority_class = min(ready, key=lambda p: self._pass[p])
+            future = self._waiters[priority_class].popleft()
+            if future.done():
+                continue
+            self._in_flight += 1
+            self.acquired[priority_class.value] += 1
+            self._current_pass = self._pass[priority_class]
+            self._pass[priority_class] += 1 / self.priority_weights[priority_class]
+            future.set_result(None)
+
+
+async def hedged(call: Callable[[], Awaitable[T]], hedge_after: float | None) -> T:
+    """
+    Await call(), starting a duplicate call if the first has not finished after hedge_after seconds.
+
+    The first call to succeed wins and the other is cancelled. If both fail, the error of the call
+    that failed last is raised.
+    """
+    if hedge_after is None:
+        return await call()
+
+    first = asyncio.ensure_future(call())
+    pending = {first}
+    error: BaseException | None = None
+    try:
+        done, pending = await asyncio.wait(pending, timeout=hedge_after)
+        if done:
+            return first.result()
+
+        logger.debug(f'Hedging call still running after {hedge_after * 1000:.0f} ms')
+        pending = {first, asyncio.ensure_future(call())}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task_error = task.exception()
+                if task_error is None:
+                    return task.result()
+                error = task_error
+    finally:
+        # Also reached when the caller is cancelled while a call is still running
+        for task in pending:
+            task.cancel()
+
+    assert error is not None
+    raise error
+
+
+_limiters: dict[ProviderKind, AdaptiveLimiter] = {}
+
+
+def get_limiter(kind: ProviderKind) -> AdaptiveLimiter:
+    """Return the process-wide limiter for a kind of provider, creating it on first use."""
+    limiter = _limiters.get(kind)
+    if limiter is None:
+        limiter = AdaptiveLimiter(name=kind.value)
+        _limiters[kind] = limiter
+    return limiter
+
+
+def set_limiter(kind: ProviderKind, limiter: AdaptiveLimiter):
+    """Replace the limiter for a kind of provider, e.g. to match a known quota."""
+    _limiters[kind] = limiter
+
+
+def limiter_stats() -> dict[str, dict[str, Any]]:
+    return {kind.value: limiter.snapshot() for kind, limiter in _limiters.items()}
+
+
+class PoolConfig(BaseModel):
+    initial_limit: int = Field(
+        default=SEMAPHORE_LIMIT, description='Concurrent calls allowed before any feedback'
+    )
+    min_limit: int = Field(default=1, description='Lower bound when the limit is cut')
+    max_limit: int | None = Field(
+        default=None, description='Upper bound for the limit. Defaults to 4 x initial_limit'
+    )
+
+
+class ConcurrencyConfig(BaseModel):
+    """
+    Process-wide concurrency budget for provider calls, one adaptive pool per kind of provider.
+
+    Calls made by Graphiti.search run as interactive work, add_episode, add_episode_bulk and
+    add_triplet as ingestion, and index, community and removal operations as maintenance. Waiting
+    calls are admitted in proportion to priority_weights.
+    """
+
+    llm: PoolConfig = Field(default_factory=PoolConfig)
+    embedder: PoolConfig = Field(default_factory=PoolConfig)
+    reranker: PoolConfig = Field(default_factory=PoolConfig)
+    graph_db: PoolConfig = Field(default_factory=PoolConfig)
+    priority_weights: dict[Priority, float] = Field(
+        default_factory=lambda: dict(DEFAULT_PRIORITY_WEIGHTS)
+    )
+
+
+def configure_limiters(config: ConcurrencyConfig):
+    """Replace the process-wide limiters with pools built from a concurrency config."""
+    for kind in ProviderKind:
+        pool: PoolConfig = getattr(config, kind.value)
+        set_limiter(
+            kind,
+            AdaptiveLimiter(
+                name=kind.value,
+                initial_limit=pool.initial_limit,
+                min_limit=pool.min_limit,
+                max_limit=pool.max_limit,
+                priority_weights=config.priority_weights,
+            ),
+        )
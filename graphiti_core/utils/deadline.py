@@ -0,0 +1,113 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from time import monotonic
+
+from tenacity import RetryCallState
+from tenacity.stop import stop_base
+
+from graphiti_core.errors import DeadlineExceededError
+
+# Absolute deadline on the monotonic clock of the current operation
+_deadline: ContextVar[float | None] = ContextVar('graphiti_deadline', default=None)
+
+
+@contextmanager
+def deadline(timeout: float | None) -> Iterator[None]:
+    """
+    Bound the provider calls made in this context, and in tasks started from it, to timeout seconds.
+
+    A nested deadline can shorten but never extend the deadline it runs in. A timeout of None keeps
+    the current deadline, if any.
+    """
+    if timeout is None:
+        yield
+        return
+
+    expires_at = monotonic() + timeout
+    current = _deadline.get()
+    if current is not None:
+        expires_at = min(expires_at, current)
+
+    token = _deadline.set(expires_at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> float | None:
+    """Seconds left before the current deadline, or None when there is no deadline."""
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - monotonic()
+
+
+def deadline_near(margin: float) -> bool:
+    """Return True if less than margin seconds are left before the current deadline."""
+    remaining = remaining_time()
+    return remaining is not None and remaining < margin
+
+
+@asynccontextmanager
+async def enforce_deadline() -> AsyncIterator[None]:
+    """
+    Cancel the enclosed block when the current deadline passes, raising DeadlineExceededError.
+
+    Cancellation of the surrounding task for any other reason is passed through unchanged.
+    """
+    remaining = remaining_time()
+    if remaining is None:
+        yield
+        return
+    if remaining <= 0:
+        raise DeadlineExceededError()
+
+    task = asyncio.current_task()
+    assert task is not None
+    expired = False
+
+    def expire():
+        nonlocal expired
+        expired = True
+        task.cancel()
+
+    handle = asyncio.get_running_loop().call_later(remaining, expire)
+    try:
+        yield
+    except asyncio.CancelledError as e:
+        if not expired:
+            raise
+        # Only undo the cancellation this deadline requested
+        uncancel = getattr(task, 'uncancel', None)
+        if uncancel is not None:
+            uncancel()
+        raise DeadlineExceededError() from e
+    finally:
+        handle.cancel()
+
+
+class stop_before_deadline(stop_base):
+    """Tenacity stop condition: give up when the next backoff would end past the deadline."""
+
+    def __call__(self, retry_state: RetryCallState) -> bool:
+        remaining = remaining_time()
+        return remaining is not None and remaining <= retry_state.upcoming_sleep
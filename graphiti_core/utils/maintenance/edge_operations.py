@@ -15,6 +15,7 @@ limitations under the License.
 """
 
 import logging
+from collections.abc import Sequence
 from datetime import datetime
 from time import time
 
@@ -29,7 +30,7 @@ from graphiti_core.edges import (
     create_entity_edge_embeddings,
 )
 from graphiti_core.graphiti_types import GraphitiClients
-from graphiti_core.helpers import DEFAULT_DATABASE, MAX_REFLEXION_ITERATIONS, semaphore_gather
+from graphiti_core.helpers import DEFAULT_DATABASE, semaphore_gather
 from graphiti_core.llm_client import LLMClient
 from graphiti_core.llm_client.config import ModelSize
 from graphiti_core.nodes import CommunityNode, EntityNode, EpisodicNode
@@ -39,6 +40,15 @@ from graphiti_core.prompts.extract_edges import ExtractedEdges, MissingFacts
 from graphiti_core.search.search_filters import SearchFilters
 from graphiti_core.search.search_utils import get_edge_invalidation_candidates, get_relevant_edges
 from graphiti_core.utils.datetime_utils import ensure_utc, utc_now
+from graphiti_core.utils.maintenance.reflexion_policy import (
+    ReflexionPolicy,
+    estimate_reflexion_tokens,
+    reflexion_stats,
+)
+from graphiti_core.utils.ontology_utils.ontology_compiler import (
+    compile_ontology,
+    get_edge_types_resolution_context,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -103,6 +113,73 @@ def build_community_edges(
     return edges
 
 
+def build_edges_from_extraction(
+    edges_data: list[dict],
+    nodes: Sequence[EntityNode | None],
+    episode: EpisodicNode,
+    group_id: str,
+) -> list[EntityEdge]:
+    """
+    Convert raw edges returned by the LLM into EntityEdge objects.
+
+    Entity ids in the raw edges index into nodes. A None entry in nodes marks an entity that was
+    dropped after extraction, and edges pointing at it are skipped.
+    """
+    edges: list[EntityEdge] = []
+    for edge_data in edges_data:
+        # Validate Edge Date information
+        valid_at = edge_data.get('valid_at', None)
+        invalid_at = edge_data.get('invalid_at', None)
+        valid_at_datetime = None
+        invalid_at_datetime = None
+
+        source_node_idx = edge_data.get('source_entity_id', -1)
+        target_node_idx = edge_data.get('target_entity_id', -1)
+        if not (-1 < source_node_idx < len(nodes) and -1 < target_node_idx < len(nodes)):
+            logger.warning(
+                f'WARNING: source or target node not filled {edge_data.get("edge_name")}. source_node_uuid: {source_node_idx} and target_node_uuid: {target_node_idx} '
+            )
+            continue
+        source_node = nodes[source_node_idx]
+        target_node = nodes[target_node_idx]
+        if source_node is None or target_node is None:
+            logger.debug(f'Skipping edge with excluded endpoint: {edge_data.get("fact", "")}')
+            continue
+
+        if valid_at:
+            try:
+                valid_at_datetime = ensure_utc(
+                    datetime.fromisoformat(valid_at.replace('Z', '+00:00'))
+                )
+            except ValueError as e:
+                logger.warning(f'WARNING: Error parsing valid_at date: {e}. Input: {valid_at}')
+
+        if invalid_at:
+            try:
+                invalid_at_datetime = ensure_utc(
+                    datetime.fromisoformat(invalid_at.replace('Z', '+00:00'))
+                )
+            except ValueError as e:
+                logger.warning(f'WARNING: Error parsing invalid_at date: {e}. Input: {invalid_at}')
+        edge = EntityEdge(
+            source_node_uuid=source_node.uuid,
+            target_node_uuid=target_node.uuid,
+            name=edge_data.get('relation_type', ''),
+            group_id=group_id,
+            fact=edge_data.get('fact', ''),
+            episodes=[episode.uuid],
+            created_at=utc_now(),
+            valid_at=valid_at_datetime,
+            invalid_at=invalid_at_datetime,
+        )
+        edges.append(edge)
+        logger.debug(
+            f'Created new edge: {edge.name} from (UUID: {edge.source_node_uuid}) to (UUID: {edge.target_node_uuid})'
+        )
+
+    return edges
+
+
 async def extract_edges(
     clients: GraphitiClients,
     episode: EpisodicNode,
@@ -111,30 +188,15 @@ async def extract_edges(
     edge_type_map: dict[tuple[str, str], list[str]],
     group_id: str = '',
     edge_types: dict[str, BaseModel] | None = None,
+    reflexion_policy: ReflexionPolicy | None = None,
 ) -> list[EntityEdge]:
     start = time()
 
     extract_edges_max_tokens = 16384
     llm_client = clients.llm_client
 
-    edge_type_signature_map: dict[str, tuple[str, str]] = {
-        edge_type: signature
-        for signature, edge_types in edge_type_map.items()
-        for edge_type in edge_types
-    }
-
-    edge_types_context = (
-        [
-            {
-                'fact_type_name': type_name,
-                'fact_type_signature': edge_type_signature_map.get(type_name, ('Entity', 'Entity')),
-                'fact_type_description': type_model.__doc__,
-            }
-            for type_name, type_model in edge_types.items()
-        ]
-        if edge_types is not None
-        else []
-    )
+    ontology = compile_ontology(edge_types=edge_types, edge_type_map=edge_type_map)
+    edge_types_context = ontology.edge_types_context
 
     # Prepare context for LLM
     context = {
@@ -149,9 +211,13 @@ async def extract_edges(
         'custom_prompt': '',
     }
 
-    facts_missed = True
-    reflexion_iterations = 0
-    while facts_missed and reflexion_iterations <= MAX_REFLEXION_ITERATIONS:
+    policy = reflexion_policy if reflexion_policy is not None else ReflexionPolicy()
+    max_reflexion_iterations = policy.iterations_for(episode)
+    reflexion_tokens = 0
+    first_pass_count = 0
+
+    edges_data: list[dict] = []
+    for iteration in range(max_reflexion_iterations + 1):
         llm_response = await llm_client.generate_response(
             prompt_library.extract_edges.edge(context),
             response_model=ExtractedEdges,
@@ -161,23 +227,38 @@ async def extract_edges(
 
         context['extracted_facts'] = [edge_data.get('fact', '') for edge_data in edges_data]
 
-        reflexion_iterations += 1
-        if reflexion_iterations < MAX_REFLEXION_ITERATIONS:
-            reflexion_response = await llm_client.generate_response(
-                prompt_library.extract_edges.reflexion(context),
-                response_model=MissingFacts,
-                max_tokens=extract_edges_max_tokens,
-            )
+        if iteration == 0:
+            first_pass_count = len(edges_data)
 
-            missing_facts = reflexion_response.get('missing_facts', [])
+        if iteration >= max_reflexion_iterations:
+            break
 
-            custom_prompt = 'The following facts were missed in a previous extraction: '
-            for fact in missing_facts:
-                custom_prompt += f'\n{fact},'
+        estimated_tokens = estimate_reflexion_tokens(
+            episode, previous_episodes, context['extracted_facts'] + [n.name for n in nodes]
+        )
+        if not policy.should_reflect(
+            iteration, first_pass_count, reflexion_tokens, estimated_tokens
+        ):
+            break
+
+        reflexion_response = await llm_client.generate_response(
+            prompt_library.extract_edges.reflexion(context),
+            response_model=MissingFacts,
+            max_tokens=extract_edges_max_tokens,
+        )
+
+        missing_facts = reflexion_response.get('missing_facts', [])
+        reflexion_tokens += estimated_tokens
+        reflexion_stats.record_call(estimated_tokens, len(missing_facts))
 
-            context['custom_prompt'] = custom_prompt
+        if len(missing_facts) == 0:
+            break
 
-            facts_missed = len(missing_facts) != 0
+        custom_prompt = 'The following facts were missed in a previous extraction: '
+        for fact in missing_facts:
+            custom_prompt += f'\n{fact},'
+
+        context['custom_prompt'] = custom_prompt
 
     end = time()
     logger.debug(f'Extracted new edges: {edges_data} in {(end - start) * 1000} ms')
@@ -186,54 +267,7 @@ async def extract_edges(
         return []
 
     # Convert the extracted data into EntityEdge objects
-    edges = []
-    for edge_data in edges_data:
-        # Validate Edge Date information
-        valid_at = edge_data.get('valid_at', None)
-        invalid_at = edge_data.get('invalid_at', None)
-        valid_at_datetime = None
-        invalid_at_datetime = None
-
-        source_node_idx = edge_data.get('source_entity_id', -1)
-        target_node_idx = edge_data.get('target_entity_id', -1)
-        if not (-1 < source_node_idx < len(nodes) and -1 < target_node_idx < len(nodes)):
-            logger.warning(
-                f'WARNING: source or target node not filled {edge_data.get("edge_name")}. source_node_uuid: {source_node_idx} and target_node_uuid: {target_node_idx} '
-            )
-            continue
-        source_node_uuid = nodes[source_node_idx].uuid
-        target_node_uuid = nodes[edge_data.get('target_entity_id')].uuid
-
-        if valid_at:
-            try:
-                valid_at_datetime = ensure_utc(
-                    datetime.fromisoformat(valid_at.replace('Z', '+00:00'))
-                )
-            except ValueError as e:
-                logger.warning(f'WARNING: Error parsing valid_at date: {e}. Input: {valid_at}')
-
-        if invalid_at:
-            try:
-                invalid_at_datetime = ensure_utc(
-                    datetime.fromisoformat(invalid_at.replace('Z', '+00:00'))
-                )
-            except ValueError as e:
-                logger.warning(f'WARNING: Error parsing invalid_at date: {e}. Input: {invalid_at}')
-        edge = EntityEdge(
-            source_node_uuid=source_node_uuid,
-            target_node_uuid=target_node_uuid,
-            name=edge_data.get('relation_type', ''),
-            group_id=group_id,
-            fact=edge_data.get('fact', ''),
-            episodes=[episode.uuid],
-            created_at=utc_now(),
-            valid_at=valid_at_datetime,
-            invalid_at=invalid_at_datetime,
-        )
-        edges.append(edge)
-        logger.debug(
-            f'Created new edge: {edge.name} from (UUID: {edge.source_node_uuid}) to (UUID: {edge.target_node_uuid})'
-        )
+    edges = build_edges_from_extraction(edges_data, nodes, episode, group_id)
 
     logger.debug(f'Extracted edges: {[(e.name, e.uuid) for e in edges]}')
 
@@ -312,27 +346,14 @@ async def resolve_extracted_edges(
     uuid_entity_map: dict[str, EntityNode] = {entity.uuid: entity for entity in entities}
 
     # Determine which edge types are relevant for each edge
-    edge_types_lst: list[dict[str, BaseModel]] = []
-    for extracted_edge in extracted_edges:
-        source_node_labels = uuid_entity_map[extracted_edge.source_node_uuid].labels + ['Entity']
-        target_node_labels = uuid_entity_map[extracted_edge.target_node_uuid].labels + ['Entity']
-        label_tuples = [
-            (source_label, target_label)
-            for source_label in source_node_labels
-            for target_label in target_node_labels
-        ]
-
-        extracted_edge_types = {}
-        for label_tuple in label_tuples:
-            type_names = edge_type_map.get(label_tuple, [])
-            for type_name in type_names:
-                type_model = edge_types.get(type_name)
-                if type_model is None:
-                    continue
-
-                extracted_edge_types[type_name] = type_model
-
-        edge_types_lst.append(extracted_edge_types)
+    ontology = compile_ontology(edge_types=edge_types, edge_type_map=edge_type_map)
+    edge_types_lst: list[dict[str, BaseModel]] = [
+        ontology.edge_types_for_labels(
+            uuid_entity_map[extracted_edge.source_node_uuid].labels,
+            uuid_entity_map[extracted_edge.target_node_uuid].labels,
+        )
+        for extracted_edge in extracted_edges
+    ]
 
     # resolve edges with related edges in the graph and find invalidation candidates
     results: list[tuple[EntityEdge, list[EntityEdge]]] = list(
@@ -431,18 +452,7 @@ async def resolve_extracted_edge(
         {'id': i, 'fact': existing_edge.fact} for i, existing_edge in enumerate(existing_edges)
     ]
 
-    edge_types_context = (
-        [
-            {
-                'fact_type_id': i,
-                'fact_type_name': type_name,
-                'fact_type_description': type_model.__doc__,
-            }
-            for i, (type_name, type_model) in enumerate(edge_types.items())
-        ]
-        if edge_types is not None
-        else []
-    )
+    edge_types_context = get_edge_types_resolution_context(edge_types)
 
     context = {
         'existing_edges': related_edges_context,
@@ -497,6 +507,18 @@ async def resolve_extracted_edge(
         f'Resolved Edge: {extracted_edge.name} is {resolved_edge.name}, in {(end - start) * 1000} ms'
     )
 
+    invalidated_edges = apply_edge_invalidation(resolved_edge, invalidation_candidates)
+
+    return resolved_edge, invalidated_edges
+
+
+def apply_edge_invalidation(
+    resolved_edge: EntityEdge, invalidation_candidates: list[EntityEdge]
+) -> list[EntityEdge]:
+    """
+    Expire resolved_edge if a contradicting edge is more recent, and expire the contradicting
+    edges it supersedes. Returns the contradicting edges that were invalidated.
+    """
     now = utc_now()
 
     if resolved_edge.invalid_at and not resolved_edge.expired_at:
@@ -519,9 +541,7 @@ async def resolve_extracted_edge(
                 break
 
     # Determine which contradictory edges need to be expired
-    invalidated_edges = resolve_edge_contradictions(resolved_edge, invalidation_candidates)
-
-    return resolved_edge, invalidated_edges
+    return resolve_edge_contradictions(resolved_edge, invalidation_candidates)
 
 
 async def dedupe_extracted_edge(
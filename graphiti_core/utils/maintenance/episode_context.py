@@ -0,0 +1,206 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from graphiti_core.helpers import estimate_token_count
+from graphiti_core.llm_client import LLMClient
+from graphiti_core.nodes import EpisodeType, EpisodicNode
+from graphiti_core.prompts import prompt_library
+from graphiti_core.prompts.summarize_nodes import EpisodesSummary
+from graphiti_core.utils.datetime_utils import utc_now
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_CACHE_SIZE = 128
+TRUNCATION_MARKER = ' [...]'
+# Rough characters per token, matching estimate_token_count
+CHARS_PER_TOKEN = 4
+
+
+class EpisodeContextConfig(BaseModel):
+    """
+    Limits on the previous-episode context that is embedded in extraction and resolution prompts.
+
+    The defaults leave previous episodes untouched.
+    """
+
+    max_tokens: int | None = Field(
+        default=None,
+        description='Estimated token budget for all previous episodes of one episode',
+    )
+    max_episode_tokens: int | None = Field(
+        default=None,
+        description='Estimated token cap per previous episode; longer episodes are truncated',
+    )
+    keep_recent: int = Field(
+        default=1,
+        description='Number of most recent episodes that are always kept, even over max_tokens',
+    )
+    summarize_overflow: bool = Field(
+        default=False,
+        description='Replace episodes that do not fit max_tokens with a rolling summary per group',
+    )
+    max_summary_tokens: int = Field(
+        default=512,
+        description='Estimated tokens of max_tokens reserved for the rolling summary',
+    )
+
+
+class EpisodeContextManager:
+    """
+    Builds the compacted previous-episode context for an episode once, before extraction.
+
+    The returned episodes are copies whose content has been truncated to the configured budget, so
+    every prompt that embeds previous episodes receives the same, smaller block. When overflow
+    summaries are enabled, episodes that do not fit are replaced by a single summary episode. The
+    summary is cached per group and extended incrementally as older episodes fall out of the
+    budget, so the summarization call is only made when new episodes overflow. A cached summary is
+    only reused for episodes that come after every episode it covers.
+    """
+
+    def __init__(
+        self, config: EpisodeContextConfig | None = None, llm_client: LLMClient | None = None
+    ):
+        self.config = config if config is not None else EpisodeContextConfig()
+        self.llm_client = llm_client
+        # group_id -> (covered episode uuids, summary, valid_at of the newest covered episode)
+        self._summaries: OrderedDict[str, tuple[frozenset[str], str, datetime]] = OrderedDict()
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def build(
+        self, episode: EpisodicNode, previous_episodes: list[EpisodicNode]
+    ) -> list[EpisodicNode]:
+        """Return the previous episodes of an episode, in chronological order, within the budget."""
+        config = self.config
+        if not previous_episodes:
+            return previous_episodes
+        if config.max_tokens is None and config.max_episode_tokens is None:
+            return previous_episodes
+
+        compacted = [self._truncate(ep, config.max_episode_tokens) for ep in previous_episodes]
+        if config.max_tokens is None:
+            return compacted
+
+        summarize = config.summarize_overflow and self.llm_client is not None
+        budget = config.max_tokens - (config.max_summary_tokens if summarize else 0)
+
+        kept: list[EpisodicNode] = []
+        used_tokens = 0
+        for i, ep in enumerate(reversed(compacted)):
+            tokens = estimate_token_count(ep.content)
+            if i >= config.keep_recent and used_tokens + tokens > budget:
+                break
+            kept.append(ep)
+            used_tokens += tokens
+        kept.reverse()
+
+        overflow = previous_episodes[: len(previous_episodes) - len(kept)]
+        if not overflow:
+            return kept
+
+        logger.debug(
+            f'Previous episode context for episode {episode.uuid}: kept {len(kept)} episodes, '
+            f'{len(overflow)} over budget'
+        )
+        if not summarize:
+            return kept
+
+        summary = await self._summarize(episode.group_id, overflow)
+        if not summary:
+            return kept
+
+        summary_episode = EpisodicNode(
+            name='Summary of earlier episodes',
+            group_id=episode.group_id,
+            labels=[],
+            source=EpisodeType.text,
+            source_description='Summary of earlier episodes',
+            content=self._truncate_text(summary, config.max_summary_tokens),
+            created_at=utc_now(),
+            valid_at=overflow[-1].valid_at,
+        )
+        return [summary_episode] + kept
+
+    def clear(self, group_id: str | None = None):
+        """Drop cached summaries, for one group or for all groups."""
+        if group_id is None:
+            self._summaries.clear()
+            self._locks.clear()
+        else:
+            self._summaries.pop(group_id, None)
+            self._locks.pop(group_id, None)
+
+    async def _summarize(self, group_id: str, episodes: list[EpisodicNode]) -> str:
+        # Concurrent builds for a group wait for each other instead of summarizing the same
+        # episodes twice and overwriting each other's cached summary
+        lock = self._locks.setdefault(group_id, asyncio.Lock())
+        async with lock:
+            cutoff = max(ep.valid_at for ep in episodes)
+            cached = self._summaries.get(group_id)
+            if cached is not None and cached[2] > cutoff:
+                # The cached summary covers episodes newer than this context, such as when an
+                # older episode is processed late, so it is summarized on its own and not cached
+                return await self._generate_summary('', episodes)
+
+            covered, summary, _ = cached if cached is not None else (frozenset(), '', cutoff)
+            new_episodes = [ep for ep in episodes if ep.uuid not in covered]
+            if not new_episodes:
+                self._summaries.move_to_end(group_id)
+                return summary
+
+            summary = await self._generate_summary(summary, new_episodes)
+
+            self._summaries[group_id] = (
+                covered | {ep.uuid for ep in new_episodes},
+                summary,
+                cutoff,
+            )
+            self._summaries.move_to_end(group_id)
+            if len(self._summaries) > SUMMARY_CACHE_SIZE:
+                evicted, _ = self._summaries.popitem(last=False)
+                self._locks.pop(evicted, None)
+
+            return summary
+
+    async def _generate_summary(self, summary: str, episodes: list[EpisodicNode]) -> str:
+        assert self.llm_client is not None
+        llm_response = await self.llm_client.generate_response(
+            prompt_library.summarize_nodes.summarize_episodes(
+                {'summary': summary, 'episodes': [ep.content for ep in episodes]}
+            ),
+            response_model=EpisodesSummary,
+        )
+        return llm_response.get('summary', summary)
+
+    @classmethod
+    def _truncate(cls, episode: EpisodicNode, max_tokens: int | None) -> EpisodicNode:
+        content = cls._truncate_text(episode.content, max_tokens)
+        if content is episode.content:
+            return episode
+        return episode.model_copy(update={'content': content})
+
+    @staticmethod
+    def _truncate_text(text: str, max_tokens: int | None) -> str:
+        if max_tokens is None or estimate_token_count(text) <= max_tokens:
+            return text
+        max_chars = max(max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARKER), 0)
+        return text[:max_chars] + TRUNCATION_MARKER
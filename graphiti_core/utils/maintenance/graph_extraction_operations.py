@@ -0,0 +1,177 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import logging
+from enum import Enum
+from time import time
+from typing import Any
+
+from pydantic import BaseModel
+
+from graphiti_core.edges import EntityEdge
+from graphiti_core.graphiti_types import GraphitiClients
+from graphiti_core.nodes import EntityNode, EpisodicNode
+from graphiti_core.prompts import prompt_library
+from graphiti_core.prompts.extract_graph import ExtractedGraph, MissedGraph
+from graphiti_core.prompts.extract_nodes import ExtractedEntity
+from graphiti_core.utils.datetime_utils import utc_now
+from graphiti_core.utils.maintenance.edge_operations import build_edges_from_extraction
+from graphiti_core.utils.maintenance.reflexion_policy import (
+    ReflexionPolicy,
+    estimate_reflexion_tokens,
+    reflexion_stats,
+)
+from graphiti_core.utils.ontology_utils.ontology_compiler import (
+    DEFAULT_ENTITY_TYPE_NAME,
+    compile_ontology,
+)
+
+logger = logging.getLogger(__name__)
+
+EXTRACT_GRAPH_MAX_TOKENS = 16384
+
+
+class ExtractionMode(Enum):
+    """
+    How add_episode extracts entities and facts from an episode.
+
+    sequential: entities are extracted first, then facts between them, in separate LLM calls.
+    combined: entities and facts are extracted together in a single structured LLM call.
+    """
+
+    sequential = 'sequential'
+    combined = 'combined'
+
+
+async def extract_nodes_and_edges(
+    clients: GraphitiClients,
+    episode: EpisodicNode,
+    previous_episodes: list[EpisodicNode],
+    entity_types: dict[str, BaseModel] | None = None,
+    excluded_entity_types: list[str] | None = None,
+    edge_type_map: dict[tuple[str, str], list[str]] | None = None,
+    edge_types: dict[str, BaseModel] | None = None,
+    group_id: str = '',
+    reflexion_policy: ReflexionPolicy | None = None,
+) -> tuple[list[EntityNode], list[EntityEdge]]:
+    """
+    Extract entities and the facts between them in a single structured LLM call.
+
+    When reflexion is enabled, one follow-up call asks for missed entities and facts together and
+    its results are merged into the first pass. The returned nodes and edges have the same shape as
+    the output of extract_nodes and extract_edges, so they can be passed unchanged to
+    resolve_extracted_nodes, resolve_edge_pointers and resolve_extracted_edges.
+    """
+    start = time()
+    llm_client = clients.llm_client
+    policy = reflexion_policy if reflexion_policy is not None else ReflexionPolicy()
+    ontology = compile_ontology(entity_types, edge_types, edge_type_map)
+
+    context: dict[str, Any] = {
+        'episode_content': episode.content,
+        'reference_time': episode.valid_at,
+        'source': episode.source.value,
+        'source_description': episode.source_description,
+        'previous_episodes': [ep.content for ep in previous_episodes],
+        'entity_types': ontology.entity_types_context,
+        'edge_types': ontology.edge_types_context,
+        'custom_prompt': '',
+    }
+
+    llm_response = await llm_client.generate_response(
+        prompt_library.extract_graph.extract(context),
+        response_model=ExtractedGraph,
+        max_tokens=EXTRACT_GRAPH_MAX_TOKENS,
+    )
+
+    extracted_entities: list[ExtractedEntity] = [
+        ExtractedEntity(**entity) for entity in llm_response.get('extracted_entities', [])
+    ]
+    edges_data: list[dict[str, Any]] = list(llm_response.get('edges', []))
+
+    extracted_items = [entity.name for entity in extracted_entities] + [
+        edge_data.get('fact', '') for edge_data in edges_data
+    ]
+    estimated_tokens = estimate_reflexion_tokens(episode, previous_episodes, extracted_items)
+    # Combined extraction runs at most one reflexion round, whatever the configured maximum
+    if policy.iterations_for(episode) > 0 and policy.should_reflect(
+        0, len(extracted_items), 0, estimated_tokens
+    ):
+        context['extracted_entities'] = [
+            {
+                'id': i,
+                'name': entity.name,
+                'entity_type': ontology.entity_type_name(entity.entity_type_id),
+            }
+            for i, entity in enumerate(extracted_entities)
+        ]
+        context['extracted_facts'] = [edge_data.get('fact', '') for edge_data in edges_data]
+        context['next_entity_id'] = len(extracted_entities)
+
+        reflexion_response = await llm_client.generate_response(
+            prompt_library.extract_graph.reflexion(context),
+            response_model=MissedGraph,
+            max_tokens=EXTRACT_GRAPH_MAX_TOKENS,
+        )
+
+        missed_entities = [
+            ExtractedEntity(**entity) for entity in reflexion_response.get('missed_entities', [])
+        ]
+        missed_facts = reflexion_response.get('missed_facts', [])
+        reflexion_stats.record_call(estimated_tokens, len(missed_entities) + len(missed_facts))
+        logger.debug(
+            f'Reflexion found {len(missed_entities)} missed entities and {len(missed_facts)} missed facts'
+        )
+
+        extracted_entities.extend(missed_entities)
+        edges_data.extend(missed_facts)
+
+    # Entities that are dropped keep their slot as None so edge ids still line up
+    nodes_by_id: list[EntityNode | None] = []
+    for extracted_entity in extracted_entities:
+        if not extracted_entity.name.strip():
+            nodes_by_id.append(None)
+            continue
+
+        entity_type_name = ontology.entity_type_name(extracted_entity.entity_type_id)
+        if entity_type_name is None:
+            entity_type_name = DEFAULT_ENTITY_TYPE_NAME
+
+        if excluded_entity_types and entity_type_name in excluded_entity_types:
+            logger.debug(f'Excluding entity "{extracted_entity.name}" of type "{entity_type_name}"')
+            nodes_by_id.append(None)
+            continue
+
+        nodes_by_id.append(
+            EntityNode(
+                name=extracted_entity.name,
+                group_id=episode.group_id,
+                labels=list({DEFAULT_ENTITY_TYPE_NAME, entity_type_name}),
+                summary='',
+                created_at=utc_now(),
+            )
+        )
+
+    extracted_nodes = [node for node in nodes_by_id if node is not None]
+    extracted_edges = build_edges_from_extraction(edges_data, nodes_by_id, episode, group_id)
+
+    end = time()
+    logger.debug(
+        f'Extracted {len(extracted_nodes)} nodes and {len(extracted_edges)} edges in a single pass '
+        f'in {(end - start) * 1000} ms'
+    )
+
+    return extracted_nodes, extracted_edges
@@ -18,13 +18,11 @@ import logging
 from contextlib import suppress
 from time import time
 from typing import Any
-from uuid import uuid4
 
-import pydantic
-from pydantic import BaseModel, Field
+from pydantic import BaseModel
 
 from graphiti_core.graphiti_types import GraphitiClients
-from graphiti_core.helpers import MAX_REFLEXION_ITERATIONS, semaphore_gather
+from graphiti_core.helpers import semaphore_gather
 from graphiti_core.llm_client import LLMClient
 from graphiti_core.llm_client.config import ModelSize
 from graphiti_core.nodes import EntityNode, EpisodeType, EpisodicNode, create_entity_node_embeddings
@@ -41,6 +39,16 @@ from graphiti_core.search.search_config_recipes import NODE_HYBRID_SEARCH_RRF
 from graphiti_core.search.search_filters import SearchFilters
 from graphiti_core.utils.datetime_utils import utc_now
 from graphiti_core.utils.maintenance.edge_operations import filter_existing_duplicate_of_edges
+from graphiti_core.utils.maintenance.reflexion_policy import (
+    ReflexionPolicy,
+    estimate_reflexion_tokens,
+    reflexion_stats,
+)
+from graphiti_core.utils.ontology_utils.ontology_compiler import (
+    DEFAULT_ENTITY_TYPE_NAME,
+    compile_ontology,
+    get_entity_attributes_model,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -72,45 +80,30 @@ async def extract_nodes(
     previous_episodes: list[EpisodicNode],
     entity_types: dict[str, BaseModel] | None = None,
     excluded_entity_types: list[str] | None = None,
+    reflexion_policy: ReflexionPolicy | None = None,
 ) -> list[EntityNode]:
     start = time()
     llm_client = clients.llm_client
     llm_response = {}
-    custom_prompt = ''
-    entities_missed = True
-    reflexion_iterations = 0
+    policy = reflexion_policy if reflexion_policy is not None else ReflexionPolicy()
+    max_reflexion_iterations = policy.iterations_for(episode)
+    reflexion_tokens = 0
+    first_pass_count = 0
 
-    entity_types_context = [
-        {
-            'entity_type_id': 0,
-            'entity_type_name': 'Entity',
-            'entity_type_description': 'Default entity classification. Use this entity type if the entity is not one of the other listed types.',
-        }
-    ]
-
-    entity_types_context += (
-        [
-            {
-                'entity_type_id': i + 1,
-                'entity_type_name': type_name,
-                'entity_type_description': type_model.__doc__,
-            }
-            for i, (type_name, type_model) in enumerate(entity_types.items())
-        ]
-        if entity_types is not None
-        else []
-    )
+    ontology = compile_ontology(entity_types)
+    entity_types_context = ontology.entity_types_context
 
     context = {
         'episode_content': episode.content,
         'episode_timestamp': episode.valid_at.isoformat(),
         'previous_episodes': [ep.content for ep in previous_episodes],
-        'custom_prompt': custom_prompt,
+        'custom_prompt': '',
         'entity_types': entity_types_context,
         'source_description': episode.source_description,
     }
 
-    while entities_missed and reflexion_iterations <= MAX_REFLEXION_ITERATIONS:
+    extracted_entities: list[ExtractedEntity] = []
+    for iteration in range(max_reflexion_iterations + 1):
         if episode.source == EpisodeType.message:
             llm_response = await llm_client.generate_response(
                 prompt_library.extract_nodes.extract_message(context),
@@ -125,25 +118,40 @@ async def extract_nodes(
                 prompt_library.extract_nodes.extract_json(context), response_model=ExtractedEntities
             )
 
-        extracted_entities: list[ExtractedEntity] = [
-            ExtractedEntity(**entity_types_context)
-            for entity_types_context in llm_response.get('extracted_entities', [])
+        extracted_entities = [
+            ExtractedEntity(**extracted_entity)
+            for extracted_entity in llm_response.get('extracted_entities', [])
         ]
 
-        reflexion_iterations += 1
-        if reflexion_iterations < MAX_REFLEXION_ITERATIONS:
-            missing_entities = await extract_nodes_reflexion(
-                llm_client,
-                episode,
-                previous_episodes,
-                [entity.name for entity in extracted_entities],
-            )
+        if iteration == 0:
+            first_pass_count = len(extracted_entities)
 
-            entities_missed = len(missing_entities) != 0
+        if iteration >= max_reflexion_iterations:
+            break
 
-            custom_prompt = 'Make sure that the following entities are extracted: '
-            for entity in missing_entities:
-                custom_prompt += f'\n{entity},'
+        entity_names = [entity.name for entity in extracted_entities]
+        estimated_tokens = estimate_reflexion_tokens(episode, previous_episodes, entity_names)
+        if not policy.should_reflect(
+            iteration, first_pass_count, reflexion_tokens, estimated_tokens
+        ):
+            break
+
+        missing_entities = await extract_nodes_reflexion(
+            llm_client,
+            episode,
+            previous_episodes,
+            entity_names,
+        )
+        reflexion_tokens += estimated_tokens
+        reflexion_stats.record_call(estimated_tokens, len(missing_entities))
+
+        if len(missing_entities) == 0:
+            break
+
+        custom_prompt = 'Make sure that the following entities are extracted: '
+        for entity in missing_entities:
+            custom_prompt += f'\n{entity},'
+        context['custom_prompt'] = custom_prompt
 
     filtered_extracted_entities = [entity for entity in extracted_entities if entity.name.strip()]
     end = time()
@@ -151,9 +159,12 @@ async def extract_nodes(
     # Convert the extracted data into EntityNode objects
     extracted_nodes = []
     for extracted_entity in filtered_extracted_entities:
-        entity_type_name = entity_types_context[extracted_entity.entity_type_id].get(
-            'entity_type_name'
-        )
+        entity_type_name = ontology.entity_type_name(extracted_entity.entity_type_id)
+        if entity_type_name is None:
+            logger.warning(
+                f'Unknown entity type id {extracted_entity.entity_type_id} for "{extracted_entity.name}", using the default type'
+            )
+            entity_type_name = DEFAULT_ENTITY_TYPE_NAME
 
         # Check if this entity type should be excluded
         if excluded_entity_types and entity_type_name in excluded_entity_types:
@@ -347,6 +358,7 @@ async def extract_attributes_from_nodes(
 ) -> list[EntityNode]:
     llm_client = clients.llm_client
     embedder = clients.embedder
+    ontology = compile_ontology(entity_types)
     updated_nodes: list[EntityNode] = await semaphore_gather(
         *[
             extract_attributes_from_node(
@@ -354,9 +366,7 @@ async def extract_attributes_from_nodes(
                 node,
                 episode,
                 previous_episodes,
-                entity_types.get(next((item for item in node.labels if item != 'Entity'), ''))
-                if entity_types is not None
-                else None,
+                ontology.entity_type_for_labels(node.labels),
             )
             for node in nodes
         ]
@@ -381,24 +391,7 @@ async def extract_attributes_from_node(
         'attributes': node.attributes,
     }
 
-    attributes_definitions: dict[str, Any] = {
-        'summary': (
-            str,
-            Field(
-                description='Summary containing the important information about the entity. Under 250 words',
-            ),
-        )
-    }
-
-    if entity_type is not None:
-        for field_name, field_info in entity_type.model_fields.items():
-            attributes_definitions[field_name] = (
-                field_info.annotation,
-                Field(description=field_info.description),
-            )
-
-    unique_model_name = f'EntityAttributes_{uuid4().hex}'
-    entity_attributes_model = pydantic.create_model(unique_model_name, **attributes_definitions)
+    entity_attributes_model = get_entity_attributes_model(entity_type)  # type: ignore[arg-type]
 
     summary_context: dict[str, Any] = {
         'node': node_context,
@@ -0,0 +1,159 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import logging
+from collections import Counter
+
+from pydantic import BaseModel, Field
+
+from graphiti_core.helpers import MAX_REFLEXION_ITERATIONS, estimate_token_count
+from graphiti_core.nodes import EpisodeType, EpisodicNode
+
+logger = logging.getLogger(__name__)
+
+
+class ReflexionStats:
+    """Process-wide counters describing how often reflexion ran, was skipped, and what it found."""
+
+    def __init__(self):
+        self.calls = 0
+        self.calls_with_findings = 0
+        self.items_recovered = 0
+        self.estimated_tokens_spent = 0
+        self.estimated_tokens_saved = 0
+        self.skipped: Counter[str] = Counter()
+
+    def record_call(self, estimated_tokens: int, items_recovered: int):
+        self.calls += 1
+        self.estimated_tokens_spent += estimated_tokens
+        self.items_recovered += items_recovered
+        if items_recovered > 0:
+            self.calls_with_findings += 1
+
+    def record_skip(self, reason: str, estimated_tokens: int = 0):
+        self.skipped[reason] += 1
+        self.estimated_tokens_saved += estimated_tokens
+
+    def snapshot(self) -> dict[str, int | dict[str, int]]:
+        return {
+            'calls': self.calls,
+            'calls_with_findings': self.calls_with_findings,
+            'items_recovered': self.items_recovered,
+            'estimated_tokens_spent': self.estimated_tokens_spent,
+            'estimated_tokens_saved': self.estimated_tokens_saved,
+            'skipped': dict(self.skipped),
+        }
+
+    def reset(self):
+        self.__init__()
+
+
+reflexion_stats = ReflexionStats()
+
+
+class ReflexionPolicy(BaseModel):
+    """
+    Decides when the extraction reflexion follow-up ("what did you miss?") is worth its cost.
+
+    Short episodes rarely hide missed entities or facts, so reflexion can be skipped below a size
+    threshold, disabled for some episode sources, capped by an estimated token budget, or limited
+    to first passes that came back dense enough to suggest something was left out.
+    """
+
+    max_iterations: int = Field(
+        default=MAX_REFLEXION_ITERATIONS,
+        description='Maximum number of reflexion rounds per extraction',
+    )
+    max_iterations_by_source: dict[EpisodeType, int] = Field(
+        default_factory=dict,
+        description='Per episode source override of max_iterations',
+    )
+    min_episode_chars: int = Field(
+        default=0, description='Skip reflexion for episodes shorter than this many characters'
+    )
+    min_episode_tokens: int = Field(
+        default=0, description='Skip reflexion for episodes estimated below this many tokens'
+    )
+    max_reflexion_tokens: int | None = Field(
+        default=None,
+        description='Estimated prompt token budget for all reflexion calls of one extraction',
+    )
+    only_if_saturated: bool = Field(
+        default=False,
+        description='Only run reflexion when the first pass returned at least saturation_threshold items',
+    )
+    saturation_threshold: int = Field(default=10)
+
+    def iterations_for(self, episode: EpisodicNode) -> int:
+        """Return the number of reflexion rounds allowed for an episode, recording skips."""
+        max_iterations = self.max_iterations_by_source.get(episode.source, self.max_iterations)
+        if max_iterations <= 0:
+            return 0
+
+        if len(episode.content) < self.min_episode_chars:
+            reflexion_stats.record_skip('short_episode')
+            return 0
+
+        if (
+            self.min_episode_tokens > 0
+            and estimate_token_count(episode.content) < self.min_episode_tokens
+        ):
+            reflexion_stats.record_skip('short_episode')
+            return 0
+
+        return max_iterations
+
+    def should_reflect(
+        self,
+        iteration: int,
+        extracted_count: int,
+        tokens_spent: int,
+        estimated_tokens: int,
+    ) -> bool:
+        """
+        Decide whether to run the next reflexion round.
+
+        iteration is the zero-based index of the round about to run, extracted_count the number of
+        items from the first extraction pass, tokens_spent the estimated tokens already used on
+        reflexion for this extraction and estimated_tokens the estimate for the next call.
+        """
+        if (
+            iteration == 0
+            and self.only_if_saturated
+            and extracted_count < self.saturation_threshold
+        ):
+            reflexion_stats.record_skip('not_saturated', estimated_tokens)
+            return False
+
+        if (
+            self.max_reflexion_tokens is not None
+            and tokens_spent + estimated_tokens > self.max_reflexion_tokens
+        ):
+            reflexion_stats.record_skip('token_budget', estimated_tokens)
+            return False
+
+        return True
+
+
+def estimate_reflexion_tokens(
+    episode: EpisodicNode, previous_episodes: list[EpisodicNode], extracted_items: list[str]
+) -> int:
+    """Estimate the prompt tokens of a reflexion call from the content it is built from."""
+    return (
+        estimate_token_count(episode.content)
+        + sum(estimate_token_count(ep.content) for ep in previous_episodes)
+        + sum(estimate_token_count(item) for item in extracted_items)
+    )
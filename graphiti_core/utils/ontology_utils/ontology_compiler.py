@@ -0,0 +1,271 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import logging
+import re
+from collections import OrderedDict
+from collections.abc import Hashable
+from functools import lru_cache
+from typing import Any
+
+import pydantic
+from pydantic import BaseModel, Field
+
+from graphiti_core.llm_client.utils import serialize_response_model_schema
+
+logger = logging.getLogger(__name__)
+
+ONTOLOGY_CACHE_SIZE = 64
+DEFAULT_ENTITY_TYPE_NAME = 'Entity'
+DEFAULT_ENTITY_TYPE_DESCRIPTION = (
+    'Default entity classification. '
+    'Use this entity type if the entity is not one of the other listed types.'
+)
+
+_MODEL_NAME_PATTERN = re.compile(r'[^0-9a-zA-Z_]')
+
+_ontology_cache: 'OrderedDict[Hashable, CompiledOntology]' = OrderedDict()
+_edge_types_context_cache: 'OrderedDict[Hashable, list[dict[str, Any]]]' = OrderedDict()
+
+
+@lru_cache(maxsize=ONTOLOGY_CACHE_SIZE * 8)
+def get_entity_attributes_model(entity_type: type[BaseModel] | None = None) -> type[BaseModel]:
+    """
+    Build the response model used to extract the summary and attributes of an entity.
+
+    The model is created once per entity type rather than once per node, so the LLM client can
+    reuse the serialized JSON schema across calls.
+    """
+    attributes_definitions: dict[str, Any] = {
+        'summary': (
+            str,
+            Field(
+                description='Summary containing the important information about the entity. Under 250 words',
+            ),
+        )
+    }
+
+    model_name = 'EntityAttributes'
+    if entity_type is not None:
+        for field_name, field_info in entity_type.model_fields.items():
+            attributes_definitions[field_name] = (
+                field_info.annotation,
+                Field(description=field_info.description),
+            )
+        model_name = f'EntityAttributes_{_MODEL_NAME_PATTERN.sub("_", entity_type.__name__)}'
+
+    return pydantic.create_model(model_name, **attributes_definitions)
+
+
+class CompiledOntology:
+    """
+    Prompt contexts, response models and lookup tables derived from a set of custom entity types,
+    edge types and an edge type map.
+
+    Instances are immutable once built and are shared between every episode ingested with the
+    same ontology. Use compile_ontology to obtain a cached instance.
+    """
+
+    def __init__(
+        self,
+        entity_types: dict[str, BaseModel] | None = None,
+        edge_types: dict[str, BaseModel] | None = None,
+        edge_type_map: dict[tuple[str, str], list[str]] | None = None,
+    ):
+        self.entity_types: dict[str, BaseModel] = dict(entity_types or {})
+        self.edge_types: dict[str, BaseModel] = dict(edge_types or {})
+        self.edge_type_map: dict[tuple[str, str], list[str]] = {
+            signature: list(type_names) for signature, type_names in (edge_type_map or {}).items()
+        }
+
+        self.entity_types_context: list[dict[str, Any]] = [
+            {
+                'entity_type_id': 0,
+                'entity_type_name': DEFAULT_ENTITY_TYPE_NAME,
+                'entity_type_description': DEFAULT_ENTITY_TYPE_DESCRIPTION,
+            }
+        ] + [
+            {
+                'entity_type_id': i + 1,
+                'entity_type_name': type_name,
+                'entity_type_description': type_model.__doc__,
+            }
+            for i, (type_name, type_model) in enumerate(self.entity_types.items())
+        ]
+
+        self.entity_attributes_models: dict[str, type[BaseModel]] = {
+            type_name: get_entity_attributes_model(type_model)  # type: ignore[arg-type]
+            for type_name, type_model in self.entity_types.items()
+        }
+        self.default_entity_attributes_model: type[BaseModel] = get_entity_attributes_model()
+
+        self.edge_type_signature_map: dict[str, tuple[str, str]] = {
+            edge_type: signature
+            for signature, type_names in self.edge_type_map.items()
+            for edge_type in type_names
+        }
+
+        self.edge_types_context: list[dict[str, Any]] = [
+            {
+                'fact_type_name': type_name,
+                'fact_type_signature': self.edge_type_signature_map.get(
+                    type_name, (DEFAULT_ENTITY_TYPE_NAME, DEFAULT_ENTITY_TYPE_NAME)
+                ),
+                'fact_type_description': type_model.__doc__,
+            }
+            for type_name, type_model in self.edge_types.items()
+        ]
+
+        # (source_label, target_label) -> edge types, with unknown type names dropped up front
+        self.edge_types_by_signature: dict[tuple[str, str], dict[str, BaseModel]] = {
+            signature: {
+                type_name: self.edge_types[type_name]
+                for type_name in type_names
+                if type_name in self.edge_types
+            }
+            for signature, type_names in self.edge_type_map.items()
+        }
+
+        self._edge_types_by_labels: dict[
+            tuple[frozenset[str], frozenset[str]], dict[str, BaseModel]
+        ] = {}
+
+        # Warm the schema cache so the first episode doesn't pay for serialization
+        for attributes_model in self.entity_attributes_models.values():
+            serialize_response_model_schema(attributes_model)
+        for type_model in self.edge_types.values():
+            if isinstance(type_model, type) and issubclass(type_model, BaseModel):
+                serialize_response_model_schema(type_model)
+
+    def entity_type_name(self, entity_type_id: int) -> str | None:
+        if 0 <= entity_type_id < len(self.entity_types_context):
+            return self.entity_types_context[entity_type_id]['entity_type_name']
+        return None
+
+    def entity_type_for_labels(self, labels: list[str]) -> BaseModel | None:
+        type_name = next(
+            (label for label in labels if label != DEFAULT_ENTITY_TYPE_NAME),
+            '',
+        )
+        return self.entity_types.get(type_name)
+
+    def edge_types_for_labels(
+        self, source_labels: list[str], target_labels: list[str]
+    ) -> dict[str, BaseModel]:
+        """
+        Return the edge types that may connect nodes carrying the given labels.
+
+        Every node implicitly carries the 'Entity' label. Results are memoized per label set pair.
+        """
+        key = (
+            frozenset(source_labels) | {DEFAULT_ENTITY_TYPE_NAME},
+            frozenset(target_labels) | {DEFAULT_ENTITY_TYPE_NAME},
+        )
+        cached = self._edge_types_by_labels.get(key)
+        if cached is not None:
+            return cached
+
+        edge_types: dict[str, BaseModel] = {}
+        for source_label in source_labels + [DEFAULT_ENTITY_TYPE_NAME]:
+            for target_label in target_labels + [DEFAULT_ENTITY_TYPE_NAME]:
+                edge_types.update(
+                    self.edge_types_by_signature.get((source_label, target_label), {})
+                )
+
+        self._edge_types_by_labels[key] = edge_types
+        return edge_types
+
+
+def get_edge_types_resolution_context(
+    edge_types: dict[str, BaseModel] | None,
+) -> list[dict[str, Any]]:
+    """Return the fact type context used by the edge resolution prompt for a set of edge types."""
+    if edge_types is None:
+        return []
+
+    try:
+        key: Hashable = tuple(edge_types.items())
+        cached = _edge_types_context_cache.get(key)
+    except TypeError:
+        key, cached = None, None
+
+    if cached is not None:
+        return cached
+
+    context = [
+        {
+            'fact_type_id': i,
+            'fact_type_name': type_name,
+            'fact_type_description': type_model.__doc__,
+        }
+        for i, (type_name, type_model) in enumerate(edge_types.items())
+    ]
+
+    if key is not None:
+        _edge_types_context_cache[key] = context
+        if len(_edge_types_context_cache) > ONTOLOGY_CACHE_SIZE * 8:
+            _edge_types_context_cache.popitem(last=False)
+
+    return context
+
+
+def _ontology_cache_key(
+    entity_types: dict[str, BaseModel] | None,
+    edge_types: dict[str, BaseModel] | None,
+    edge_type_map: dict[tuple[str, str], list[str]] | None,
+) -> Hashable:
+    return (
+        tuple((entity_types or {}).items()),
+        tuple((edge_types or {}).items()),
+        tuple(
+            (signature, tuple(type_names))
+            for signature, type_names in (edge_type_map or {}).items()
+        ),
+    )
+
+
+def compile_ontology(
+    entity_types: dict[str, BaseModel] | None = None,
+    edge_types: dict[str, BaseModel] | None = None,
+    edge_type_map: dict[tuple[str, str], list[str]] | None = None,
+) -> CompiledOntology:
+    """
+    Return the compiled form of an ontology, building it only the first time a given combination
+    of entity types, edge types and edge type map is seen.
+    """
+    try:
+        key = _ontology_cache_key(entity_types, edge_types, edge_type_map)
+        hash(key)
+    except TypeError:
+        # Unhashable type definitions can't be cached, compile them for this call only
+        return CompiledOntology(entity_types, edge_types, edge_type_map)
+
+    ontology = _ontology_cache.get(key)
+    if ontology is not None:
+        _ontology_cache.move_to_end(key)
+        return ontology
+
+    ontology = CompiledOntology(entity_types, edge_types, edge_type_map)
+    _ontology_cache[key] = ontology
+    if len(_ontology_cache) > ONTOLOGY_CACHE_SIZE:
+        _ontology_cache.popitem(last=False)
+
+    logger.debug(
+        f'Compiled ontology with {len(ontology.entity_types)} entity types and '
+        f'{len(ontology.edge_types)} edge types'
+    )
+
+    return ontology
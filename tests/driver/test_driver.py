@@ -0,0 +1,90 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from graphiti_core.driver.driver import GraphDriver
+
+
+class RecordingDriver(GraphDriver):
+    provider = 'test'
+
+    def __init__(self, records: list[dict[str, Any]], session: Any = None):
+        self.records = records
+        self.queries: list[tuple[str, dict[str, Any]]] = []
+        self._session = session
+
+    async def execute_query(self, cypher_query_: str, **kwargs: Any):
+        self.queries.append((cypher_query_, kwargs))
+        return self.records, None, None
+
+    def session(self, database: str):
+        return self._session
+
+    def close(self):
+        pass
+
+    def delete_all_indexes(self, database_: str = 'neo4j'):
+        raise NotImplementedError()
+
+
+@pytest.mark.asyncio
+async def test_execute_query_columns_default_pivots_records():
+    driver = RecordingDriver([{'uuid': 'a', 'name': 'Alice'}, {'uuid': 'b', 'name': 'Bob'}])
+
+    columns, header = await driver.execute_query_columns('MATCH (n) RETURN n', group_id='g')
+
+    assert header == ['uuid', 'name']
+    assert columns == {'uuid': ['a', 'b'], 'name': ['Alice', 'Bob']}
+    assert driver.queries == [('MATCH (n) RETURN n', {'group_id': 'g'})]
+
+    driver.records = []
+    assert await driver.execute_query_columns('MATCH (n) RETURN n') == ({}, [])
+
+
+@pytest.mark.asyncio
+async def test_execute_many_default_returns_eager_write_results():
+    tx = MagicMock()
+    eager_results = [('created', None, ['n']), ('deleted', None, ['count'])]
+    tx.run = AsyncMock(
+        side_effect=[
+            MagicMock(to_eager_result=AsyncMock(return_value=eager_result))
+            for eager_result in eager_results
+        ]
+    )
+
+    async def run_transaction(func):
+        return await func(tx)
+
+    session = MagicMock()
+    session.__aenter__.return_value = session
+    session.execute_write = AsyncMock(side_effect=run_transaction)
+    driver = RecordingDriver([], session)
+
+    results = await driver.execute_many(
+        [('CREATE (n)', {'uuid': 'a'}), ('MATCH (n) DELETE n', {})], transactional=True
+    )
+
+    assert results == eager_results
+    assert tx.run.await_args_list[0].args == ('CREATE (n)',)
+    assert tx.run.await_args_list[0].kwargs == {'uuid': 'a'}
+
+    # Sessions without eager results give None per statement
+    tx.run = AsyncMock(return_value=None)
+    assert await driver.execute_many([('CREATE (n)', {})], transactional=True) == [None]
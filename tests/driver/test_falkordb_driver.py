@@ -163,6 +163,103 @@ class TestFalkorDriver:
         call_args = mock_graph.query.call_args[0]
         assert call_args[1]['created_at'] == test_datetime.isoformat()
 
+    @pytest.mark.asyncio
+    @unittest.skipIf(not HAS_FALKORDB, 'FalkorDB is not installed')
+    async def test_execute_many_uses_one_pipeline(self):
+        """Test statements are sent in one pipeline and results come back in order."""
+        mock_graph = MagicMock()
+        mock_graph.name = 'test_db'
+        mock_graph._build_params_header = lambda params: f'CYPHER uuid="{params["uuid"]}" '
+        pipeline = MagicMock()
+        pipeline.execute = AsyncMock(return_value=[['a'], ['b']])
+        mock_graph.client.pipeline.return_value = pipeline
+        self.mock_client.select_graph.return_value = mock_graph
+
+        class FakeQueryResult:
+            def __init__(self, graph):
+                self.header = [(1, 'uuid')]
+
+            async def parse(self, response):
+                self.result_set = [response]
+
+        with patch('graphiti_core.driver.falkordb_driver.QueryResult', FakeQueryResult):
+            results = await self.driver.execute_many(
+                [('MATCH (n {uuid: $uuid}) RETURN n.uuid', {'uuid': uuid}) for uuid in 'ab'],
+                database_='test_db',
+            )
+
+        mock_graph.client.pipeline.assert_called_once_with(transaction=False)
+        pipeline.execute.assert_awaited_once()
+        assert pipeline.execute_command.call_args_list[1].args == (
+            'GRAPH.RO_QUERY',
+            'test_db',
+            'CYPHER uuid="b" MATCH (n {uuid: $uuid}) RETURN n.uuid',
+            '--compact',
+        )
+        assert [records for records, _, _ in results] == [[{'uuid': 'a'}], [{'uuid': 'b'}]]
+
+    @pytest.mark.asyncio
+    @unittest.skipIf(not HAS_FALKORDB, 'FalkorDB is not installed')
+    async def test_execute_many_transactional_uses_multi(self):
+        """Test transactional statements are wrapped in MULTI/EXEC as write queries."""
+        mock_graph = MagicMock()
+        mock_graph._build_params_header = lambda params: ''
+        pipeline = MagicMock()
+        pipeline.execute = AsyncMock(return_value=[])
+        mock_graph.client.pipeline.return_value = pipeline
+        self.mock_client.select_graph.return_value = mock_graph
+
+        await self.driver.execute_many(
+            [('MATCH (n {uuid: $uuid}) DETACH DELETE n', {'uuid': 'a'})], transactional=True
+        )
+
+        mock_graph.client.pipeline.assert_called_once_with(transaction=True)
+        assert pipeline.execute_command.call_args.args[0] == 'GRAPH.QUERY'
+
+    @pytest.mark.asyncio
+    @unittest.skipIf(not HAS_FALKORDB, 'FalkorDB is not installed')
+    async def test_execute_query_pads_short_rows(self):
+        """Test that fields missing from a row are returned as None."""
+        mock_graph = MagicMock()
+        mock_result = MagicMock()
+        mock_result.header = [('col1', 'uuid'), ('col2', 'name')]
+        mock_result.result_set = [['a', 'Alice'], ['b']]
+        mock_graph.query = AsyncMock(return_value=mock_result)
+        self.mock_client.select_graph.return_value = mock_graph
+
+        records, header, _ = await self.driver.execute_query(
+            'MATCH (n) RETURN n.uuid AS uuid, n.name AS name'
+        )
+
+        assert header == ['uuid', 'name']
+        assert records == [{'uuid': 'a', 'name': 'Alice'}, {'uuid': 'b', 'name': None}]
+
+    @pytest.mark.asyncio
+    @unittest.skipIf(not HAS_FALKORDB, 'FalkorDB is not installed')
+    async def test_execute_query_columns(self):
+        """Test column-oriented results, with short rows padded with None."""
+        mock_graph = MagicMock()
+        mock_result = MagicMock()
+        mock_result.header = [('col1', 'uuid'), ('col2', 'name')]
+        mock_result.result_set = [['a', 'Alice'], ['b']]
+        mock_graph.query = AsyncMock(return_value=mock_result)
+        self.mock_client.select_graph.return_value = mock_graph
+
+        columns, header = await self.driver.execute_query_columns(
+            'MATCH (n) RETURN n.uuid AS uuid, n.name AS name', database_='test_db'
+        )
+
+        self.mock_client.select_graph.assert_called_with('test_db')
+        assert mock_graph.query.call_args[0][1] == {}
+        assert header == ['uuid', 'name']
+        assert columns == {'uuid': ['a', 'b'], 'name': ['Alice', None]}
+
+        mock_result.result_set = []
+        assert await self.driver.execute_query_columns('MATCH (n) RETURN n.uuid AS uuid') == (
+            {'uuid': [], 'name': []},
+            ['uuid', 'name'],
+        )
+
     @unittest.skipIf(not HAS_FALKORDB, 'FalkorDB is not installed')
     def test_session_creation(self):
         """Test session creation with specific database."""
@@ -365,6 +462,61 @@ class TestDatetimeConversion:
         assert convert_datetimes_to_strings(None) is None
         assert convert_datetimes_to_strings(True) is True
 
+    @unittest.skipIf(not HAS_FALKORDB, 'FalkorDB is not installed')
+    def test_convert_skips_embeddings(self):
+        """Test numeric lists are passed through and arrays converted to lists."""
+        import numpy as np
+
+        from graphiti_core.driver.falkordb_driver import convert_datetimes_to_strings
+
+        test_datetime = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+        embedding = [0.1, 0.2, 0.3]
+        rows = [
+            {'created_at': test_datetime, 'name_embedding': embedding},
+            {'created_at': test_datetime, 'name_embedding': np.array([0.5, 0.25])},
+        ]
+
+        result = convert_datetimes_to_strings({'nodes': rows})
+
+        assert result['nodes'][0]['name_embedding'] is embedding
+        assert result['nodes'][1]['name_embedding'] == [0.5, 0.25]
+        assert all(row['created_at'] == test_datetime.isoformat() for row in result['nodes'])
+
+    @unittest.skipIf(not HAS_FALKORDB, 'FalkorDB is not installed')
+    def test_convert_mixed_lists_starting_with_numbers(self):
+        """Test lists that only start with a number are still encoded."""
+        from graphiti_core.driver.falkordb_driver import convert_datetimes_to_strings
+
+        test_datetime = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+        result = convert_datetimes_to_strings(
+            {'values': [1, test_datetime], 'rows': (0.5, {'ts': test_datetime})}
+        )
+
+        assert result['values'] == [1, test_datetime.isoformat()]
+        assert result['rows'] == (0.5, {'ts': test_datetime.isoformat()})
+
+
+class TestBulkNodeQuery:
+    """Test the FalkorDB bulk entity node save queries."""
+
+    def test_one_query_per_label_set(self):
+        """Nodes are grouped into one UNWIND query per distinct label set."""
+        from graphiti_core.graph_queries import get_entity_node_save_bulk_query
+
+        nodes = [
+            {'uuid': str(i), 'labels': labels, 'name_embedding': [0.1, 0.2]}
+            for i, labels in enumerate([['Entity'], ['Entity', 'Person'], ['Person']] * 50)
+        ]
+
+        queries = get_entity_node_save_bulk_query(nodes, 'falkordb')
+
+        assert len(queries) == 2
+        cypher_by_size = {len(params['nodes']): cypher for cypher, params in queries}
+        assert 'SET n:Entity\n' in cypher_by_size[50]
+        assert 'SET n:Entity:Person\n' in cypher_by_size[100]
+        assert all('vecf32(node.name_embedding)' in cypher for cypher, _ in queries)
+
 
 # Simple integration test
 class TestFalkorDriverIntegration:
@@ -0,0 +1,185 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from graphiti_core.cross_encoder.client import CrossEncoderClient
+from graphiti_core.driver.neo4j_driver import Neo4jDriver, Neo4jDriverConfig
+from graphiti_core.embedder import EmbedderClient
+from graphiti_core.graphiti import Graphiti
+from graphiti_core.llm_client import LLMClient
+
+
+def make_driver(config: Neo4jDriverConfig | None = None, metrics_hook=None):
+    with patch('graphiti_core.driver.neo4j_driver.AsyncGraphDatabase') as graph_database:
+        graph_database.driver.side_effect = lambda **kwargs: MagicMock(
+            execute_query=AsyncMock(return_value=([], None, [])), close=AsyncMock()
+        )
+        driver = Neo4jDriver('neo4j://writer', 'user', 'pass', config, metrics_hook)
+    return driver, graph_database
+
+
+def test_pool_options_are_passed_to_the_driver():
+    config = Neo4jDriverConfig(
+        max_connection_pool_size=20, connection_acquisition_timeout=5, fetch_size=200
+    )
+    driver, graph_database = make_driver(config)
+
+    graph_database.driver.assert_called_once()
+    kwargs = graph_database.driver.call_args.kwargs
+    assert kwargs['uri'] == 'neo4j://writer'
+    assert kwargs['max_connection_pool_size'] == 20
+    assert kwargs['connection_acquisition_timeout'] == 5
+    assert kwargs['fetch_size'] == 200
+    assert driver.read_client is driver.client
+
+
+@pytest.mark.asyncio
+async def test_reads_use_the_read_pool():
+    samples = []
+    config = Neo4jDriverConfig(read_uri='neo4j://replica', read_max_connection_pool_size=50)
+    driver, graph_database = make_driver(config, lambda pool, stats: samples.append(pool))
+
+    assert graph_database.driver.call_args_list[1].kwargs['uri'] == 'neo4j://replica'
+    assert graph_database.driver.call_args_list[1].kwargs['max_connection_pool_size'] == 50
+
+    await driver.execute_query('MATCH (n) RETURN n', routing_='r')
+    await driver.execute_query('CREATE (n)')
+
+    driver.read_client.execute_query.assert_awaited_once()
+    driver.client.execute_query.assert_awaited_once()
+    assert samples == ['read', 'write']
+
+    snapshot = driver.pool_snapshot()
+    assert snapshot['read']['queries'] == 1
+    assert snapshot['read']['max_size'] == 50
+    assert snapshot['write']['in_flight'] == 0
+
+    await driver.close()
+    driver.read_client.close.assert_awaited_once()
+    driver.client.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_reads_can_be_routed_to_the_leader():
+    driver, _ = make_driver(Neo4jDriverConfig(route_reads_to_readers=False))
+
+    await driver.execute_query('MATCH (n) RETURN n', routing_='r')
+
+    assert driver.client.execute_query.call_args.kwargs['routing_'] == 'w'
+
+
+@pytest.mark.asyncio
+async def test_failing_metrics_hook_does_not_affect_queries():
+    def metrics_hook(pool, stats):
+        raise RuntimeError('metrics backend down')
+
+    driver, _ = make_driver(metrics_hook=metrics_hook)
+
+    assert await driver.execute_query('MATCH (n) RETURN n') == ([], None, [])
+
+    driver.client.execute_query.side_effect = ValueError('query failed')
+    with pytest.raises(ValueError, match='query failed'):
+        await driver.execute_query('MATCH (n) RETURN n')
+    assert driver.pool_snapshot()['write']['failures'] == 1
+
+
+def test_graphiti_passes_metrics_hook_to_neo4j_driver():
+    def metrics_hook(pool, stats):
+        pass
+
+    with patch(
+        'graphiti_core.graphiti.Neo4jDriver', return_value=MagicMock(spec=Neo4jDriver)
+    ) as neo4j_driver:
+        Graphiti(
+            'neo4j://writer',
+            'user',
+            'pass',
+            llm_client=MagicMock(spec=LLMClient),
+            embedder=MagicMock(spec=EmbedderClient),
+            cross_encoder=MagicMock(spec=CrossEncoderClient),
+            metrics_hook=metrics_hook,
+        )
+
+    assert neo4j_driver.call_args.kwargs['metrics_hook'] is metrics_hook
+
+
+@pytest.mark.asyncio
+async def test_execute_query_columns():
+    driver, _ = make_driver()
+    records = [MagicMock(values=MagicMock(return_value=values)) for values in (['a', 1], ['b', 2])]
+    driver.client.execute_query.return_value = MagicMock(records=records, keys=['uuid', 'count'])
+
+    columns, header = await driver.execute_query_columns(
+        'MATCH (n) RETURN n.uuid AS uuid, n.count AS count', routing_='r', uuid='a'
+    )
+
+    assert header == ['uuid', 'count']
+    assert columns == {'uuid': ['a', 'b'], 'count': [1, 2]}
+    kwargs = driver.client.execute_query.call_args.kwargs
+    assert kwargs['uuid'] == 'a'
+
+
+def mock_session(client: MagicMock, eager_results: list) -> MagicMock:
+    tx = MagicMock()
+    tx.run = AsyncMock(
+        side_effect=[
+            MagicMock(to_eager_result=AsyncMock(return_value=eager_result))
+            for eager_result in eager_results
+        ]
+    )
+
+    async def run_transaction(func):
+        return await func(tx)
+
+    session = MagicMock()
+    session.execute_read = AsyncMock(side_effect=run_transaction)
+    session.execute_write = AsyncMock(side_effect=run_transaction)
+    client.session.return_value.__aenter__.return_value = session
+    return session
+
+
+@pytest.mark.asyncio
+async def test_execute_many_reads_in_one_read_transaction():
+    driver, _ = make_driver(Neo4jDriverConfig(separate_read_pool=True))
+    session = mock_session(driver.read_client, ['first', 'second'])
+    statements = [('MATCH (n) RETURN n', {'uuid': 'a'}), ('MATCH (m) RETURN m', {})]
+
+    results = await driver.execute_many(statements, database_='graph')
+
+    assert results == ['first', 'second']
+    driver.read_client.session.assert_called_once_with(database='graph')
+    session.execute_read.assert_awaited_once()
+    session.execute_write.assert_not_called()
+    assert driver.pool_snapshot()['read']['queries'] == 1
+    assert await driver.execute_many([]) == []
+
+
+@pytest.mark.asyncio
+async def test_execute_many_transactional_writes_on_the_write_pool():
+    driver, _ = make_driver(Neo4jDriverConfig(separate_read_pool=True))
+    session = mock_session(driver.client, ['deleted'])
+
+    results = await driver.execute_many(
+        [('MATCH (n {uuid: $uuid}) DETACH DELETE n', {'uuid': 'a'})], transactional=True
+    )
+
+    assert results == ['deleted']
+    session.execute_write.assert_awaited_once()
+    driver.read_client.session.assert_not_called()
+    assert driver.pool_snapshot()['write']['queries'] == 1
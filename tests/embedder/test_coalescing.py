@@ -0,0 +1,98 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from graphiti_core.embedder.client import EmbedderClient
+from graphiti_core.embedder.coalescing import CoalescingEmbedder
+
+
+class FakeEmbedder(EmbedderClient):
+    def __init__(self):
+        self.batches: list[list[str]] = []
+        self.create_mock = AsyncMock(return_value=[0.0])
+
+    async def create(self, input_data):
+        return await self.create_mock(input_data)
+
+    async def create_batch(self, input_data_list: list[str]) -> list[list[float]]:
+        self.batches.append(list(input_data_list))
+        return [[float(len(text))] for text in input_data_list]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_creates_share_one_batch():
+    fake = FakeEmbedder()
+    embedder = CoalescingEmbedder(fake, max_wait_ms=1)
+
+    texts = [f'text {i}' * (i + 1) for i in range(50)]
+    results = await asyncio.gather(*[embedder.create(input_data=[text]) for text in texts])
+
+    assert len(fake.batches) == 1
+    assert results == [[float(len(text))] for text in texts]
+    fake.create_mock.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_batches_are_split_at_max_batch_size_and_deduplicated():
+    fake = FakeEmbedder()
+    embedder = CoalescingEmbedder(fake, max_batch_size=4, max_wait_ms=1)
+
+    texts = ['a', 'b', 'a', 'c', 'd', 'e', 'f']
+    results = await asyncio.gather(*[embedder.create(text) for text in texts])
+
+    assert fake.batches == [['a', 'b', 'c', 'd'], ['e', 'f']]
+    assert results == [[1.0]] * len(texts)
+
+
+@pytest.mark.asyncio
+async def test_max_batch_chars():
+    fake = FakeEmbedder()
+    embedder = CoalescingEmbedder(fake, max_batch_chars=10, max_wait_ms=1)
+
+    await asyncio.gather(
+        embedder.create('x' * 4), embedder.create('y' * 4), embedder.create('z' * 4)
+    )
+
+    assert fake.batches == [['xxxx', 'yyyy'], ['zzzz']]
+
+
+@pytest.mark.asyncio
+async def test_batch_errors_reach_every_caller():
+    fake = FakeEmbedder()
+    fake.create_batch = AsyncMock(side_effect=RuntimeError('provider down'))
+    embedder = CoalescingEmbedder(fake, max_wait_ms=1)
+
+    results = await asyncio.gather(
+        embedder.create('a'), embedder.create('b'), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_non_text_inputs_bypass_batching():
+    fake = FakeEmbedder()
+    embedder = CoalescingEmbedder(fake)
+
+    await embedder.create(input_data=['a', 'b'])
+    await embedder.create(input_data='')
+
+    assert fake.create_mock.await_count == 2
+    assert fake.batches == []
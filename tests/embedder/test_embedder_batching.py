@@ -0,0 +1,151 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from typing import ClassVar
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from graphiti_core.embedder.client import EmbedderClient, EmbedderConfig, is_transient_error
+from graphiti_core.llm_client.errors import RateLimitError
+
+
+class ChunkedEmbedder(EmbedderClient):
+    MAX_BATCH_SIZE: ClassVar[int] = 3
+    MAX_BATCH_TOKENS: ClassVar[int | None] = 10
+
+    def __init__(
+        self,
+        config: EmbedderConfig | None = None,
+        failures: int = 0,
+        error: Exception | None = None,
+    ):
+        self.config = config or EmbedderConfig()
+        self.requests: list[list[str]] = []
+        self.failures = failures
+        self.error = error if error is not None else RateLimitError()
+
+    async def create(self, input_data):
+        return [0.0]
+
+    async def create_batch(self, input_data_list: list[str]) -> list[list[float]]:
+        return await self._create_batch_in_chunks(
+            input_data_list, self._create_batch_chunk, self.config
+        )
+
+    async def _create_batch_chunk(self, input_data_list: list[str]) -> list[list[float]]:
+        self.requests.append(input_data_list)
+        if 'fail' in input_data_list and self.failures > 0:
+            self.failures -= 1
+            raise self.error
+        return [[float(len(text))] for text in input_data_list]
+
+
+def test_split_by_count_and_tokens():
+    embedder = ChunkedEmbedder()
+
+    assert embedder._split_batch(['a', 'b', 'c', 'd']) == [['a', 'b', 'c'], ['d']]
+    # 'x' * 36 is estimated at 9 tokens, so it can't share a request with 'y' * 8
+    assert embedder._split_batch(['x' * 36, 'y' * 8, 'z']) == [['x' * 36], ['y' * 8, 'z']]
+    # Oversized inputs are sent on their own
+    assert embedder._split_batch(['x' * 100]) == [['x' * 100]]
+    assert embedder._split_batch([]) == [[]]
+
+
+def test_config_can_only_lower_provider_limits():
+    embedder = ChunkedEmbedder(EmbedderConfig(batch_size=2))
+    assert embedder._split_batch(['a', 'b', 'c'], embedder.config) == [['a', 'b'], ['c']]
+
+    embedder = ChunkedEmbedder(EmbedderConfig(batch_size=10))
+    assert embedder._split_batch(['a', 'b', 'c', 'd'], embedder.config) == [['a', 'b', 'c'], ['d']]
+    assert embedder._split_batch(['a', 'b', 'c', 'd']) == [['a', 'b', 'c'], ['d']]
+
+
+@pytest.mark.asyncio
+async def test_single_request_when_inputs_fit():
+    embedder = ChunkedEmbedder()
+
+    assert await embedder.create_batch(['a', 'bb']) == [[1.0], [2.0]]
+    assert embedder.requests == [['a', 'bb']]
+
+
+@pytest.mark.asyncio
+async def test_chunks_preserve_order_and_only_failed_chunks_are_retried():
+    embedder = ChunkedEmbedder(EmbedderConfig(batch_retries=2), failures=1)
+    texts = ['a', 'bb', 'ccc', 'fail', 'e', 'ff', 'g']
+
+    result = await embedder.create_batch(texts)
+
+    assert result == [[float(len(text))] for text in texts]
+    assert embedder.requests.count(['a', 'bb', 'ccc']) == 1
+    assert embedder.requests.count(['fail', 'e', 'ff']) == 2
+    assert embedder.requests.count(['g']) == 1
+
+
+@pytest.mark.asyncio
+async def test_chunk_failure_is_raised_after_retries():
+    embedder = ChunkedEmbedder(EmbedderConfig(batch_retries=1), failures=5)
+
+    with pytest.raises(RateLimitError):
+        await embedder.create_batch(['a', 'b', 'c', 'fail'])
+
+
+@pytest.mark.asyncio
+async def test_single_request_is_retried_like_chunks():
+    embedder = ChunkedEmbedder(EmbedderConfig(batch_retries=2), failures=1)
+
+    assert await embedder.create_batch(['fail', 'b']) == [[4.0], [1.0]]
+    assert embedder.requests == [['fail', 'b'], ['fail', 'b']]
+
+
+@pytest.mark.asyncio
+async def test_non_transient_errors_are_not_retried():
+    embedder = ChunkedEmbedder(
+        EmbedderConfig(batch_retries=3), failures=5, error=ValueError('input too long')
+    )
+
+    with pytest.raises(ValueError, match='input too long'):
+        await embedder.create_batch(['a', 'b', 'c', 'fail'])
+    assert embedder.requests.count(['fail']) == 1
+
+
+@pytest.mark.asyncio
+async def test_single_request_checks_embedding_count():
+    embedder = ChunkedEmbedder()
+    embedder._create_batch_chunk = AsyncMock(return_value=[[1.0]])
+
+    with pytest.raises(ValueError, match='1 embeddings for 2 inputs'):
+        await embedder.create_batch(['a', 'b'])
+    embedder._create_batch_chunk.assert_awaited_once()
+
+
+def http_error(status_code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request('POST', 'https://embeddings.test')
+    response = httpx.Response(status_code, request=request)
+    return httpx.HTTPStatusError(str(status_code), request=request, response=response)
+
+
+def test_transient_errors():
+    assert is_transient_error(RateLimitError())
+    assert is_transient_error(http_error(429))
+    assert is_transient_error(http_error(503))
+    assert is_transient_error(httpx.ConnectTimeout('timed out'))
+    assert is_transient_error(TimeoutError())
+
+    assert not is_transient_error(http_error(400))
+    assert not is_transient_error(http_error(401))
+    assert not is_transient_error(ValueError('input too long'))
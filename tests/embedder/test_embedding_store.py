@@ -0,0 +1,129 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+from graphiti_core.embedder.client import EmbedderClient
+from graphiti_core.embedder.embedding_store import DIGEST_SIZE, CachedEmbedder, EmbeddingStore
+
+DIM = 4
+
+
+def vector_for(text: str) -> list[float]:
+    return [float(len(text)), 1.0, 2.0, 3.0]
+
+
+class FakeEmbedder(EmbedderClient):
+    def __init__(self):
+        self.create_mock = AsyncMock(side_effect=lambda input_data: vector_for(input_data[0]))
+        self.batch_mock = AsyncMock(side_effect=lambda texts: [vector_for(t) for t in texts])
+
+    async def create(self, input_data):
+        return await self.create_mock(input_data)
+
+    async def create_batch(self, input_data_list: list[str]) -> list[list[float]]:
+        return await self.batch_mock(input_data_list)
+
+
+def test_store_round_trip_and_persistence(tmp_path):
+    store = EmbeddingStore(tmp_path, 'test/model', DIM)
+    store.put_many(['alice', 'bob'], [vector_for('alice'), vector_for('bob')])
+
+    alice, missing = store.get_many(['alice', 'carol'])
+    assert missing is None
+    assert isinstance(alice, np.ndarray)
+    assert alice.dtype == np.float32
+    assert not alice.flags.writeable
+    assert alice.tolist() == vector_for('alice')
+
+    # A new instance, as after a restart, reads the same files
+    reopened = EmbeddingStore(tmp_path, 'test/model', DIM)
+    assert len(reopened) == 2
+    assert reopened.get('bob').tolist() == vector_for('bob')
+
+    # Other models and dimensions don't share entries
+    assert EmbeddingStore(tmp_path, 'other-model', DIM).get('bob') is None
+
+
+def test_store_sees_appends_from_other_instances(tmp_path):
+    reader = EmbeddingStore(tmp_path, 'model', DIM)
+    writer = EmbeddingStore(tmp_path, 'model', DIM)
+
+    writer.put_many(['alice'], [vector_for('alice')])
+    reader.put_many(['bob'], [vector_for('bob')])
+
+    assert reader.get('alice').tolist() == vector_for('alice')
+    assert writer.get('bob').tolist() == vector_for('bob')
+    assert len(EmbeddingStore(tmp_path, 'model', DIM)) == 2
+
+
+def test_store_ignores_duplicates_and_wrong_dimensions(tmp_path):
+    store = EmbeddingStore(tmp_path, 'model', DIM)
+    store.put_many(['alice', 'alice'], [vector_for('alice'), vector_for('alice')])
+    store.put_many(['bob'], [[1.0, 2.0]])
+
+    assert len(store) == 1
+    assert store.get('bob') is None
+
+
+def test_store_recovers_from_partial_append(tmp_path):
+    store = EmbeddingStore(tmp_path, 'model', DIM)
+    store.put_many(['alice'], [vector_for('alice')])
+    # Simulate a crash after the vector was written but before its index entry
+    with open(store.vectors_path, 'ab') as vectors_file:
+        vectors_file.write(np.zeros(DIM, dtype=np.float32).tobytes())
+
+    reopened = EmbeddingStore(tmp_path, 'model', DIM)
+    reopened.put_many(['bob'], [vector_for('bob')])
+
+    assert EmbeddingStore(tmp_path, 'model', DIM).get('bob').tolist() == vector_for('bob')
+
+
+def test_store_recovers_from_torn_index_write(tmp_path):
+    store = EmbeddingStore(tmp_path, 'model', DIM)
+    store.put_many(['alice'], [vector_for('alice')])
+    # Simulate a crash part way through writing an index entry
+    with open(store.index_path, 'ab') as index_file:
+        index_file.write(b'\x00' * 10)
+
+    reopened = EmbeddingStore(tmp_path, 'model', DIM)
+    reopened.put_many(['bob', 'carol'], [vector_for('bob'), vector_for('carol')])
+
+    assert store.index_path.stat().st_size == 3 * DIGEST_SIZE
+    fresh = EmbeddingStore(tmp_path, 'model', DIM)
+    assert len(fresh) == 3
+    assert fresh.get('alice').tolist() == vector_for('alice')
+    assert fresh.get('bob').tolist() == vector_for('bob')
+    assert fresh.get('carol').tolist() == vector_for('carol')
+
+
+@pytest.mark.asyncio
+async def test_cached_embedder_only_embeds_misses(tmp_path):
+    fake = FakeEmbedder()
+    embedder = CachedEmbedder(fake, EmbeddingStore(tmp_path, 'model', DIM))
+
+    assert await embedder.create(input_data=['alice']) == vector_for('alice')
+    assert await embedder.create(input_data=['alice']) == vector_for('alice')
+    assert fake.create_mock.await_count == 1
+
+    result = await embedder.create_batch(['alice', 'bob', 'carol'])
+
+    assert result == [vector_for('alice'), vector_for('bob'), vector_for('carol')]
+    fake.batch_mock.assert_awaited_once_with(['bob', 'carol'])
+    assert (embedder.hits, embedder.misses) == (2, 3)
@@ -26,6 +26,7 @@ from graphiti_core.llm_client import LLMConfig, OpenAIClient
 from graphiti_core.nodes import EpisodeType
 from graphiti_core.prompts import prompt_library
 from graphiti_core.prompts.eval import EvalAddEpisodeResults
+from graphiti_core.utils.maintenance.reflexion_policy import ReflexionPolicy, reflexion_stats
 from tests.test_graphiti_int import NEO4J_URI, NEO4j_PASSWORD, NEO4j_USER
 
 
@@ -122,10 +123,22 @@ async def build_baseline_graph(multi_session_count: int, session_length: int):
         json.dump(serializable_baseline_graph_results, file, indent=4, default=str)
 
 
-async def eval_graph(multi_session_count: int, session_length: int, llm_client=None) -> float:
+async def eval_graph(
+    multi_session_count: int,
+    session_length: int,
+    llm_client=None,
+    reflexion_policy: ReflexionPolicy | None = None,
+) -> float:
     if llm_client is None:
         llm_client = OpenAIClient(config=LLMConfig(model='gpt-4.1-mini'))
-    graphiti = Graphiti(NEO4J_URI, NEO4j_USER, NEO4j_PASSWORD, llm_client=llm_client)
+    graphiti = Graphiti(
+        NEO4J_URI,
+        NEO4j_USER,
+        NEO4j_PASSWORD,
+        llm_client=llm_client,
+        reflexion_policy=reflexion_policy,
+    )
+    reflexion_stats.reset()
     with open('baseline_graph_results.json') as file:
         baseline_results_raw = json.load(file)
 
@@ -147,6 +160,9 @@ async def eval_graph(multi_session_count: int, session_length: int, llm_client=N
     with open(filename, 'w') as file:
         json.dump(candidate_baseline_graph_results, file, indent=4, default=str)
 
+    # Report how much reflexion ran and what it recovered, to weigh against the score
+    print('reflexion stats:', reflexion_stats.snapshot())
+
     raw_score = 0
     user_count = 0
     for user_id in add_episode_results:
@@ -14,9 +14,11 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import asyncio
+
 import pytest
 
-from graphiti_core.helpers import lucene_sanitize
+from graphiti_core.helpers import lucene_sanitize, semaphore_gather
 
 
 def test_lucene_sanitize():
@@ -34,5 +36,57 @@ def test_lucene_sanitize():
         assert assert_result == result
 
 
+async def sleep_and_return(value, delay: float, finished: list | None = None):
+    await asyncio.sleep(delay)
+    if finished is not None:
+        finished.append(value)
+    return value
+
+
+async def fail_after(delay: float):
+    await asyncio.sleep(delay)
+    raise ValueError('extraction failed')
+
+
+@pytest.mark.asyncio
+async def test_semaphore_gather_returns_results_in_order():
+    results = await semaphore_gather(
+        sleep_and_return('a', 0.02), sleep_and_return('b', 0), max_coroutines=2
+    )
+
+    assert results == ['a', 'b']
+    assert await semaphore_gather() == []
+
+
+@pytest.mark.asyncio
+async def test_semaphore_gather_cancels_siblings_on_failure():
+    finished: list[str] = []
+
+    with pytest.raises(ValueError, match='extraction failed'):
+        await semaphore_gather(
+            fail_after(0.01),
+            sleep_and_return('slow', 1, finished),
+            # Still waiting for the semaphore when the failure happens
+            *[sleep_and_return(f'queued {i}', 0, finished) for i in range(3)],
+            max_coroutines=2,
+        )
+
+    await asyncio.sleep(0)
+    assert finished == []
+
+
+@pytest.mark.asyncio
+async def test_semaphore_gather_partial_results():
+    finished: list[str] = []
+
+    results = await semaphore_gather(
+        fail_after(0), sleep_and_return('ok', 0.01, finished), partial_results=True
+    )
+
+    assert isinstance(results[0], ValueError)
+    assert results[1] == 'ok'
+    assert finished == ['ok']
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
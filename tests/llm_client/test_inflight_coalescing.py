@@ -0,0 +1,181 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from graphiti_core.helpers import semaphore_gather
+from graphiti_core.llm_client.client import LLMClient
+from graphiti_core.llm_client.config import LLMConfig, ModelSize
+from graphiti_core.prompts.models import Message
+
+
+class Answer(BaseModel):
+    answer: list[str]
+
+
+class SlowLLMClient(LLMClient):
+    def __init__(self, fail: bool = False):
+        super().__init__(LLMConfig(model='model'))
+        self.calls = 0
+        self.fail = fail
+        self.cancelled = 0
+        self.release = asyncio.Event()
+
+    async def _generate_response_with_retry(
+        self, messages, response_model=None, max_tokens=None, model_size=ModelSize.medium
+    ):
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise RuntimeError('provider error')
+        return {'answer': [messages[-1].content]}
+
+    async def _generate_response(self, messages, response_model=None, max_tokens=None):
+        raise NotImplementedError()
+
+
+def make_messages(content: str = 'question') -> list[Message]:
+    return [Message(role='system', content='system'), Message(role='user', content=content)]
+
+
+async def release_soon(client: SlowLLMClient):
+    await asyncio.sleep(0.01)
+    client.release.set()
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_share_one_call():
+    client = SlowLLMClient()
+
+    results = await asyncio.gather(
+        *[client.generate_response(make_messages(), response_model=Answer) for _ in range(5)],
+        release_soon(client),
+    )
+
+    assert client.calls == 1
+    assert results[:5] == [{'answer': ['question']}] * 5
+    # Each caller owns its response
+    results[0]['answer'].append('changed')
+    assert results[1] == {'answer': ['question']}
+    assert client.inflight_stats.snapshot() == {'requests': 1, 'coalesced': 4}
+
+
+@pytest.mark.asyncio
+async def test_different_requests_are_not_coalesced():
+    client = SlowLLMClient()
+
+    await asyncio.gather(
+        client.generate_response(make_messages('a'), response_model=Answer),
+        client.generate_response(make_messages('b'), response_model=Answer),
+        client.generate_response(make_messages('a')),
+        release_soon(client),
+    )
+
+    assert client.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller_and_are_not_kept():
+    client = SlowLLMClient(fail=True)
+
+    results = await asyncio.gather(
+        client.generate_response(make_messages()),
+        client.generate_response(make_messages()),
+        release_soon(client),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results[:2])
+    assert client.calls == 1
+
+    client.fail = False
+    assert await client.generate_response(make_messages()) == {'answer': ['question']}
+    assert client.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_call():
+    client = SlowLLMClient()
+
+    first = asyncio.create_task(client.generate_response(make_messages()))
+    second = asyncio.create_task(client.generate_response(make_messages()))
+    await asyncio.sleep(0)
+    first.cancel()
+    client.release.set()
+
+    assert await second == {'answer': ['question']}
+    assert first.cancelled()
+    assert client.cancelled == 0
+
+
+@pytest.mark.asyncio
+async def test_failing_sibling_cancels_call_of_sole_waiter():
+    client = SlowLLMClient()
+
+    async def fail_soon():
+        await asyncio.sleep(0.01)
+        raise ValueError('extraction failed')
+
+    with pytest.raises(ValueError):
+        await semaphore_gather(client.generate_response(make_messages()), fail_soon())
+    await asyncio.sleep(0.01)
+
+    assert client.calls == 1
+    assert client.cancelled == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelling_every_caller_cancels_the_call():
+    client = SlowLLMClient()
+
+    first = asyncio.create_task(client.generate_response(make_messages()))
+    second = asyncio.create_task(client.generate_response(make_messages()))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    # Another caller still waits for the call
+    assert client.cancelled == 0
+
+    second.cancel()
+    await asyncio.sleep(0.01)
+    assert client.cancelled == 1
+    assert client._inflight == {}
+
+    # A later identical request starts a new call
+    client.release.set()
+    assert await client.generate_response(make_messages()) == {'answer': ['question']}
+    assert client.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_coalescing_can_be_disabled():
+    client = SlowLLMClient()
+    client.coalesce_requests = False
+
+    await asyncio.gather(
+        client.generate_response(make_messages()),
+        client.generate_response(make_messages()),
+        release_soon(client),
+    )
+
+    assert client.calls == 2
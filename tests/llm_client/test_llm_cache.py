@@ -0,0 +1,135 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pytest
+from pydantic import BaseModel
+
+from graphiti_core.llm_client.cache import (
+    DiskLLMCache,
+    InMemoryLLMCache,
+    LLMCache,
+    request_key,
+)
+from graphiti_core.llm_client.client import LLMClient
+from graphiti_core.llm_client.config import LLMConfig, ModelSize
+from graphiti_core.prompts.models import Message
+
+
+class Answer(BaseModel):
+    answer: str
+
+
+class Other(BaseModel):
+    other: str
+
+
+class CountingLLMClient(LLMClient):
+    def __init__(self, cache: LLMCache):
+        super().__init__(LLMConfig(model='big-model', small_model='small-model'), cache)
+        self.calls = 0
+
+    async def _generate_response(
+        self, messages, response_model=None, max_tokens=None, model_size=ModelSize.medium
+    ):
+        self.calls += 1
+        return {'answer': f'response {self.calls}'}
+
+
+def make_messages() -> list[Message]:
+    return [
+        Message(role='system', content='You answer questions.'),
+        Message(role='user', content='What is the answer?'),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_generate_response_hits_cache():
+    cache = LLMCache(InMemoryLLMCache())
+    client = CountingLLMClient(cache)
+
+    first = await client.generate_response(make_messages(), response_model=Answer)
+    second = await client.generate_response(make_messages(), response_model=Answer)
+
+    assert first == second == {'answer': 'response 1'}
+    assert client.calls == 1
+    assert cache.stats.snapshot()['hits'] == 1
+    assert cache.stats.snapshot()['misses'] == 1
+    assert cache.stats.snapshot()['bytes_written'] > 0
+
+
+@pytest.mark.asyncio
+async def test_cache_is_namespaced_by_model_and_response_model():
+    client = CountingLLMClient(LLMCache(InMemoryLLMCache()))
+
+    await client.generate_response(make_messages(), response_model=Answer)
+    await client.generate_response(
+        make_messages(), response_model=Answer, model_size=ModelSize.small
+    )
+    await client.generate_response(make_messages(), response_model=Other)
+
+    assert client.calls == 3
+
+
+def test_key_includes_namespace():
+    key = request_key('model', make_messages())
+
+    assert LLMCache(InMemoryLLMCache()).key(key) == key
+    assert LLMCache(InMemoryLLMCache(), namespace='a').key(key) != LLMCache(
+        InMemoryLLMCache(), namespace='b'
+    ).key(key)
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_lru_and_size_limits():
+    backend = InMemoryLLMCache(max_entries=2, max_bytes=10)
+
+    await backend.set('a', '1234')
+    await backend.set('b', '1234')
+    assert await backend.get('a') == '1234'
+    await backend.set('c', '1234')
+
+    # 'b' was least recently used
+    assert await backend.get('b') is None
+    assert await backend.get('a') == '1234'
+
+    await backend.set('d', '12345678')
+    assert await backend.get('a') is None
+    assert await backend.get('c') is None
+    assert await backend.get('d') == '12345678'
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr('graphiti_core.llm_client.cache.time.monotonic', lambda: now[0])
+    backend = InMemoryLLMCache(ttl=10)
+
+    await backend.set('a', 'value')
+    now[0] += 5
+    assert await backend.get('a') == 'value'
+    now[0] += 10
+    assert await backend.get('a') is None
+
+
+@pytest.mark.asyncio
+async def test_disk_backend_round_trip(tmp_path):
+    cache = LLMCache(DiskLLMCache(str(tmp_path)))
+    key = cache.key(request_key('model', make_messages(), Answer))
+
+    await cache.set(key, {'answer': 'value'})
+
+    reopened = LLMCache(DiskLLMCache(str(tmp_path)))
+    assert await reopened.get(key) == {'answer': 'value'}
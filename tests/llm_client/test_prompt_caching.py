@@ -0,0 +1,190 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+
+import httpx
+import pytest
+from anthropic import AsyncAnthropic
+from openai import AsyncOpenAI
+from pydantic import BaseModel
+
+from graphiti_core.llm_client.anthropic_client import AnthropicClient
+from graphiti_core.llm_client.client import MULTILINGUAL_EXTRACTION_RESPONSES
+from graphiti_core.llm_client.config import LLMConfig
+from graphiti_core.llm_client.openai_generic_client import OpenAIGenericClient
+from graphiti_core.prompts.models import Message
+
+
+class ResponseModel(BaseModel):
+    test_field: str
+
+
+def make_messages(user_content: str) -> list[Message]:
+    return [
+        Message(role='system', content='Static instructions'),
+        Message(role='user', content=user_content),
+    ]
+
+
+class RecordingTransport:
+    """Local HTTP stand-in that records request bodies and replies with a canned JSON body."""
+
+    def __init__(self, response_body: dict):
+        self.response_body = response_body
+        self.requests: list[dict] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(json.loads(request.content))
+        return httpx.Response(200, json=self.response_body)
+
+
+@pytest.mark.asyncio
+async def test_openai_generic_static_prefix_and_cached_tokens():
+    transport = RecordingTransport(
+        {
+            'id': 'chatcmpl-1',
+            'object': 'chat.completion',
+            'created': 0,
+            'model': 'test-model',
+            'choices': [
+                {
+                    'index': 0,
+                    'finish_reason': 'stop',
+                    'message': {'role': 'assistant', 'content': '{"test_field": "value"}'},
+                }
+            ],
+            'usage': {
+                'prompt_tokens': 2000,
+                'completion_tokens': 10,
+                'total_tokens': 2010,
+                'prompt_tokens_details': {'cached_tokens': 1536},
+            },
+        }
+    )
+    openai_client = AsyncOpenAI(
+        api_key='test',
+        base_url='http://llm.test/v1',
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(transport)),
+    )
+    client = OpenAIGenericClient(LLMConfig(model='test-model'), client=openai_client)
+
+    for user_content in ['first episode', 'second episode']:
+        response = await client.generate_response(
+            make_messages(user_content), response_model=ResponseModel
+        )
+        assert response == {'test_field': 'value'}
+
+    first, second = (request['messages'] for request in transport.requests)
+    # Schema and language instructions are part of the system prompt, not the variable user turn
+    assert first[0] == second[0]
+    assert 'test_field' in first[0]['content']
+    assert first[0]['content'].endswith(MULTILINGUAL_EXTRACTION_RESPONSES)
+    assert first[1]['content'] == 'first episode'
+
+    usage = client.token_usage.snapshot()
+    assert usage['calls'] == 2
+    assert usage['prompt_tokens'] == 4000
+    assert usage['cached_prompt_tokens'] == 3072
+
+
+@pytest.mark.asyncio
+async def test_anthropic_marks_system_prompt_cacheable():
+    transport = RecordingTransport(
+        {
+            'id': 'msg_1',
+            'type': 'message',
+            'role': 'assistant',
+            'model': 'claude-3-7-sonnet-latest',
+            'content': [
+                {
+                    'type': 'tool_use',
+                    'id': 'toolu_1',
+                    'name': 'ResponseModel',
+                    'input': {'test_field': 'value'},
+                }
+            ],
+            'stop_reason': 'tool_use',
+            'stop_sequence': None,
+            'usage': {
+                'input_tokens': 50,
+                'output_tokens': 10,
+                'cache_read_input_tokens': 1500,
+                'cache_creation_input_tokens': 0,
+            },
+        }
+    )
+    anthropic_client = AsyncAnthropic(
+        api_key='test',
+        base_url='http://llm.test',
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(transport)),
+    )
+    client = AnthropicClient(LLMConfig(api_key='test'), client=anthropic_client)
+
+    response = await client.generate_response(
+        make_messages('episode'), response_model=ResponseModel
+    )
+
+    assert response == {'test_field': 'value'}
+    system = transport.requests[0]['system']
+    assert system == [
+        {
+            'type': 'text',
+            'text': 'Static instructions' + MULTILINGUAL_EXTRACTION_RESPONSES,
+            'cache_control': {'type': 'ephemeral'},
+        }
+    ]
+    usage = client.token_usage.snapshot()
+    assert usage['prompt_tokens'] == 1550
+    assert usage['cached_prompt_tokens'] == 1500
+
+
+@pytest.mark.asyncio
+async def test_anthropic_prompt_caching_can_be_disabled():
+    transport = RecordingTransport(
+        {
+            'id': 'msg_1',
+            'type': 'message',
+            'role': 'assistant',
+            'model': 'claude-3-7-sonnet-latest',
+            'content': [
+                {
+                    'type': 'tool_use',
+                    'id': 'toolu_1',
+                    'name': 'ResponseModel',
+                    'input': {'test_field': 'value'},
+                }
+            ],
+            'stop_reason': 'tool_use',
+            'stop_sequence': None,
+            'usage': {'input_tokens': 50, 'output_tokens': 10},
+        }
+    )
+    anthropic_client = AsyncAnthropic(
+        api_key='test',
+        base_url='http://llm.test',
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(transport)),
+    )
+    client = AnthropicClient(
+        LLMConfig(api_key='test'), client=anthropic_client, prompt_caching=False
+    )
+
+    await client.generate_response(make_messages('episode'), response_model=ResponseModel)
+
+    assert transport.requests[0]['system'] == (
+        'Static instructions' + MULTILINGUAL_EXTRACTION_RESPONSES
+    )
+    assert client.token_usage.snapshot()['cached_prompt_tokens'] == 0
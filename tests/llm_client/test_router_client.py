@@ -0,0 +1,185 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+
+import pytest
+
+from graphiti_core.llm_client.client import LLMClient
+from graphiti_core.llm_client.config import LLMConfig, ModelSize
+from graphiti_core.llm_client.router_client import (
+    CircuitState,
+    RouterConfig,
+    RouterEndpoint,
+    RouterLLMClient,
+)
+from graphiti_core.prompts.models import Message
+
+
+class FakeLLMClient(LLMClient):
+    def __init__(self, model: str, delay: float = 0.0, error: Exception | None = None):
+        super().__init__(LLMConfig(model=model))
+        self.coalesce_requests = False
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def _generate_response(
+        self, messages, response_model=None, max_tokens=None, model_size=ModelSize.medium
+    ):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return {'model': self.model}
+
+
+def make_messages() -> list[Message]:
+    return [Message(role='system', content='system'), Message(role='user', content='question')]
+
+
+@pytest.mark.asyncio
+async def test_routes_to_lowest_latency_endpoint():
+    slow = FakeLLMClient('slow', delay=0.05)
+    fast = FakeLLMClient('fast', delay=0.001)
+    router = RouterLLMClient([slow, fast])
+
+    # Both endpoints are tried once before latency decides
+    responses = [await router.generate_response(make_messages()) for _ in range(6)]
+
+    assert {response['model'] for response in responses[:2]} == {'slow', 'fast'}
+    assert [response['model'] for response in responses[2:]] == ['fast'] * 4
+    assert slow.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_model_size_pools():
+    large = FakeLLMClient('large')
+    small = FakeLLMClient('small')
+    router = RouterLLMClient(
+        [
+            RouterEndpoint(large, model_sizes=[ModelSize.medium]),
+            RouterEndpoint(small, model_sizes=[ModelSize.small]),
+        ]
+    )
+
+    small_response = await router.generate_response(make_messages(), model_size=ModelSize.small)
+    medium_response = await router.generate_response(make_messages())
+
+    assert small_response == {'model': 'small'}
+    assert medium_response == {'model': 'large'}
+
+
+@pytest.mark.asyncio
+async def test_failover_and_circuit_breaker():
+    broken = FakeLLMClient('broken')
+    healthy = FakeLLMClient('healthy', delay=0.01)
+    router = RouterLLMClient([broken, healthy], RouterConfig(failure_threshold=2, open_seconds=60))
+    broken_endpoint = router.endpoints[0]
+    # Observe both endpoints while the faster one still works
+    await router.generate_response(make_messages())
+    await router.generate_response(make_messages())
+
+    broken.error = ValueError('endpoint down')
+    for _ in range(4):
+        assert await router.generate_response(make_messages()) == {'model': 'healthy'}
+
+    assert broken_endpoint.state == CircuitState.open
+    # The open circuit keeps calls away from the broken endpoint
+    assert broken.calls == 3
+    assert router.snapshot()['failovers'] == 2
+
+    # After open_seconds a single trial call closes the circuit again
+    broken.error = None
+    broken_endpoint.opened_at -= 60
+    assert await router.generate_response(make_messages()) == {'model': 'broken'}
+    assert broken_endpoint.state == CircuitState.closed
+
+
+@pytest.mark.asyncio
+async def test_raises_when_all_endpoints_fail():
+    router = RouterLLMClient(
+        [
+            FakeLLMClient('first', error=ValueError('first down')),
+            FakeLLMClient('second', error=ValueError('second down')),
+        ]
+    )
+
+    with pytest.raises(ValueError, match='down'):
+        await router.generate_response(make_messages())
+
+
+@pytest.mark.asyncio
+async def test_hedges_slow_calls():
+    primary = FakeLLMClient('primary', delay=0.001)
+    backup = FakeLLMClient('backup', delay=0.02)
+    router = RouterLLMClient(
+        [primary, backup], RouterConfig(hedge_percentile=0.9, hedge_min_samples=3)
+    )
+    for _ in range(4):
+        await router.generate_response(make_messages())
+
+    primary.delay = 5
+    response = await asyncio.wait_for(router.generate_response(make_messages()), timeout=2)
+
+    assert response == {'model': 'backup'}
+    snapshot = router.snapshot()['endpoints']
+    assert snapshot['FakeLLMClient:backup']['hedge_wins'] == 1
+
+
+@pytest.mark.asyncio
+async def test_failover_between_identical_clients():
+    first = FakeLLMClient('model')
+    second = FakeLLMClient('model')
+    router = RouterLLMClient([first, second])
+
+    first.error = ValueError('endpoint down')
+    second.error = ValueError('endpoint down')
+    with pytest.raises(ValueError):
+        await router.generate_response(make_messages())
+    # The failed call was retried on the twin endpoint
+    assert (first.calls, second.calls) == (1, 1)
+
+    first.error = None
+    second.error = None
+    assert await router.generate_response(make_messages()) == {'model': 'model'}
+    assert set(router.snapshot()['endpoints']) == {'FakeLLMClient:model#0', 'FakeLLMClient:model#1'}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_hedged_call_cancels_its_request():
+    client = FakeLLMClient('model', delay=0.05)
+    router = RouterLLMClient([client], RouterConfig(hedge_percentile=0.9, hedge_min_samples=3))
+    for _ in range(3):
+        await router.generate_response(make_messages())
+
+    # The caller gives up before the call is hedged
+    client.delay = 5
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(router.generate_response(make_messages()), timeout=0.01)
+    await asyncio.sleep(0.01)
+
+    assert router.endpoints[0].limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_caller_messages_are_not_modified():
+    router = RouterLLMClient([FakeLLMClient('model')])
+    messages = make_messages()
+
+    await router.generate_response(messages)
+
+    assert messages[0].content == 'system'
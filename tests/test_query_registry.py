@@ -0,0 +1,58 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from graphiti_core.query_registry import QueryRegistry, query_registry, query_registry_stats
+from graphiti_core.search.search_filters import SearchFilters, node_search_filter_query_constructor
+from graphiti_core.search.search_utils import node_similarity_search_query
+
+
+def test_registry_builds_each_shape_once():
+    registry = QueryRegistry(max_size=2)
+    builds = []
+
+    def build(shape: str):
+        builds.append(shape)
+        return f'MATCH (n:{shape}) RETURN n'
+
+    assert registry.get('q', ('A',), lambda: build('A')) == 'MATCH (n:A) RETURN n'
+    assert registry.get('q', ('A',), lambda: build('A')) == 'MATCH (n:A) RETURN n'
+    registry.get('q', ('B',), lambda: build('B'))
+    registry.get('q', ('C',), lambda: build('C'))
+    registry.get('q', ('A',), lambda: build('A'))
+
+    # A was the least recently used variant when C was added
+    assert builds == ['A', 'B', 'C', 'A']
+    snapshot = registry.snapshot()
+    assert snapshot['variants'] == 2
+    assert snapshot['queries'] == {'q': {'hits': 1, 'misses': 4}}
+
+
+def test_search_queries_are_shared_across_label_orders():
+    query_registry.clear()
+
+    queries = []
+    for labels in [['Person', 'Place'], ['Place', 'Person']]:
+        filter_query, _ = node_search_filter_query_constructor(SearchFilters(node_labels=labels))
+        queries.append(
+            node_similarity_search_query('neo4j', 'WHERE n.group_id IS NOT NULL', filter_query)
+        )
+
+    assert queries[0] is queries[1]
+    assert 'n:Person|Place' in queries[0]
+    assert query_registry_stats()['queries']['node_similarity_search_query'] == {
+        'hits': 1,
+        'misses': 1,
+    }
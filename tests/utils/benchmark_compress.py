@@ -0,0 +1,113 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# Benchmark of bulk node compression on synthetic entities, without LLM calls:
+#
+#     python tests/utils/benchmark_compress.py --nodes 1000 5000 20000
+
+import argparse
+import asyncio
+from time import perf_counter
+
+import numpy as np
+
+from graphiti_core.nodes import EntityNode
+from graphiti_core.utils import bulk_utils
+from graphiti_core.utils.datetime_utils import utc_now
+
+
+def synthetic_nodes(
+    count: int, duplicate_rate: float, dim: int, rng: np.random.Generator
+) -> list[EntityNode]:
+    """Nodes of count * (1 - duplicate_rate) entities, each duplicate a noisy copy of its entity."""
+    entity_count = max(int(count * (1 - duplicate_rate)), 1)
+    centers = rng.standard_normal((entity_count, dim)).astype(np.float32)
+    entity_ids = np.concatenate(
+        [np.arange(entity_count), rng.integers(0, entity_count, count - entity_count)]
+    )
+    embeddings = centers[entity_ids] + 0.1 * rng.standard_normal((count, dim)).astype(np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+    now = utc_now()
+    return [
+        EntityNode(
+            name=f'entity {entity_id} #{i}',
+            group_id='benchmark',
+            labels=['Entity'],
+            created_at=now,
+            name_embedding=embedding.tolist(),
+        )
+        for i, (entity_id, embedding) in enumerate(zip(entity_ids, embeddings, strict=True))
+    ]
+
+
+class FakeDedupe:
+    """Stands in for dedupe_node_list, merging the nodes of each chunk with the same entity."""
+
+    def __init__(self):
+        self.calls = 0
+        self.largest_chunk = 0
+
+    async def __call__(self, llm_client, nodes: list[EntityNode]):
+        self.calls += 1
+        self.largest_chunk = max(self.largest_chunk, len(nodes))
+        entities: dict[str, EntityNode] = {}
+        uuid_map: dict[str, str] = {}
+        for node in nodes:
+            entity = node.name.split(' #')[0]
+            if entity in entities:
+                uuid_map[node.uuid] = entities[entity].uuid
+            else:
+                entities[entity] = node
+        return list(entities.values()), uuid_map
+
+
+async def run(count: int, duplicate_rate: float, dim: int, seed: int):
+    nodes = synthetic_nodes(count, duplicate_rate, dim, np.random.default_rng(seed))
+    dedupe = FakeDedupe()
+    bulk_utils.dedupe_node_list = dedupe  # type: ignore[assignment]
+
+    start = perf_counter()
+    clusters = bulk_utils.similarity_clusters([node.name_embedding for node in nodes], 0.6)
+    clustering_ms = (perf_counter() - start) * 1000
+
+    start = perf_counter()
+    compressed, _ = await bulk_utils.compress_nodes(None, nodes, {})  # type: ignore[arg-type]
+    total_ms = (perf_counter() - start) * 1000
+
+    expected = len({node.name.split(' #')[0] for node in nodes})
+    print(
+        f'{count:>7} nodes: {len(compressed):>7} after compression ({expected} entities), '
+        f'{sum(len(c) > 1 for c in clusters):>6} candidate clusters in {clustering_ms:8.1f} ms, '
+        f'{dedupe.calls:>5} dedupe calls of at most {dedupe.largest_chunk} nodes, '
+        f'{total_ms:8.1f} ms total'
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Benchmark bulk node compression')
+    parser.add_argument('--nodes', type=int, nargs='+', default=[1000, 5000])
+    parser.add_argument('--duplicate-rate', type=float, default=0.2)
+    parser.add_argument('--dim', type=int, default=1024)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    for count in args.nodes:
+        await run(count, args.duplicate_rate, args.dim, args.seed)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,158 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from graphiti_core.nodes import EpisodeType, EpisodicNode
+from graphiti_core.utils.maintenance.episode_context import (
+    TRUNCATION_MARKER,
+    EpisodeContextConfig,
+    EpisodeContextManager,
+)
+
+
+def make_episodes(contents: list[str]) -> list[EpisodicNode]:
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        EpisodicNode(
+            uuid=f'episode_{i}',
+            content=content,
+            valid_at=start + timedelta(minutes=i),
+            name=f'Episode {i}',
+            group_id='group_1',
+            source=EpisodeType.message,
+            source_description='chat',
+        )
+        for i, content in enumerate(contents)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_default_config_is_passthrough():
+    *previous, current = make_episodes(['a' * 1000, 'b' * 1000, 'c'])
+
+    result = await EpisodeContextManager().build(current, previous)
+
+    assert result is previous
+
+
+@pytest.mark.asyncio
+async def test_truncates_long_episodes_without_mutating_originals():
+    *previous, current = make_episodes(['a' * 400, 'short', 'c'])
+    manager = EpisodeContextManager(EpisodeContextConfig(max_episode_tokens=10))
+
+    result = await manager.build(current, previous)
+
+    assert result[0].content.endswith(TRUNCATION_MARKER)
+    assert len(result[0].content) == 40
+    assert result[1] is previous[1]
+    assert previous[0].content == 'a' * 400
+
+
+@pytest.mark.asyncio
+async def test_budget_keeps_most_recent_episodes():
+    *previous, current = make_episodes(['a' * 80, 'b' * 80, 'c' * 80, 'd'])
+    manager = EpisodeContextManager(EpisodeContextConfig(max_tokens=45))
+
+    result = await manager.build(current, previous)
+
+    assert [ep.uuid for ep in result] == ['episode_1', 'episode_2']
+
+
+@pytest.mark.asyncio
+async def test_overflow_summary_is_cached_and_rolled_forward():
+    llm_client = MagicMock()
+    llm_client.generate_response = AsyncMock(
+        side_effect=[{'summary': 'Alice met Bob.'}, {'summary': 'Alice met Bob. Bob moved.'}]
+    )
+    manager = EpisodeContextManager(
+        EpisodeContextConfig(
+            max_tokens=30, keep_recent=1, summarize_overflow=True, max_summary_tokens=10
+        ),
+        llm_client,
+    )
+    episodes = make_episodes(['a' * 80, 'b' * 80, 'c' * 80, 'd' * 80, 'e'])
+
+    first = await manager.build(episodes[3], episodes[:3])
+    assert [ep.content for ep in first][0] == 'Alice met Bob.'
+    assert [ep.uuid for ep in first[1:]] == ['episode_2']
+
+    # Same overflow again reuses the cached summary
+    await manager.build(episodes[3], episodes[:3])
+    assert llm_client.generate_response.await_count == 1
+
+    # A newly overflowing episode only sends that episode to the LLM
+    second = await manager.build(episodes[4], episodes[1:4])
+    assert second[0].content == 'Alice met Bob. Bob moved.'
+    assert llm_client.generate_response.await_count == 2
+    context = llm_client.generate_response.await_args.args[0][1].content
+    assert 'Alice met Bob.' in context
+    assert 'c' * 80 in context
+    assert 'b' * 80 not in context
+
+
+def make_summarizing_manager(llm_client) -> EpisodeContextManager:
+    return EpisodeContextManager(
+        EpisodeContextConfig(
+            max_tokens=30, keep_recent=1, summarize_overflow=True, max_summary_tokens=10
+        ),
+        llm_client,
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_builds_summarize_once():
+    llm_client = MagicMock()
+
+    async def generate_response(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return {'summary': 'Alice met Bob.'}
+
+    llm_client.generate_response = AsyncMock(side_effect=generate_response)
+    manager = make_summarizing_manager(llm_client)
+    episodes = make_episodes(['a' * 80, 'b' * 80, 'c' * 80, 'd'])
+
+    results = await asyncio.gather(*[manager.build(episodes[3], episodes[:3]) for _ in range(3)])
+
+    assert llm_client.generate_response.await_count == 1
+    assert all(result[0].content == 'Alice met Bob.' for result in results)
+
+
+@pytest.mark.asyncio
+async def test_summary_of_newer_episodes_is_not_used_for_older_episode():
+    llm_client = MagicMock()
+    llm_client.generate_response = AsyncMock(
+        side_effect=[{'summary': 'Alice met Bob. Bob moved.'}, {'summary': 'Alice met Bob.'}]
+    )
+    manager = make_summarizing_manager(llm_client)
+    episodes = make_episodes(['a' * 80, 'b' * 80, 'c' * 80, 'd' * 80, 'e'])
+
+    newer = await manager.build(episodes[4], episodes[:4])
+    older = await manager.build(episodes[3], episodes[:3])
+
+    assert newer[0].content == 'Alice met Bob. Bob moved.'
+    assert older[0].content == 'Alice met Bob.'
+    context = llm_client.generate_response.await_args.args[0][1].content
+    assert 'Bob moved.' not in context
+    assert 'c' * 80 not in context
+
+    # The summary of the newer episodes stays cached
+    await manager.build(episodes[4], episodes[:4])
+    assert llm_client.generate_response.await_count == 2
@@ -0,0 +1,177 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pydantic import BaseModel
+
+from graphiti_core.nodes import EpisodicNode
+from graphiti_core.utils.bulk_utils import resolve_edge_pointers
+from graphiti_core.utils.maintenance.graph_extraction_operations import extract_nodes_and_edges
+from graphiti_core.utils.maintenance.reflexion_policy import ReflexionPolicy
+
+
+class Person(BaseModel):
+    """A human being"""
+
+
+@pytest.fixture
+def episode():
+    return EpisodicNode(
+        uuid='episode_1',
+        content='Alice: I just started working at Acme with Bob.',
+        valid_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        name='Episode',
+        group_id='group_1',
+        source='message',
+        source_description='chat',
+    )
+
+
+@pytest.fixture
+def clients():
+    clients = MagicMock()
+    clients.llm_client = MagicMock()
+    clients.llm_client.generate_response = AsyncMock()
+    return clients
+
+
+@pytest.mark.asyncio
+async def test_extract_nodes_and_edges_single_call(clients, episode):
+    clients.llm_client.generate_response.return_value = {
+        'extracted_entities': [
+            {'name': 'Alice', 'entity_type_id': 1},
+            {'name': 'Acme', 'entity_type_id': 0},
+            {'name': 'Bob', 'entity_type_id': 1},
+        ],
+        'edges': [
+            {
+                'relation_type': 'WORKS_AT',
+                'source_entity_id': 0,
+                'target_entity_id': 1,
+                'fact': 'Alice works at Acme',
+                'valid_at': '2025-01-01T00:00:00Z',
+            },
+            {
+                'relation_type': 'WORKS_WITH',
+                'source_entity_id': 0,
+                'target_entity_id': 7,
+                'fact': 'Alice works with someone',
+            },
+        ],
+    }
+
+    nodes, edges = await extract_nodes_and_edges(
+        clients, episode, [], entity_types={'Person': Person}, group_id='group_1'
+    )
+
+    assert clients.llm_client.generate_response.await_count == 1
+    assert [node.name for node in nodes] == ['Alice', 'Acme', 'Bob']
+    assert set(nodes[0].labels) == {'Entity', 'Person'}
+    assert nodes[1].labels == ['Entity']
+
+    assert len(edges) == 1
+    assert edges[0].source_node_uuid == nodes[0].uuid
+    assert edges[0].target_node_uuid == nodes[1].uuid
+    assert edges[0].valid_at == datetime(2025, 1, 1, tzinfo=timezone.utc)
+    assert edges[0].episodes == [episode.uuid]
+
+
+@pytest.mark.asyncio
+async def test_excluded_entities_drop_their_edges(clients, episode):
+    clients.llm_client.generate_response.return_value = {
+        'extracted_entities': [
+            {'name': 'Alice', 'entity_type_id': 1},
+            {'name': 'Acme', 'entity_type_id': 0},
+        ],
+        'edges': [
+            {
+                'relation_type': 'WORKS_AT',
+                'source_entity_id': 0,
+                'target_entity_id': 1,
+                'fact': 'Alice works at Acme',
+            },
+        ],
+    }
+
+    nodes, edges = await extract_nodes_and_edges(
+        clients,
+        episode,
+        [],
+        entity_types={'Person': Person},
+        excluded_entity_types=['Entity'],
+    )
+
+    assert [node.name for node in nodes] == ['Alice']
+    assert edges == []
+
+
+@pytest.mark.asyncio
+async def test_output_feeds_edge_pointer_resolution(clients, episode):
+    clients.llm_client.generate_response.return_value = {
+        'extracted_entities': [
+            {'name': 'Alice', 'entity_type_id': 0},
+            {'name': 'Acme', 'entity_type_id': 0},
+        ],
+        'edges': [
+            {
+                'relation_type': 'WORKS_AT',
+                'source_entity_id': 0,
+                'target_entity_id': 1,
+                'fact': 'Alice works at Acme',
+            },
+        ],
+    }
+
+    nodes, edges = await extract_nodes_and_edges(clients, episode, [])
+    uuid_map = {nodes[0].uuid: 'existing_alice'}
+
+    resolved = resolve_edge_pointers(edges, uuid_map)
+
+    assert resolved[0].source_node_uuid == 'existing_alice'
+    assert resolved[0].target_node_uuid == nodes[1].uuid
+
+
+@pytest.mark.asyncio
+async def test_reflexion_merges_missed_items(clients, episode):
+    clients.llm_client.generate_response.side_effect = [
+        {
+            'extracted_entities': [{'name': 'Alice', 'entity_type_id': 0}],
+            'edges': [],
+        },
+        {
+            'missed_entities': [{'name': 'Acme', 'entity_type_id': 0}],
+            'missed_facts': [
+                {
+                    'relation_type': 'WORKS_AT',
+                    'source_entity_id': 0,
+                    'target_entity_id': 1,
+                    'fact': 'Alice works at Acme',
+                }
+            ],
+        },
+    ]
+
+    nodes, edges = await extract_nodes_and_edges(
+        clients, episode, [], reflexion_policy=ReflexionPolicy(max_iterations=1)
+    )
+
+    assert clients.llm_client.generate_response.await_count == 2
+    assert [node.name for node in nodes] == ['Alice', 'Acme']
+    assert len(edges) == 1
+    assert edges[0].target_node_uuid == nodes[1].uuid
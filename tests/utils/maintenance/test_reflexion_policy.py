@@ -0,0 +1,128 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from graphiti_core.nodes import EpisodeType, EpisodicNode
+from graphiti_core.utils.maintenance.node_operations import extract_nodes
+from graphiti_core.utils.maintenance.reflexion_policy import ReflexionPolicy, reflexion_stats
+
+
+def make_episode(content: str, source: EpisodeType = EpisodeType.message) -> EpisodicNode:
+    return EpisodicNode(
+        content=content,
+        valid_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        name='Episode',
+        group_id='group_1',
+        source=source,
+        source_description='chat',
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_stats():
+    reflexion_stats.reset()
+    yield
+    reflexion_stats.reset()
+
+
+def test_short_episodes_skip_reflexion():
+    policy = ReflexionPolicy(max_iterations=2, min_episode_chars=100)
+
+    assert policy.iterations_for(make_episode('Alice: hi')) == 0
+    assert policy.iterations_for(make_episode('x' * 200)) == 2
+    assert reflexion_stats.snapshot()['skipped'] == {'short_episode': 1}
+
+
+def test_token_threshold():
+    policy = ReflexionPolicy(max_iterations=1, min_episode_tokens=50)
+
+    assert policy.iterations_for(make_episode('x' * 100)) == 0
+    assert policy.iterations_for(make_episode('x' * 400)) == 1
+
+
+def test_per_source_override():
+    policy = ReflexionPolicy(
+        max_iterations=1, max_iterations_by_source={EpisodeType.json: 0, EpisodeType.text: 3}
+    )
+
+    assert policy.iterations_for(make_episode('{}', EpisodeType.json)) == 0
+    assert policy.iterations_for(make_episode('text', EpisodeType.text)) == 3
+    assert policy.iterations_for(make_episode('Alice: hi')) == 1
+
+
+def test_saturation_and_budget():
+    policy = ReflexionPolicy(
+        max_iterations=3, only_if_saturated=True, saturation_threshold=5, max_reflexion_tokens=100
+    )
+
+    assert not policy.should_reflect(0, 4, 0, 10)
+    assert policy.should_reflect(0, 5, 0, 10)
+    # Saturation only gates the first round
+    assert policy.should_reflect(1, 0, 10, 10)
+    assert not policy.should_reflect(1, 5, 95, 10)
+
+    snapshot = reflexion_stats.snapshot()
+    assert snapshot['skipped'] == {'not_saturated': 1, 'token_budget': 1}
+    assert snapshot['estimated_tokens_saved'] == 20
+
+
+@pytest.mark.asyncio
+async def test_extract_nodes_respects_policy():
+    clients = MagicMock()
+    clients.llm_client.generate_response = AsyncMock(
+        side_effect=[
+            {'extracted_entities': [{'name': 'Alice', 'entity_type_id': 0}]},
+            {'missed_entities': ['Bob']},
+            {
+                'extracted_entities': [
+                    {'name': 'Alice', 'entity_type_id': 0},
+                    {'name': 'Bob', 'entity_type_id': 0},
+                ]
+            },
+        ]
+    )
+    episode = make_episode('Alice: I met Bob yesterday and we talked for a long time.')
+
+    nodes = await extract_nodes(
+        clients, episode, [], reflexion_policy=ReflexionPolicy(max_iterations=1)
+    )
+
+    assert [node.name for node in nodes] == ['Alice', 'Bob']
+    assert clients.llm_client.generate_response.await_count == 3
+    snapshot = reflexion_stats.snapshot()
+    assert snapshot['calls'] == 1
+    assert snapshot['items_recovered'] == 1
+
+
+@pytest.mark.asyncio
+async def test_extract_nodes_skips_reflexion_for_short_episode():
+    clients = MagicMock()
+    clients.llm_client.generate_response = AsyncMock(
+        return_value={'extracted_entities': [{'name': 'Alice', 'entity_type_id': 0}]}
+    )
+
+    await extract_nodes(
+        clients,
+        make_episode('Alice: hi'),
+        [],
+        reflexion_policy=ReflexionPolicy(max_iterations=2, min_episode_chars=50),
+    )
+
+    assert clients.llm_client.generate_response.await_count == 1
@@ -0,0 +1,122 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from pydantic import BaseModel, Field
+
+from graphiti_core.llm_client.utils import serialize_response_model_schema
+from graphiti_core.utils.ontology_utils.ontology_compiler import (
+    compile_ontology,
+    get_edge_types_resolution_context,
+    get_entity_attributes_model,
+)
+
+
+class Person(BaseModel):
+    """A human being"""
+
+    occupation: str | None = Field(None, description='The occupation of the person')
+
+
+class Company(BaseModel):
+    """A business organization"""
+
+    industry: str | None = Field(None, description='The industry of the company')
+
+
+class WorksAt(BaseModel):
+    """Employment relationship"""
+
+    role: str | None = Field(None, description='Role held at the company')
+
+
+class Knows(BaseModel):
+    """Acquaintance relationship"""
+
+
+ENTITY_TYPES = {'Person': Person, 'Company': Company}
+EDGE_TYPES = {'WORKS_AT': WorksAt, 'KNOWS': Knows}
+EDGE_TYPE_MAP = {('Person', 'Company'): ['WORKS_AT'], ('Entity', 'Entity'): ['KNOWS']}
+
+
+def test_compile_ontology_is_cached():
+    first = compile_ontology(ENTITY_TYPES, EDGE_TYPES, EDGE_TYPE_MAP)
+    second = compile_ontology(dict(ENTITY_TYPES), dict(EDGE_TYPES), dict(EDGE_TYPE_MAP))
+
+    assert first is second
+    assert compile_ontology(ENTITY_TYPES) is not first
+
+
+def test_entity_types_context():
+    ontology = compile_ontology(ENTITY_TYPES)
+
+    assert [ctx['entity_type_name'] for ctx in ontology.entity_types_context] == [
+        'Entity',
+        'Person',
+        'Company',
+    ]
+    assert ontology.entity_types_context[1]['entity_type_description'] == 'A human being'
+    assert ontology.entity_type_name(2) == 'Company'
+    assert ontology.entity_type_name(3) is None
+    assert ontology.entity_type_for_labels(['Entity', 'Person']) is Person
+    assert ontology.entity_type_for_labels(['Entity']) is None
+
+
+def test_entity_attributes_model_is_reused():
+    person_model = get_entity_attributes_model(Person)
+
+    assert get_entity_attributes_model(Person) is person_model
+    assert set(person_model.model_fields.keys()) == {'summary', 'occupation'}
+    assert set(get_entity_attributes_model().model_fields.keys()) == {'summary'}
+    assert serialize_response_model_schema(person_model) is serialize_response_model_schema(
+        person_model
+    )
+
+
+def test_edge_types_for_labels():
+    ontology = compile_ontology(ENTITY_TYPES, EDGE_TYPES, EDGE_TYPE_MAP)
+
+    person_to_company = ontology.edge_types_for_labels(['Entity', 'Person'], ['Entity', 'Company'])
+    assert person_to_company == {'WORKS_AT': WorksAt, 'KNOWS': Knows}
+
+    company_to_person = ontology.edge_types_for_labels(['Entity', 'Company'], ['Entity', 'Person'])
+    assert company_to_person == {'KNOWS': Knows}
+
+    assert ontology.edge_types_for_labels(
+        ['Person', 'Entity'], ['Company', 'Entity']
+    ) is ontology.edge_types_for_labels(['Entity', 'Person'], ['Entity', 'Company'])
+
+
+def test_edge_types_context_signatures():
+    ontology = compile_ontology(ENTITY_TYPES, EDGE_TYPES, EDGE_TYPE_MAP)
+
+    signatures = {
+        ctx['fact_type_name']: ctx['fact_type_signature'] for ctx in ontology.edge_types_context
+    }
+    assert signatures == {'WORKS_AT': ('Person', 'Company'), 'KNOWS': ('Entity', 'Entity')}
+
+
+def test_edge_types_resolution_context():
+    context = get_edge_types_resolution_context({'WORKS_AT': WorksAt})
+
+    assert context == [
+        {
+            'fact_type_id': 0,
+            'fact_type_name': 'WORKS_AT',
+            'fact_type_description': 'Employment relationship',
+        }
+    ]
+    assert get_edge_types_resolution_context({'WORKS_AT': WorksAt}) is context
+    assert get_edge_types_resolution_context(None) == []
@@ -0,0 +1,416 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from graphiti_core.cross_encoder.client import CrossEncoderClient
+from graphiti_core.driver.driver import GraphDriver
+from graphiti_core.edges import EntityEdge
+from graphiti_core.embedder import EmbedderClient
+from graphiti_core.graphiti import Graphiti
+from graphiti_core.llm_client import LLMClient
+from graphiti_core.nodes import EntityNode, EpisodeType, EpisodicNode
+from graphiti_core.utils.bulk_utils import (
+    RawEpisode,
+    StreamCheckpoint,
+    add_nodes_and_edges_bulk,
+    add_nodes_and_edges_chunked,
+    compress_edges,
+    compress_nodes,
+    episode_windows,
+    invalidate_edges_bulk,
+    load_stream_checkpoint,
+    pack_clusters,
+    resolve_known_entities,
+    save_stream_checkpoint,
+    similarity_clusters,
+    write_rows_chunked,
+)
+from graphiti_core.utils.datetime_utils import utc_now
+
+
+class FakeSession:
+    def __init__(self, driver: 'FakeDriver'):
+        self.driver = driver
+
+    async def execute_write(self, func, *args, **kwargs):
+        return await func(self, *args, **kwargs)
+
+    async def run(self, query, **kwargs):
+        self.driver.calls += 1
+        if self.driver.calls in self.driver.failing_calls:
+            raise ConnectionError('connection reset')
+        self.driver.writes.append((query, kwargs))
+
+    async def close(self):
+        pass
+
+
+class FakeDriver:
+    provider = 'neo4j'
+
+    def __init__(self, failing_calls: set[int] | None = None):
+        self.failing_calls = failing_calls or set()
+        self.calls = 0
+        self.writes: list[tuple[str, dict]] = []
+
+    def session(self, database):
+        return FakeSession(self)
+
+
+@pytest.fixture
+def no_retry_wait(monkeypatch):
+    monkeypatch.setattr(
+        'graphiti_core.utils.bulk_utils.wait_random_exponential', lambda **kwargs: lambda _: 0
+    )
+
+
+@pytest.mark.asyncio
+async def test_rows_are_written_in_chunks(no_retry_wait):
+    driver = FakeDriver()
+    rows = [{'uuid': str(i)} for i in range(5)]
+
+    await write_rows_chunked(driver, rows, 'nodes', lambda _: 'UNWIND $nodes', chunk_size=2)
+
+    assert [len(params['nodes']) for _, params in driver.writes] == [2, 2, 1]
+    assert [row for _, params in driver.writes for row in params['nodes']] == rows
+
+
+@pytest.mark.asyncio
+async def test_only_failed_chunk_is_retried(no_retry_wait):
+    driver = FakeDriver(failing_calls={2})
+    rows = [{'uuid': str(i)} for i in range(4)]
+
+    await write_rows_chunked(driver, rows, 'nodes', lambda _: 'UNWIND $nodes', chunk_size=2)
+
+    assert driver.calls == 3
+    assert [row for _, params in driver.writes for row in params['nodes']] == rows
+
+
+@pytest.mark.asyncio
+async def test_chunk_raises_after_attempts(no_retry_wait):
+    driver = FakeDriver(failing_calls={1, 2, 3, 4})
+
+    with pytest.raises(ConnectionError):
+        await write_rows_chunked(
+            driver, [{'uuid': '1'}], 'nodes', lambda _: 'UNWIND $nodes', attempts=3
+        )
+
+    assert driver.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_nodes_are_written_before_edges():
+    driver = FakeDriver()
+    embedder = MagicMock()
+    embedder.create_batch = AsyncMock(side_effect=lambda texts: [[0.1, 0.2] for _ in texts])
+    now = utc_now()
+    alice = EntityNode(name='Alice', group_id='group', labels=['Entity'], created_at=now)
+    bob = EntityNode(name='Bob', group_id='group', labels=['Entity'], created_at=now)
+    edge = EntityEdge(
+        source_node_uuid=alice.uuid,
+        target_node_uuid=bob.uuid,
+        name='KNOWS',
+        fact='Alice knows Bob',
+        group_id='group',
+        created_at=now,
+        episodes=[],
+    )
+
+    await add_nodes_and_edges_chunked(driver, [], [], [alice, bob], [edge], embedder, 1)
+
+    assert [list(params) for _, params in driver.writes] == [['nodes'], ['nodes'], ['entity_edges']]
+    assert driver.writes[2][1]['entity_edges'][0]['fact_embedding'] == [0.1, 0.2]
+
+
+@pytest.mark.asyncio
+async def test_embeddings_are_batched_before_the_transaction():
+    driver = FakeDriver()
+    events: list[str] = []
+
+    async def create_batch(texts):
+        events.append(f'embed {len(texts)}')
+        return [[0.1, 0.2] for _ in texts]
+
+    embedder = MagicMock()
+    embedder.create_batch = AsyncMock(side_effect=create_batch)
+    session = FakeSession(driver)
+    execute_write = session.execute_write
+
+    async def record_execute_write(func, *args, **kwargs):
+        events.append('transaction')
+        return await execute_write(func, *args, **kwargs)
+
+    session.execute_write = record_execute_write  # type: ignore[method-assign]
+    driver.session = lambda database: session  # type: ignore[method-assign]
+
+    now = utc_now()
+    nodes = [
+        EntityNode(name=name, group_id='group', labels=['Entity'], created_at=now)
+        for name in ['Alice', 'Bob', 'Carol']
+    ]
+    nodes[2].name_embedding = [0.3, 0.4]
+    edge = EntityEdge(
+        source_node_uuid=nodes[0].uuid,
+        target_node_uuid=nodes[1].uuid,
+        name='KNOWS',
+        fact='Alice knows Bob',
+        group_id='group',
+        created_at=now,
+        episodes=[],
+    )
+
+    await add_nodes_and_edges_bulk(driver, [], [], nodes, [edge], embedder)
+
+    # One request per kind for the missing embeddings, none inside the transaction
+    assert sorted(events[:2]) == ['embed 1', 'embed 2']
+    assert events[2:] == ['transaction']
+    assert nodes[2].name_embedding == [0.3, 0.4]
+    assert edge.fact_embedding == [0.1, 0.2]
+
+
+def make_episode(i: int) -> RawEpisode:
+    return RawEpisode(
+        name=f'episode {i}',
+        content='content',
+        source_description='test',
+        source=EpisodeType.text,
+        reference_time=utc_now(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_episode_windows_apply_backpressure():
+    produced: list[int] = []
+
+    async def stream():
+        for i in range(10):
+            produced.append(i)
+            yield make_episode(i)
+
+    windows = episode_windows(stream(), window_size=3, max_pending=2, skip=1)
+    first = await windows.__anext__()
+    await asyncio.sleep(0.01)
+
+    assert [episode.name for episode in first] == ['episode 1', 'episode 2', 'episode 3']
+    # The stream is read ahead by at most max_pending episodes, plus one waiting to be queued
+    assert len(produced) <= 7
+
+    rest = [window async for window in windows]
+    assert [len(window) for window in rest] == [3, 3]
+    assert len(produced) == 10
+
+
+@pytest.mark.asyncio
+async def test_episode_windows_raise_stream_errors():
+    async def stream():
+        yield make_episode(0)
+        raise ConnectionError('source closed')
+
+    with pytest.raises(ConnectionError):
+        async for _ in episode_windows(stream(), window_size=5, max_pending=5):
+            pass
+
+
+def test_resolve_known_entities():
+    now = utc_now()
+    alice = EntityNode(name='Alice', group_id='group', labels=['Entity'], created_at=now)
+    bob = EntityNode(name='Bob', group_id='group', labels=['Entity'], created_at=now)
+    entity_uuids = {'Alice': 'alice-uuid', 'Carol': 'carol-uuid'}
+
+    unresolved, uuid_map = resolve_known_entities([alice, bob], entity_uuids)
+
+    assert unresolved == [bob]
+    assert uuid_map == {alice.uuid: 'alice-uuid'}
+    # Matched entities become the most recently used
+    assert list(entity_uuids) == ['Carol', 'Alice']
+
+
+def test_stream_checkpoint_round_trip(tmp_path):
+    path = str(tmp_path / 'checkpoint.json')
+    assert load_stream_checkpoint(path) is None
+
+    checkpoint = StreamCheckpoint(
+        group_id='group', episodes_done=100, entity_uuids={'Alice': 'alice-uuid'}
+    )
+    save_stream_checkpoint(path, checkpoint)
+
+    assert load_stream_checkpoint(path) == checkpoint
+
+
+@pytest.mark.asyncio
+async def test_ingest_stream_retries_window_with_same_episode_uuids(tmp_path):
+    graphiti = Graphiti(
+        graph_driver=MagicMock(spec=GraphDriver),
+        llm_client=MagicMock(spec=LLMClient),
+        embedder=MagicMock(spec=EmbedderClient),
+        cross_encoder=MagicMock(spec=CrossEncoderClient),
+    )
+    attempts: list[list[str]] = []
+
+    async def add_episodes(window, group_id, chunk_size, entity_uuids, episode_uuids):
+        attempts.append(episode_uuids)
+        if len(attempts) == 2:
+            raise ConnectionError('connection reset')
+        return []
+
+    graphiti._add_episodes_bulk = add_episodes  # type: ignore[method-assign]
+
+    async def stream():
+        for i in range(4):
+            yield make_episode(i)
+
+    path = str(tmp_path / 'checkpoint.json')
+    with pytest.raises(ConnectionError):
+        await graphiti.ingest_stream(stream(), 'group', window_size=2, checkpoint_path=path)
+    assert load_stream_checkpoint(path).episodes_done == 2
+
+    assert await graphiti.ingest_stream(stream(), 'group', window_size=2, checkpoint_path=path) == 2
+
+    first, failed, retried = attempts
+    assert retried == failed
+    assert len(set(first + failed)) == 4
+
+
+def make_edge(fact: str, valid_at, episode_uuid: str) -> EntityEdge:
+    return EntityEdge(
+        source_node_uuid='alice',
+        target_node_uuid=fact,
+        name='WORKS_AT',
+        fact=fact,
+        fact_embedding=[1.0, 0.0],
+        group_id='group',
+        created_at=utc_now(),
+        valid_at=valid_at,
+        episodes=[episode_uuid],
+    )
+
+
+@pytest.mark.asyncio
+async def test_invalidate_edges_bulk_in_reference_time_order(monkeypatch):
+    now = utc_now()
+    episodes = [
+        EpisodicNode(
+            name=f'episode {i}',
+            group_id='group',
+            labels=[],
+            source=EpisodeType.text,
+            content='content',
+            source_description='test',
+            created_at=now,
+            valid_at=now + timedelta(days=i),
+        )
+        for i in range(2)
+    ]
+    graph_edge = make_edge('Alice works at Acme', now - timedelta(days=1), 'old episode')
+    earlier = make_edge('Alice works at Initech', now, episodes[0].uuid)
+    later = make_edge('Alice works at Globex', now + timedelta(days=1), episodes[1].uuid)
+
+    async def get_candidates(driver, edges, search_filter, min_score):
+        # Every search returns its own copy of the graph edge
+        return [[graph_edge.model_copy()] for _ in edges]
+
+    async def get_contradictions(llm_client, new_edge, existing_edges):
+        return existing_edges
+
+    monkeypatch.setattr(
+        'graphiti_core.utils.bulk_utils.get_edge_invalidation_candidates', get_candidates
+    )
+    monkeypatch.setattr(
+        'graphiti_core.utils.bulk_utils.get_edge_contradictions', get_contradictions
+    )
+
+    # Edges of later episodes come first, as extraction order is not reference time order
+    invalidated = await invalidate_edges_bulk(MagicMock(), MagicMock(), [later, earlier], episodes)
+
+    assert [edge.uuid for edge in invalidated] == [graph_edge.uuid]
+    assert invalidated[0].invalid_at == earlier.valid_at
+    assert earlier.invalid_at == later.valid_at
+    assert later.invalid_at is None
+
+
+def test_similarity_clusters_link_similar_items_across_blocks():
+    embeddings = [[1.0, 0.0], [0.0, 1.0], [0.99, 0.1], None, [0.1, 0.99], None, [-1.0, 0.0]]
+
+    clusters = similarity_clusters(embeddings, min_score=0.9, block_size=2)
+
+    assert sorted(clusters) == [[0, 2], [1, 4], [3, 5], [6]]
+
+
+def test_pack_clusters_caps_chunk_size():
+    chunks = pack_clusters([[0, 1], [2, 3, 4, 5, 6], [7, 8], [9, 10, 11]], max_size=4)
+
+    assert chunks == [[2, 3, 4, 5], [6], [9, 10, 11], [0, 1, 7, 8]]
+
+
+def make_node(name: str, embedding: list[float]) -> EntityNode:
+    return EntityNode(
+        name=name,
+        group_id='group',
+        labels=['Entity'],
+        created_at=utc_now(),
+        name_embedding=embedding,
+    )
+
+
+@pytest.mark.asyncio
+async def test_compress_nodes_only_sends_similar_nodes(monkeypatch):
+    calls: list[list[str]] = []
+
+    async def dedupe_node_list(llm_client, nodes):
+        calls.append([node.name for node in nodes])
+        return [nodes[0]], {node.uuid: nodes[0].uuid for node in nodes[1:]}
+
+    monkeypatch.setattr('graphiti_core.utils.bulk_utils.dedupe_node_list', dedupe_node_list)
+    alice = make_node('Alice', [1.0, 0.0])
+    alice_smith = make_node('Alice Smith', [0.95, 0.1])
+    bob = make_node('Bob', [0.0, 1.0])
+
+    nodes, uuid_map = await compress_nodes(
+        MagicMock(), [alice, bob, alice_smith], {'x': alice_smith.uuid}
+    )
+
+    assert calls == [['Alice', 'Alice Smith']]
+    assert nodes == [alice, bob]
+    assert uuid_map == {'x': alice.uuid, alice_smith.uuid: alice.uuid}
+
+
+@pytest.mark.asyncio
+async def test_compress_edges_is_bounded_by_max_passes(monkeypatch):
+    passes = 0
+
+    async def dedupe_edge_list(llm_client, edges):
+        nonlocal passes
+        passes += 1
+        # Only ever removes one duplicate per call
+        return edges[:-1]
+
+    monkeypatch.setattr('graphiti_core.utils.bulk_utils.dedupe_edge_list', dedupe_edge_list)
+    now = utc_now()
+    edges = [make_edge('Alice works at Acme', now, 'episode') for _ in range(6)]
+    for edge in edges:
+        edge.target_node_uuid = 'acme'
+    loop = make_edge('Alice knows herself', now, 'episode')
+    loop.target_node_uuid = 'alice'
+
+    compressed = await compress_edges(MagicMock(), edges + [loop], max_passes=2)
+
+    assert passes == 2
+    assert compressed == edges[:4]
@@ -0,0 +1,211 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from graphiti_core.helpers import semaphore_gather
+from graphiti_core.llm_client.errors import RateLimitError
+from graphiti_core.utils.concurrency import (
+    AdaptiveLimiter,
+    ConcurrencyConfig,
+    PoolConfig,
+    Priority,
+    ProviderKind,
+    configure_limiters,
+    current_priority,
+    get_limiter,
+    is_rate_limit_error,
+    priority,
+    set_limiter,
+    with_priority,
+)
+
+
+async def run_calls(limiter: AdaptiveLimiter, count: int, peak: list[int], error=None):
+    async def call():
+        async with limiter.slot():
+            peak[0] = max(peak[0], limiter.in_flight)
+            await asyncio.sleep(0.001)
+            if error is not None:
+                raise error
+
+    return await asyncio.gather(*[call() for _ in range(count)], return_exceptions=True)
+
+
+def test_is_rate_limit_error():
+    request = httpx.Request('POST', 'https://example.com')
+    throttled = httpx.HTTPStatusError(
+        'throttled', request=request, response=httpx.Response(429, request=request)
+    )
+    failed = httpx.HTTPStatusError(
+        'failed', request=request, response=httpx.Response(500, request=request)
+    )
+
+    assert is_rate_limit_error(RateLimitError())
+    assert is_rate_limit_error(throttled)
+    assert not is_rate_limit_error(failed)
+    assert not is_rate_limit_error(ValueError('bad'))
+
+
+@pytest.mark.asyncio
+async def test_limit_is_shared_across_nested_gathers():
+    limiter = AdaptiveLimiter(initial_limit=3, max_limit=3)
+    peak = [0]
+
+    async def outer():
+        return await run_calls(limiter, 5, peak)
+
+    await semaphore_gather(*[outer() for _ in range(4)])
+
+    assert peak[0] == 3
+    assert limiter.in_flight == 0
+    assert limiter.snapshot()['successes'] == 20
+
+
+@pytest.mark.asyncio
+async def test_additive_increase_while_saturated():
+    limiter = AdaptiveLimiter(initial_limit=2, max_limit=4, latency_tolerance=1000)
+
+    await run_calls(limiter, 40, [0])
+
+    assert limiter.limit == 4
+    assert limiter.snapshot()['increases'] == 2
+
+
+@pytest.mark.asyncio
+async def test_no_increase_when_limit_is_unused():
+    limiter = AdaptiveLimiter(initial_limit=4, max_limit=8, latency_tolerance=1000)
+
+    for _ in range(20):
+        await run_calls(limiter, 1, [0])
+
+    assert limiter.limit == 4
+
+
+@pytest.mark.asyncio
+async def test_multiplicative_decrease_on_rate_limit():
+    limiter = AdaptiveLimiter(initial_limit=8, decrease_interval=60)
+
+    results = await run_calls(limiter, 8, [0], error=RateLimitError())
+
+    assert all(isinstance(result, RateLimitError) for result in results)
+    # One burst of rate limit errors halves the limit once
+    assert limiter.limit == 4
+    snapshot = limiter.snapshot()
+    assert snapshot['rate_limited'] == 8
+    assert snapshot['decreases'] == 1
+
+    limiter.decrease_interval = 0
+    await run_calls(limiter, 1, [0], error=RateLimitError())
+    assert limiter.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_other_errors_do_not_decrease():
+    limiter = AdaptiveLimiter(initial_limit=4)
+
+    await run_calls(limiter, 4, [0], error=ValueError('bad'))
+
+    assert limiter.limit == 4
+    assert limiter.snapshot()['errors'] == 4
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_releases_its_place():
+    limiter = AdaptiveLimiter(initial_limit=1, max_limit=1)
+    await limiter.acquire()
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    limiter.release()
+    assert limiter.in_flight == 0
+    await asyncio.wait_for(limiter.acquire(), timeout=1)
+    assert limiter.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_waiting_calls_are_shared_by_priority_weight():
+    limiter = AdaptiveLimiter(
+        initial_limit=1,
+        max_limit=1,
+        priority_weights={Priority.interactive: 3, Priority.maintenance: 1},
+    )
+    order: list[Priority] = []
+
+    async def call(priority_class: Priority):
+        with priority(priority_class):
+            async with limiter.slot():
+                order.append(priority_class)
+                await asyncio.sleep(0)
+
+    await limiter.acquire()
+    tasks = [asyncio.create_task(call(Priority.maintenance)) for _ in range(4)]
+    tasks += [asyncio.create_task(call(Priority.interactive)) for _ in range(6)]
+    await asyncio.sleep(0)
+    limiter.release()
+    await asyncio.gather(*tasks)
+
+    # Interactive work gets three slots for each maintenance slot while both are waiting
+    assert order[:4].count(Priority.interactive) == 3
+    assert order[-2:] == [Priority.maintenance, Priority.maintenance]
+    assert limiter.snapshot()['acquired'] == {'interactive': 6, 'maintenance': 4, 'ingestion': 1}
+
+
+@pytest.mark.asyncio
+async def test_with_priority_keeps_caller_priority():
+    seen: list[Priority] = []
+
+    async def record():
+        seen.append(current_priority())
+
+    @with_priority(Priority.maintenance)
+    async def maintenance_work():
+        # Tasks started by gathers inherit the priority
+        await asyncio.gather(record())
+
+    await maintenance_work()
+    with priority(Priority.interactive):
+        await maintenance_work()
+
+    assert seen == [Priority.maintenance, Priority.interactive]
+    assert current_priority() == Priority.ingestion
+
+
+def test_configure_limiters():
+    previous = get_limiter(ProviderKind.llm)
+    try:
+        configure_limiters(
+            ConcurrencyConfig(
+                llm=PoolConfig(initial_limit=5, max_limit=10),
+                priority_weights={Priority.interactive: 16},
+            )
+        )
+
+        limiter = get_limiter(ProviderKind.llm)
+        assert limiter is not previous
+        assert limiter.limit == 5
+        assert limiter.max_limit == 10
+        assert limiter.priority_weights[Priority.interactive] == 16
+        assert limiter.priority_weights[Priority.maintenance] == 1
+    finally:
+        set_limiter(ProviderKind.llm, previous)
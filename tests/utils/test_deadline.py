@@ -0,0 +1,130 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from tenacity import AsyncRetrying, stop_after_attempt, wait_fixed
+
+from graphiti_core.errors import DeadlineExceededError
+from graphiti_core.search.search import cross_encoder_rank
+from graphiti_core.utils.concurrency import AdaptiveLimiter, hedged
+from graphiti_core.utils.deadline import (
+    deadline,
+    enforce_deadline,
+    remaining_time,
+    stop_before_deadline,
+)
+
+
+def test_nested_deadline_never_extends_outer():
+    assert remaining_time() is None
+
+    with deadline(1):
+        with deadline(10):
+            remaining = remaining_time()
+            assert remaining is not None and remaining <= 1
+        with deadline(None):
+            assert remaining_time() is not None
+
+    assert remaining_time() is None
+
+
+@pytest.mark.asyncio
+async def test_enforce_deadline_cancels_slow_calls():
+    with deadline(0.05):
+        with pytest.raises(DeadlineExceededError):
+            async with enforce_deadline():
+                await asyncio.sleep(5)
+
+        # Deadlines flow into tasks started from the context
+        task = asyncio.create_task(asyncio.sleep(0, result=remaining_time()))
+        assert await task is not None
+
+
+@pytest.mark.asyncio
+async def test_limiter_slot_respects_deadline():
+    limiter = AdaptiveLimiter(initial_limit=1, max_limit=1)
+    await limiter.acquire()
+
+    with deadline(0.05), pytest.raises(DeadlineExceededError):
+        async with limiter.slot():
+            pass
+
+    assert limiter.in_flight == 1
+    assert limiter.waiting == 0
+    assert limiter.snapshot()['errors'] == 0
+
+
+@pytest.mark.asyncio
+async def test_retries_stop_before_deadline():
+    calls = 0
+
+    async def failing_call():
+        nonlocal calls
+        calls += 1
+        raise ValueError('transient')
+
+    retrying = AsyncRetrying(
+        stop=stop_after_attempt(4) | stop_before_deadline(), wait=wait_fixed(1), reraise=True
+    )
+    with deadline(0.5), pytest.raises(ValueError):
+        await retrying(failing_call)
+
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_hedged_call_returns_first_success():
+    delays = [5, 0]
+
+    async def call():
+        await asyncio.sleep(delays.pop(0))
+        return 'done'
+
+    assert await asyncio.wait_for(hedged(call, hedge_after=0.01), timeout=1) == 'done'
+    assert delays == []
+
+
+@pytest.mark.asyncio
+async def test_cancelled_hedged_call_cancels_its_call():
+    cancelled = []
+
+    async def call():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(hedged(call, hedge_after=1), timeout=0.01)
+    await asyncio.sleep(0)
+
+    assert cancelled == [True]
+
+
+@pytest.mark.asyncio
+async def test_cross_encoder_skipped_near_deadline():
+    cross_encoder = MagicMock()
+    cross_encoder.rank = AsyncMock(return_value=[('fact', 1.0)])
+
+    assert await cross_encoder_rank(cross_encoder, 'query', ['fact']) == [('fact', 1.0)]
+    with deadline(0.1):
+        assert await cross_encoder_rank(cross_encoder, 'query', ['fact']) is None
+
+    assert cross_encoder.rank.await_count == 1